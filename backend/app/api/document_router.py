@@ -1,7 +1,12 @@
-from fastapi import APIRouter, HTTPException, UploadFile, File
-from app.models.rag_models import DocumentUpload, DocumentInfo
+from fastapi import APIRouter, HTTPException, UploadFile, File, Query
+from typing import Optional
+from app.core.config import settings
+from app.models.rag_models import DocumentUpload, DocumentInfo, DocumentPage, IngestionJob
 from app.services.document_service import DocumentService
+from app.services.ingestion_queue import IngestionQueue
 from rag.parsers.file_parser import FileParser
+import os
+import tempfile
 import traceback
 import logging
 
@@ -10,33 +15,176 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 document_service = DocumentService()
 
+
+def _build_ingestion_queue() -> IngestionQueue:
+    """설정 기반 수집 작업 큐 생성 (INGESTION_EMBED이고 API 키가 있으면 임베딩 포함)"""
+    embedder = None
+    if settings.INGESTION_EMBED and settings.OPENAI_API_KEY:
+        from rag.embedding.embedder import Embedder
+        from rag.utils.rate_limit import get_shared_rate_limiter
+        # RAGService와 같은 속도 제한기 (API 키 한도를 질의와 나눠 씀)
+        embedder = Embedder(
+            api_key=settings.OPENAI_API_KEY,
+            model=settings.OPENAI_EMBEDDING_MODEL,
+            base_url=settings.OPENAI_BASE_URL or None,
+            rate_limiter=get_shared_rate_limiter()
+        )
+    return IngestionQueue(
+        db_path=settings.INGESTION_DB_PATH,
+        spool_dir=settings.INGESTION_SPOOL_DIR,
+        index_dir=settings.INGESTION_INDEX_DIR,
+        num_workers=settings.INGESTION_WORKERS,
+        max_attempts=settings.INGESTION_MAX_ATTEMPTS,
+        embedder=embedder,
+        embed_batch_size=settings.INGESTION_EMBED_BATCH_SIZE,
+        embed_batch_wait_ms=settings.INGESTION_EMBED_BATCH_WAIT_MS,
+        document_service=document_service
+    )
+
+
+ingestion_queue = _build_ingestion_queue()
+
+# 업로드 파일을 임시 파일에 기록할 때 한 번에 읽는 크기
+UPLOAD_READ_CHUNK_SIZE = 1024 * 1024
+
+
+async def _spool_upload(file: UploadFile) -> str:
+    """업로드 파일을 1MB씩 임시 파일에 기록하고 경로 반환 (최대 크기 초과 시 413)"""
+    max_bytes = settings.MAX_UPLOAD_SIZE_MB * 1024 * 1024
+    if file.size is not None and file.size > max_bytes:
+        raise HTTPException(status_code=413, detail=f"파일 크기가 최대 업로드 크기({settings.MAX_UPLOAD_SIZE_MB}MB)를 초과했습니다.")
+    
+    suffix = os.path.splitext(file.filename or "")[1]
+    fd, tmp_path = tempfile.mkstemp(prefix="upload_", suffix=suffix)
+    written = 0
+    try:
+        with os.fdopen(fd, "wb") as tmp:
+            while True:
+                chunk = await file.read(UPLOAD_READ_CHUNK_SIZE)
+                if not chunk:
+                    break
+                written += len(chunk)
+                if written > max_bytes:
+                    raise HTTPException(status_code=413, detail=f"파일 크기가 최대 업로드 크기({settings.MAX_UPLOAD_SIZE_MB}MB)를 초과했습니다.")
+                tmp.write(chunk)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return tmp_path
+
+
+def _validate_spooled_file(filename: str, file_path: str) -> int:
+    """임시 파일을 스트리밍 파서로 끝까지 읽어 형식 검증 (항목/행 수 반환)"""
+    file_ext = filename.lower().split('.')[-1] if '.' in filename else ''
+    if file_ext == 'json':
+        import json
+        try:
+            return sum(1 for _ in FileParser.iter_json_items(file_path))
+        except json.JSONDecodeError as e:
+            raise ValueError(f"JSON 형식 오류: {str(e)}")
+    if file_ext in ['xlsx', 'xls', 'csv']:
+        return sum(1 for line in FileParser.iter_rows(filename, file_path) if line.startswith('행 '))
+    # 스트리밍 파서가 없는 형식은 기존 방식으로 변환 (최대 업로드 크기로 제한됨)
+    with open(file_path, "rb") as f:
+        FileParser.parse_file(filename, f.read())
+    return 0
+
 @router.post("/upload", response_model=DocumentInfo)
 async def upload_document(
     file: UploadFile = File(...),
     metadata: str = None
 ):
-    """문서 업로드 (텍스트, CSV, Excel 지원)"""
+    """문서 업로드 (텍스트, CSV, Excel 지원, 임시 파일로 나누어 받은 뒤 스트리밍 파싱)"""
+    tmp_path = None
     try:
-        content = await file.read()
+        tmp_path = await _spool_upload(file)
         
-        # 파일 파서를 사용하여 텍스트로 변환
-        content_str = FileParser.parse_file(file.filename or "unknown", content)
+        # 임시 파일을 스트리밍 파서로 검증 (별도 스레드, 전체 내용을 메모리에 올리지 않음)
+        from starlette.concurrency import run_in_threadpool
+        await run_in_threadpool(_validate_spooled_file, file.filename or "unknown", tmp_path)
         
         import json
         doc_metadata = json.loads(metadata) if metadata else None
         
         result = await document_service.upload_document(
             filename=file.filename,
-            content=content_str,
-            metadata=doc_metadata
+            metadata=doc_metadata,
+            file_path=tmp_path
         )
         return result
+    except HTTPException:
+        raise
     except ValueError as e:
         logger.error(f"ValueError in upload_document: {str(e)}")
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error in upload_document: {str(e)}\n{traceback.format_exc()}")
         raise HTTPException(status_code=500, detail=f"파일 업로드 오류: {str(e)}")
+    finally:
+        if tmp_path and os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+
+@router.post("/upload-async", response_model=IngestionJob, status_code=202)
+async def upload_document_async(
+    file: UploadFile = File(...),
+    metadata: str = None
+):
+    """문서 업로드 후 작업 ID 즉시 반환 (파싱/임베딩/등록은 수집 작업 큐에서 처리)"""
+    tmp_path = None
+    try:
+        import json
+        doc_metadata = json.loads(metadata) if metadata else None
+        
+        tmp_path = await _spool_upload(file)
+        job = ingestion_queue.submit(file.filename or "unknown", tmp_path, doc_metadata)
+        tmp_path = None  # 큐 보관 폴더로 이동됨
+        return job
+    except HTTPException:
+        raise
+    except ValueError as e:
+        logger.error(f"ValueError in upload_document_async: {str(e)}")
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error in upload_document_async: {str(e)}\n{traceback.format_exc()}")
+        raise HTTPException(status_code=500, detail=f"파일 업로드 오류: {str(e)}")
+    finally:
+        if tmp_path and os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+
+@router.get("/jobs", response_model=list[IngestionJob])
+async def list_jobs(
+    status: Optional[str] = Query(None, description="작업 상태 필터"),
+    limit: int = Query(50, ge=1, le=500)
+):
+    """수집 작업 목록 조회 (최신순)"""
+    return ingestion_queue.list_jobs(status=status, limit=limit)
+
+@router.get("/jobs/{job_id}", response_model=IngestionJob)
+async def get_job(job_id: str):
+    """수집 작업 진행 상태 조회"""
+    job = ingestion_queue.get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"작업을 찾을 수 없습니다: {job_id}")
+    return job
+
+@router.post("/jobs/{job_id}/cancel", response_model=IngestionJob)
+async def cancel_job(job_id: str):
+    """대기/실행 중인 수집 작업 취소"""
+    job = ingestion_queue.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"작업을 찾을 수 없습니다: {job_id}")
+    return job
+
+@router.post("/jobs/{job_id}/retry", response_model=IngestionJob)
+async def retry_job(job_id: str):
+    """실패/취소된 수집 작업 재시도"""
+    try:
+        job = ingestion_queue.retry(job_id)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"작업을 찾을 수 없습니다: {job_id}")
+    return job
 
 @router.post("/upload-text", response_model=DocumentInfo)
 async def upload_text_document(doc: DocumentUpload):
@@ -61,23 +209,38 @@ async def list_documents():
         logger.error(f"Error in list_documents: {str(e)}\n{traceback.format_exc()}")
         raise HTTPException(status_code=500, detail=f"문서 목록 조회 오류: {str(e)}")
 
+@router.get("/page", response_model=DocumentPage)
+async def list_documents_page(
+    folder: Optional[str] = Query(None, description="폴더(건물 유형) 필터"),
+    region: Optional[str] = Query(None, description="지역 필터"),
+    doc_type: Optional[str] = Query(None, alias="type", description="문서 유형 필터 (예: json)"),
+    sort: str = Query("created_at", description="정렬 키: created_at | updated_at | filename | chunk_count"),
+    order: str = Query("desc", pattern="^(asc|desc)$"),
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor")
+):
+    """문서 목록을 필터/정렬하여 커서 단위로 조회 (관리 화면용)"""
+    try:
+        return document_service.list_documents_page(
+            folder=folder,
+            region=region,
+            doc_type=doc_type,
+            sort=sort,
+            descending=order == "desc",
+            limit=limit,
+            cursor=cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error in list_documents_page: {str(e)}\n{traceback.format_exc()}")
+        raise HTTPException(status_code=500, detail=f"문서 목록 조회 오류: {str(e)}")
+
 @router.get("/folders")
 async def list_folders():
-    """documents 폴더 내의 폴더 목록 조회"""
+    """documents 폴더 내의 폴더 목록 조회 (폴더가 바뀔 때만 디렉터리를 다시 읽음)"""
     try:
-        from pathlib import Path
-        from app.core.config import settings
-        
-        documents_dir = Path(settings.DOCUMENTS_DIR)
-        folders = []
-        
-        # documents 폴더 내의 모든 디렉토리 찾기
-        for item in documents_dir.iterdir():
-            if item.is_dir() and not item.name.startswith('.'):
-                folders.append(item.name)
-        
-        folders.sort()
-        return {"folders": folders}
+        return {"folders": document_service.list_folders()}
     except Exception as e:
         logger.error(f"Error in list_folders: {str(e)}\n{traceback.format_exc()}")
         raise HTTPException(status_code=500, detail=f"폴더 목록 조회 오류: {str(e)}")
@@ -1,9 +1,12 @@
 from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from typing import Optional
-from app.models.rag_models import QueryRequest, QueryResponse, ChunkConfig, SimilarityConfig, RAGWeightConfig
+from app.models.rag_models import QueryRequest, QueryResponse, QueryBatchRequest, ChunkConfig, SimilarityConfig, RAGWeightConfig
+from app.core.config import settings
 from app.services.rag_service import RAGService
 import traceback
 import logging
+import json
 
 logger = logging.getLogger(__name__)
 
@@ -24,6 +27,12 @@ def get_rag_service():
             raise RuntimeError(f"RAG 서비스 초기화 실패: {str(e)}") from e
     return rag_service
 
+def reindex_document(path) -> bool:
+    """업로드로 새로 저장되거나 바뀐 JSON 파일만 재인덱싱 (RAG 서비스가 아직 없으면 초기화 시 전체 로드됨)"""
+    if rag_service is not None and rag_service.json_index is not None:
+        return rag_service.reindex_file(path)
+    return True
+
 @router.post("/query", response_model=QueryResponse)
 async def query_documents(
     request: QueryRequest,
@@ -82,3 +91,38 @@ async def query_documents(
         )
 
 
+@router.post("/query-batch")
+async def query_documents_batch(
+    request: QueryBatchRequest,
+    top_k: Optional[int] = Query(None, ge=1, le=20)
+):
+    """여러 쿼리 일괄 처리 (끝나는 순서대로 {"index": 요청 순번, ...QueryResponse} NDJSON 한 줄씩 스트리밍)"""
+    if len(request.queries) > settings.QUERY_BATCH_MAX_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"한 번에 최대 {settings.QUERY_BATCH_MAX_SIZE}개 쿼리까지 처리할 수 있습니다."
+        )
+    logger.info(f"일괄 쿼리 요청 받음: {len(request.queries)}개")
+    
+    try:
+        service = get_rag_service()
+    except Exception as e:
+        logger.error(f"RAG 서비스 초기화 실패: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=503, detail=f"서버 초기화 오류가 발생했습니다: {str(e)[:200]}")
+    
+    async def _stream():
+        async for index, response in service.query_batch(request.queries, top_k=top_k):
+            line = {"index": index, **response.model_dump()}
+            yield json.dumps(line, ensure_ascii=False) + "\n"
+    
+    return StreamingResponse(_stream(), media_type="application/x-ndjson")
+
+
+@router.get("/llm-status")
+async def llm_status():
+    """LLM 회로 차단기 및 의미 답변 캐시 상태 조회"""
+    service = get_rag_service()
+    status = service.llm_breaker.stats()
+    if service.answer_cache is not None:
+        status["answer_cache"] = service.answer_cache.stats()
+    return status
@@ -6,6 +6,23 @@ class Settings(BaseSettings):
     OPENAI_API_KEY: str = ""
     OPENAI_MODEL: str = "gpt-4o-mini"
     OPENAI_EMBEDDING_MODEL: str = "text-embedding-3-small"
+    # OpenAI 호환 서버 주소 (비워두면 기본 OpenAI API 사용)
+    # 부하 테스트 시 로컬 모의 서버 사용: http://localhost:8100/v1
+    OPENAI_BASE_URL: str = ""
+    
+    # OpenAI 속도 제한 / 재시도 설정 (0이면 제한 없음)
+    OPENAI_RPM_LIMIT: int = 500
+    OPENAI_TPM_LIMIT: int = 200000
+    OPENAI_MAX_RETRIES: int = 3
+    OPENAI_RETRY_BUDGET_RATIO: float = 0.2
+    
+    # LLM 회로 차단기 설정 (열리면 검색 결과 기반 추출형 답변 반환)
+    LLM_BREAKER_WINDOW: int = 20
+    LLM_BREAKER_MIN_CALLS: int = 5
+    LLM_BREAKER_FAILURE_RATE: float = 0.5
+    LLM_BREAKER_SLOW_CALL_SECONDS: float = 10.0
+    LLM_BREAKER_SLOW_CALL_RATE: float = 0.5
+    LLM_BREAKER_OPEN_SECONDS: float = 30.0
     
     # RAG 설정
     CHUNK_SIZE: int = 1000
@@ -16,6 +33,54 @@ class Settings(BaseSettings):
     # 문서 저장 경로
     DOCUMENTS_DIR: str = "documents"
     VECTOR_STORE_PATH: str = "vector_store"
+    # 문서 메타데이터 카탈로그 SQLite 경로 (비워두면 DOCUMENTS_DIR/catalog.db)
+    DOCUMENT_CATALOG_PATH: str = ""
+    # 업로드 원본의 내용 주소 저장소 (비워두면 DOCUMENTS_DIR/.blobs)
+    BLOB_STORE_DIR: str = ""
+    # Q&A 항목 근사 중복 판정 MinHash Jaccard 임계값 (0이면 항목 중복 제거 안 함, 숫자/용도지역이 다른 항목은 제거하지 않음)
+    ITEM_DEDUP_THRESHOLD: float = 0.0
+    # 쿼리 용어 오타/띄어쓰기 변형 확장 최대 편집 거리 (0이면 확장 안 함)
+    FUZZY_MAX_EDIT_DISTANCE: int = 1
+    # 쿼리 동의어/법령 용어 별칭 사전 JSON (비워두면 DOCUMENTS_DIR/synonyms.json, 파일이 없으면 확장 안 함)
+    SYNONYMS_PATH: str = ""
+    
+    # 의미 기반 답변 캐시 (표현만 다른 같은 범위의 질문에 최근 LLM 답변 재사용, openai 임베더는 캐시 미스마다 임베딩 호출 1회 추가)
+    SEMANTIC_CACHE_ENABLED: bool = False
+    SEMANTIC_CACHE_EMBEDDER: str = "openai"  # openai (Embedder.embed_query) | local (문자 n-gram 해싱)
+    SEMANTIC_CACHE_THRESHOLD: float = 0.9
+    SEMANTIC_CACHE_TTL_SECONDS: float = 3600.0
+    SEMANTIC_CACHE_MAX_ENTRIES: int = 1000
+    
+    # 검색 결과 재순위화 (후보 RERANK_CANDIDATES개를 특징 기반으로 다시 점수화해 상위 RERANK_TOP_N개만 LLM에 전달)
+    # 기본은 끔, 켜더라도 LLM 컨텍스트 개수는 기존과 같은 5개
+    RERANK_ENABLED: bool = False
+    RERANK_CANDIDATES: int = 50
+    RERANK_TOP_N: int = 5
+    RERANK_BUDGET_MS: float = 20.0
+    # MMR 다양성 선택 (1이면 관련도 순서 그대로, 작을수록 서로 겹치는 항목을 강하게 배제)
+    # 합성 코퍼스에서 recall@3이 떨어지므로(0.631 -> 0.603) 기본은 끔
+    MMR_ENABLED: bool = False
+    MMR_LAMBDA: float = 0.6
+    
+    # 일괄 쿼리 (/api/rag/query-batch): 요청당 최대 쿼리 수, 동시에 진행할 LLM 호출 수
+    QUERY_BATCH_MAX_SIZE: int = 500
+    QUERY_BATCH_CONCURRENCY: int = 8
+    
+    # 여러 지역 비교 검색의 폴더별 검색 스레드 수 (0이면 순차, GIL 때문에 보통 순차가 더 빠름)
+    REGION_FANOUT_WORKERS: int = 0
+    
+    # 업로드 설정 (임시 파일로 나누어 저장, 최대 크기 초과 시 413)
+    MAX_UPLOAD_SIZE_MB: int = 50
+    
+    # 수집 작업 큐 설정 (/api/documents/upload-async)
+    INGESTION_DB_PATH: str = "ingestion/jobs.db"
+    INGESTION_SPOOL_DIR: str = "ingestion/spool"
+    INGESTION_INDEX_DIR: str = "ingestion/index"
+    INGESTION_WORKERS: int = 2
+    INGESTION_MAX_ATTEMPTS: int = 3
+    INGESTION_EMBED: bool = False  # True면 작업 처리 중 청크 임베딩 생성 (작업 간 배치)
+    INGESTION_EMBED_BATCH_SIZE: int = 64
+    INGESTION_EMBED_BATCH_WAIT_MS: float = 50.0
     
     # CORS 설정
     CORS_ORIGINS: List[str] = ["http://localhost:3000", "http://localhost:3001", "http://localhost:3002", "http://localhost:5173"]
@@ -0,0 +1,40 @@
+"""서비스 상태 저장용 내장 SQLite 래퍼 (스레드 안전, 짧은 쿼리 전용)"""
+import sqlite3
+import threading
+from pathlib import Path
+from typing import List, Iterable
+
+
+class SQLiteDatabase:
+    """
+    단일 연결 + 잠금으로 여러 스레드/코루틴에서 공유하는 SQLite 데이터베이스
+
+    쿼리는 모두 짧은 색인 조회/갱신이므로 이벤트 루프에서 직접 호출합니다.
+    """
+
+    def __init__(self, db_path: str, schema: str = ""):
+        self.db_path = db_path
+        if db_path != ":memory:":
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        if db_path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        if schema:
+            with self._lock, self._conn:
+                self._conn.executescript(schema)
+
+    def execute(self, sql: str, params: tuple = ()) -> List[sqlite3.Row]:
+        """쿼리 하나를 트랜잭션으로 실행하고 결과 행 반환"""
+        with self._lock, self._conn:
+            return self._conn.execute(sql, params).fetchall()
+
+    def executemany(self, sql: str, rows: Iterable[tuple]) -> int:
+        """여러 행을 한 트랜잭션으로 실행하고 변경된 행 수 반환"""
+        with self._lock, self._conn:
+            return self._conn.executemany(sql, rows).rowcount
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -73,5 +73,13 @@ async def health():
 async def startup_event():
     """서버 시작 시 실행되는 이벤트"""
     logger = logging.getLogger(__name__)
+    # 업로드로 내용이 바뀐 문서만 JSON 인덱스에 다시 반영
+    document_router.document_service.add_change_listener(rag_router.reindex_document)
+    await document_router.ingestion_queue.start()
     logger.info("서버 시작 완료. JSON 인덱스는 RAGService 초기화 시 자동으로 로드됩니다.")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """서버 종료 시 수집 작업자 중지 (진행 중인 작업은 다음 시작 시 재개)"""
+    await document_router.ingestion_queue.stop()
+
@@ -7,6 +7,17 @@ class QueryRequest(BaseModel):
     similarity_threshold: Optional[float] = Field(None, description="유사도 임계값")
     folder: Optional[str] = Field(None, description="검색할 폴더명 (건물 타입, 예: 다중주택)")
     region: Optional[str] = Field(None, description="검색할 지역명 (예: 전주시)")
+    regions: Optional[List[str]] = Field(
+        None,
+        description="여러 지역 조례 비교 검색 (예: [\"전주시\", \"서울시\"], region과 합쳐지며 지역별로 결과 할당)"
+    )
+    facets: Optional[Dict[str, List[str]]] = Field(
+        None,
+        description="패싯 필터 (category / regulation_type / jurisdiction -> 값 목록, 필드 안은 OR, 필드끼리는 AND)"
+    )
+
+class QueryBatchRequest(BaseModel):
+    queries: List[QueryRequest] = Field(..., min_length=1, description="일괄 처리할 쿼리 목록 (결과는 끝나는 순서대로 index와 함께 반환)")
 
 class DocumentChunk(BaseModel):
     content: str
@@ -17,6 +28,11 @@ class QueryResponse(BaseModel):
     answer: str
     chunks: List[DocumentChunk]
     sources: List[str]
+    degraded: bool = Field(False, description="LLM 없이 검색 결과만으로 구성한 답변 여부")
+    cached: bool = Field(False, description="의미 캐시의 비슷한 질문 답변을 재사용했는지 여부")
+    facet_counts: Optional[Dict[str, Dict[str, int]]] = Field(
+        None, description="검색 대상 폴더의 패싯별 항목 수 (필터 좁히기용)"
+    )
 
 class ChunkConfig(BaseModel):
     chunk_size: int = Field(..., ge=100, le=5000, description="청크 크기")
@@ -42,4 +58,29 @@ class DocumentInfo(BaseModel):
     filename: str
     chunk_count: int
     created_at: str
+    content_hash: Optional[str] = Field(None, description="정규화된 내용의 SHA-256")
+    status: Optional[str] = Field(None, description="업로드 결과: created | updated | unchanged | duplicate")
+    folder: Optional[str] = None
+    region: Optional[str] = None
+    doc_type: Optional[str] = None
+
+class DocumentPage(BaseModel):
+    items: List[DocumentInfo]
+    next_cursor: Optional[str] = Field(None, description="다음 페이지 커서 (마지막 페이지면 None)")
+    total: int = Field(..., description="필터에 맞는 전체 문서 수")
+
+class IngestionJob(BaseModel):
+    id: str
+    filename: str
+    folder: Optional[str] = None
+    metadata: Optional[Dict[str, Any]] = None
+    status: str = Field(..., description="queued | running | succeeded | failed | cancelled")
+    stage: Optional[str] = Field(None, description="parse | embed | store | done")
+    progress: float = Field(0.0, description="진행률 (0~1)")
+    attempts: int = 0
+    max_attempts: int
+    error: Optional[str] = None
+    result: Optional[Dict[str, Any]] = None
+    created_at: str
+    updated_at: str
 
@@ -1,5 +1,5 @@
 from .rag_service import RAGService
 from .document_service import DocumentService
+from .ingestion_queue import IngestionQueue
 
-__all__ = ["RAGService", "DocumentService"]
-
+__all__ = ["RAGService", "DocumentService", "IngestionQueue"]
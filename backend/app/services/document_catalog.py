@@ -0,0 +1,295 @@
+"""
+문서 메타데이터 카탈로그 (SQLite)
+
+*.meta.json 파일을 매번 glob + 파싱하던 중복 확인/목록 조회를
+(NFC 폴더명, 파일명) 고유 색인과 doc_id 기본 키 조회로 대체합니다.
+기존 *.meta.json 파일은 최초 한 번 카탈로그로 옮겨집니다.
+content_hash(정규화된 내용의 SHA-256)로 같은 폴더의 동일 내용 업로드와 내용 변경을 판별합니다.
+목록 조회는 폴더/지역/유형 필터와 정렬 키 색인 위에서 커서(keyset) 방식으로 나누어 반환합니다.
+"""
+import base64
+import json
+import logging
+import unicodedata
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+
+from app.core.sqlite import SQLiteDatabase
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id TEXT PRIMARY KEY,
+    folder TEXT,
+    folder_nfc TEXT NOT NULL,
+    filename TEXT NOT NULL,
+    chunk_count INTEGER NOT NULL DEFAULT 0,
+    created_at TEXT NOT NULL,
+    metadata TEXT,
+    content_hash TEXT,
+    updated_at TEXT,
+    region TEXT,
+    doc_type TEXT,
+    UNIQUE (folder_nfc, filename)
+);
+CREATE INDEX IF NOT EXISTS idx_documents_created ON documents(created_at);
+CREATE TABLE IF NOT EXISTS catalog_state (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+META_MIGRATION_KEY = "meta_files_migrated"
+
+# 이전 버전 카탈로그에 없던 열 (열 이름, 정의)
+_ADDED_COLUMNS = [
+    ("content_hash", "TEXT"),
+    ("updated_at", "TEXT"),
+    ("region", "TEXT"),
+    ("doc_type", "TEXT"),
+]
+
+# 목록 정렬 키 -> SQL 식 (커서 비교에도 같은 식 사용)
+SORT_KEYS = {
+    "created_at": "created_at",
+    "updated_at": "COALESCE(updated_at, created_at)",
+    "filename": "filename",
+    "chunk_count": "chunk_count",
+}
+
+_LIST_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_documents_folder_created ON documents(folder_nfc, created_at, id)",
+    "CREATE INDEX IF NOT EXISTS idx_documents_region_created ON documents(region, created_at, id)",
+    "CREATE INDEX IF NOT EXISTS idx_documents_type_created ON documents(doc_type, created_at, id)",
+    "CREATE INDEX IF NOT EXISTS idx_documents_filename ON documents(filename, id)",
+]
+
+
+def normalize_folder(folder: Optional[str]) -> str:
+    """중복 판정용 폴더명 (NFC 정규화 + 공백 제거, 없으면 빈 문자열)"""
+    return unicodedata.normalize('NFC', str(folder).strip()) if folder else ""
+
+
+def document_type(filename: str, metadata: Optional[Dict[str, Any]] = None) -> str:
+    """문서 유형 (메타데이터의 type, 없으면 소문자 확장자)"""
+    if metadata and metadata.get("type"):
+        return str(metadata["type"]).strip().lower()
+    return Path(filename).suffix.lstrip('.').lower()
+
+
+def encode_cursor(sort_value: Any, doc_id: str) -> str:
+    """마지막 행의 (정렬 값, id)를 불투명한 커서 문자열로 변환"""
+    raw = json.dumps([sort_value, doc_id], ensure_ascii=False).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str) -> tuple:
+    """커서 문자열을 (정렬 값, id)로 복원 (형식이 잘못되면 ValueError)"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        sort_value, doc_id = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except Exception as e:
+        raise ValueError(f"잘못된 커서입니다: {cursor}") from e
+    return sort_value, doc_id
+
+
+class DocumentCatalog:
+    """문서 메타데이터 카탈로그"""
+
+    def __init__(self, db_path: str):
+        self.db = SQLiteDatabase(db_path, _SCHEMA)
+        self._migrate_columns()
+
+    def _migrate_columns(self):
+        """이전 버전 카탈로그에 없는 열 추가 후 내용 해시 색인 생성"""
+        existing = {row["name"] for row in self.db.execute("PRAGMA table_info(documents)")}
+        for name, definition in _ADDED_COLUMNS:
+            if name not in existing:
+                self.db.execute(f"ALTER TABLE documents ADD COLUMN {name} {definition}")
+        self.db.execute("CREATE INDEX IF NOT EXISTS idx_documents_hash ON documents(folder_nfc, content_hash)")
+        for sql in _LIST_INDEXES:
+            self.db.execute(sql)
+
+        # 필터 열이 비어 있는 기존 행 채우기
+        rows = self.db.execute("SELECT id, filename, metadata FROM documents WHERE doc_type IS NULL")
+        if rows:
+            updates = []
+            for row in rows:
+                metadata = json.loads(row["metadata"]) if row["metadata"] else {}
+                updates.append((metadata.get("region"), document_type(row["filename"], metadata), row["id"]))
+            self.db.executemany("UPDATE documents SET region = ?, doc_type = ? WHERE id = ?", updates)
+
+    @staticmethod
+    def _row_to_dict(row) -> Dict[str, Any]:
+        return {
+            "id": row["id"],
+            "folder": row["folder"],
+            "region": row["region"],
+            "doc_type": row["doc_type"],
+            "filename": row["filename"],
+            "chunk_count": row["chunk_count"],
+            "created_at": row["created_at"],
+            "updated_at": row["updated_at"],
+            "content_hash": row["content_hash"],
+            "metadata": json.loads(row["metadata"]) if row["metadata"] else {},
+        }
+
+    def get(self, doc_id: str) -> Optional[Dict[str, Any]]:
+        rows = self.db.execute("SELECT * FROM documents WHERE id = ?", (doc_id,))
+        return self._row_to_dict(rows[0]) if rows else None
+
+    def find(self, folder: Optional[str], filename: str) -> Optional[Dict[str, Any]]:
+        """(폴더, 파일명)으로 등록된 문서 조회"""
+        rows = self.db.execute(
+            "SELECT * FROM documents WHERE folder_nfc = ? AND filename = ?",
+            (normalize_folder(folder), filename)
+        )
+        return self._row_to_dict(rows[0]) if rows else None
+
+    def find_by_hash(self, folder: Optional[str], content_hash: str) -> Optional[Dict[str, Any]]:
+        """같은 폴더에서 내용 해시가 같은 문서 조회 (가장 먼저 등록된 문서)"""
+        rows = self.db.execute(
+            "SELECT * FROM documents WHERE folder_nfc = ? AND content_hash = ? ORDER BY created_at LIMIT 1",
+            (normalize_folder(folder), content_hash)
+        )
+        return self._row_to_dict(rows[0]) if rows else None
+
+    def add(
+        self,
+        doc_id: str,
+        filename: str,
+        created_at: str,
+        metadata: Optional[Dict[str, Any]] = None,
+        chunk_count: int = 0,
+        content_hash: Optional[str] = None,
+        region: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        문서 등록 후 저장된 행 반환
+
+        같은 (폴더, 파일명)이 이미 있으면 기존 행을 그대로 반환합니다 (동시 업로드에도 하나만 저장).
+        """
+        metadata = metadata or {}
+        folder = metadata.get("folder")
+        self.db.execute(
+            "INSERT OR IGNORE INTO documents "
+            "(id, folder, folder_nfc, filename, chunk_count, created_at, metadata, content_hash, region, doc_type) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (doc_id, folder, normalize_folder(folder), filename, chunk_count, created_at,
+             json.dumps(metadata, ensure_ascii=False), content_hash,
+             region or metadata.get("region"), document_type(filename, metadata))
+        )
+        return self.find(folder, filename)
+
+    def update_content(self, doc_id: str, content_hash: str, updated_at: str) -> Optional[Dict[str, Any]]:
+        """문서 내용 해시 갱신 (내용이 바뀐 재업로드) 후 갱신된 행 반환"""
+        self.db.execute(
+            "UPDATE documents SET content_hash = ?, updated_at = ? WHERE id = ?",
+            (content_hash, updated_at, doc_id)
+        )
+        return self.get(doc_id)
+
+    def list(self) -> List[Dict[str, Any]]:
+        rows = self.db.execute("SELECT * FROM documents ORDER BY created_at")
+        return [self._row_to_dict(row) for row in rows]
+
+    def page(
+        self,
+        folder: Optional[str] = None,
+        region: Optional[str] = None,
+        doc_type: Optional[str] = None,
+        sort: str = "created_at",
+        descending: bool = True,
+        limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        필터/정렬된 문서 목록의 한 페이지
+
+        (정렬 값, id) 기준 keyset 페이지네이션이라 페이지 깊이와 무관하게 색인 범위 조회로 끝납니다.
+        반환: {"items": [...], "next_cursor": 다음 페이지 커서 또는 None, "total": 필터에 맞는 전체 수}
+        """
+        if sort not in SORT_KEYS:
+            raise ValueError(f"지원하지 않는 정렬 키입니다: {sort} (가능: {', '.join(SORT_KEYS)})")
+        sort_expr = SORT_KEYS[sort]
+
+        conditions = []
+        params: List[Any] = []
+        if folder is not None:
+            conditions.append("folder_nfc = ?")
+            params.append(normalize_folder(folder))
+        if region:
+            conditions.append("region = ?")
+            params.append(region.strip())
+        if doc_type:
+            conditions.append("doc_type = ?")
+            params.append(doc_type.strip().lower().lstrip('.'))
+        where = " AND ".join(conditions) or "1"
+
+        total = self.db.execute(f"SELECT COUNT(*) AS n FROM documents WHERE {where}", tuple(params))[0]["n"]
+
+        if cursor:
+            sort_value, last_id = decode_cursor(cursor)
+            conditions.append(f"({sort_expr}, id) {'<' if descending else '>'} (?, ?)")
+            params.extend([sort_value, last_id])
+        page_where = " AND ".join(conditions) or "1"
+        direction = "DESC" if descending else "ASC"
+
+        rows = self.db.execute(
+            f"SELECT *, {sort_expr} AS sort_value FROM documents WHERE {page_where} "
+            f"ORDER BY {sort_expr} {direction}, id {direction} LIMIT ?",
+            tuple(params) + (limit + 1,)
+        )
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1]["sort_value"], rows[-1]["id"])
+        return {
+            "items": [self._row_to_dict(row) for row in rows],
+            "next_cursor": next_cursor,
+            "total": total,
+        }
+
+    def delete(self, doc_id: str) -> bool:
+        existed = self.get(doc_id) is not None
+        self.db.execute("DELETE FROM documents WHERE id = ?", (doc_id,))
+        return existed
+
+    def count(self) -> int:
+        return self.db.execute("SELECT COUNT(*) AS n FROM documents")[0]["n"]
+
+    def migrate_meta_files(self, documents_dir: Path) -> int:
+        """기존 *.meta.json 파일을 카탈로그로 한 번만 이전 (이전된 문서 수 반환)"""
+        if self.db.execute("SELECT value FROM catalog_state WHERE key = ?", (META_MIGRATION_KEY,)):
+            return 0
+
+        rows = []
+        for meta_file in Path(documents_dir).glob("*.meta.json"):
+            try:
+                with open(meta_file, "r", encoding="utf-8") as f:
+                    meta = json.load(f)
+                metadata = meta.get("metadata") or {}
+                folder = metadata.get("folder")
+                rows.append((
+                    meta["id"], folder, normalize_folder(folder), meta["filename"],
+                    int(meta.get("chunk_count") or 0), meta.get("created_at", ""),
+                    json.dumps(metadata, ensure_ascii=False),
+                    metadata.get("region"), document_type(meta["filename"], metadata)
+                ))
+            except Exception as e:
+                logger.warning(f"메타데이터 파일 이전 실패: {meta_file.name}, {str(e)}")
+
+        migrated = self.db.executemany(
+            "INSERT OR IGNORE INTO documents "
+            "(id, folder, folder_nfc, filename, chunk_count, created_at, metadata, region, doc_type) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            rows
+        ) if rows else 0
+        self.db.execute(
+            "INSERT OR REPLACE INTO catalog_state (key, value) VALUES (?, ?)",
+            (META_MIGRATION_KEY, str(len(rows)))
+        )
+        if rows:
+            logger.info(f"메타데이터 파일 {len(rows)}개 중 {migrated}개를 카탈로그로 이전")
+        return migrated
@@ -1,26 +1,127 @@
-import json
 import hashlib
+import os
+import shutil
+import uuid
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Callable, Union
 from pathlib import Path
 from app.core.config import settings
-from app.models.rag_models import DocumentInfo
+from app.models.rag_models import DocumentInfo, DocumentPage
+from app.services.document_catalog import DocumentCatalog
 
 class DocumentService:
     def __init__(self):
         self.documents_dir = Path(settings.DOCUMENTS_DIR)
         self.documents_dir.mkdir(exist_ok=True, parents=True)
+        
+        # 문서 메타데이터 카탈로그 (기존 *.meta.json 파일은 최초 1회 이전)
+        catalog_path = settings.DOCUMENT_CATALOG_PATH or str(self.documents_dir / "catalog.db")
+        self.catalog = DocumentCatalog(catalog_path)
+        self.catalog.migrate_meta_files(self.documents_dir)
+        
+        # 업로드 원본 내용 주소 저장소
+        self.blob_dir = Path(settings.BLOB_STORE_DIR) if settings.BLOB_STORE_DIR else self.documents_dir / ".blobs"
+        self._change_listeners: List[Callable[[Path], Optional[bool]]] = []
+        
+        # 폴더 목록 캐시 (documents 폴더 mtime이 바뀔 때만 다시 읽음)
+        self._folders_cache: Optional[List[str]] = None
+        self._folders_mtime: Optional[int] = None
+    
+    def add_change_listener(self, listener: Callable[[Path], Optional[bool]]):
+        """새로 저장되거나 내용이 바뀐 문서 파일 경로를 받을 콜백 등록 (재인덱싱용, False를 반환하면 실패)"""
+        self._change_listeners.append(listener)
+    
+    def _store_blob(self, content_hash: str, source: Union[str, bytes]) -> Path:
+        """업로드 원본을 내용 주소(.blobs/<해시 앞 2자리>/<해시>)로 저장 (같은 내용은 한 번만 저장)"""
+        blob_path = self.blob_dir / content_hash[:2] / content_hash
+        if blob_path.exists():
+            return blob_path
+        blob_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = blob_path.with_name(f"{content_hash}.{uuid.uuid4().hex}.tmp")
+        if isinstance(source, bytes):
+            tmp_path.write_bytes(source)
+        else:
+            shutil.copyfile(source, tmp_path)
+        os.replace(tmp_path, blob_path)
+        return blob_path
+    
+    def _document_path(self, folder: Optional[str], filename: str) -> Path:
+        """업로드 문서가 배치될 경로 (경로 조작 방지를 위해 폴더/파일명의 마지막 요소만 사용)"""
+        target_dir = self.documents_dir / Path(folder).name if folder else self.documents_dir
+        return target_dir / Path(filename).name
+    
+    def _materialize(self, blob_path: Path, folder: Optional[str], filename: str) -> Path:
+        """저장된 원본을 documents/<폴더>/<파일명>에 배치 (가능하면 하드 링크, 기존 파일은 원자적으로 교체)"""
+        target = self._document_path(folder, filename)
+        target_dir = target.parent
+        target_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = target_dir / f".{target.name}.{uuid.uuid4().hex}.tmp"
+        try:
+            os.link(blob_path, tmp_path)
+        except OSError:
+            shutil.copyfile(blob_path, tmp_path)
+        os.replace(tmp_path, target)
+        return target
+    
+    async def _notify_change(self, path: Path) -> bool:
+        """변경 콜백 호출 (모두 성공하면 True)"""
+        from starlette.concurrency import run_in_threadpool
+        import logging
+        logger = logging.getLogger(__name__)
+        
+        succeeded = True
+        for listener in self._change_listeners:
+            try:
+                if await run_in_threadpool(listener, path) is False:
+                    logger.error(f"문서 변경 알림 처리 실패: {path}")
+                    succeeded = False
+            except Exception as e:
+                logger.error(f"문서 변경 알림 처리 실패: {path}, {str(e)}", exc_info=True)
+                succeeded = False
+        return succeeded
+    
+    @staticmethod
+    def check_supported(filename: str):
+        """등록할 수 있는 문서 형식인지 확인 (JSON만 지원, 아니면 ValueError)"""
+        if not filename.lower().endswith('.json'):
+            import logging
+            logging.getLogger(__name__).warning(f"JSON 파일만 지원합니다: {filename}")
+            raise ValueError("JSON 파일만 업로드할 수 있습니다.")
+    
+    @staticmethod
+    def _to_info(doc: Dict[str, Any], status: Optional[str] = None) -> DocumentInfo:
+        return DocumentInfo(
+            id=doc["id"],
+            filename=doc["filename"],
+            chunk_count=doc["chunk_count"],
+            created_at=doc["created_at"],
+            content_hash=doc.get("content_hash"),
+            status=status,
+            folder=doc.get("folder"),
+            region=doc.get("region"),
+            doc_type=doc.get("doc_type")
+        )
     
     async def upload_document(
         self,
         filename: str,
-        content: str,
+        content: Optional[str] = None,
         metadata: Dict[str, Any] = None,
         file_path: str = None
     ) -> DocumentInfo:
-        """문서 업로드 (JSON만 사용, 벡터화 없음)"""
+        """
+        문서 업로드 (JSON만 사용, 벡터화 없음, 업로드 파일은 file_path의 임시 파일로 전달)
+        
+        정규화된 내용의 SHA-256으로 결과를 판별합니다.
+        - unchanged: 같은 이름, 같은 내용 (아무것도 하지 않음)
+        - duplicate: 같은 폴더에 이름만 다른 같은 내용이 있음 (기존 문서 반환, 다시 인덱싱하지 않음)
+        - updated: 같은 이름, 다른 내용 (파일 교체 후 재인덱싱)
+        - created: 새 문서
+        """
         import logging
         logger = logging.getLogger(__name__)
+        from starlette.concurrency import run_in_threadpool
+        from rag.utils.content_hash import normalized_sha256
         
         # 폴더 정보 추출
         folder_name = None
@@ -28,101 +129,139 @@ class DocumentService:
             folder_name = metadata.get("folder")
         
         # JSON 파일만 처리
-        if not filename.lower().endswith('.json'):
-            logger.warning(f"JSON 파일만 지원합니다: {filename}")
-            raise ValueError("JSON 파일만 업로드할 수 있습니다.")
+        self.check_supported(filename)
         
-        # 중복 체크: 메타데이터 파일에서 확인
-        import unicodedata
-        existing_doc_id = None
-        folder_name_nfc = unicodedata.normalize('NFC', str(folder_name).strip()) if folder_name else ""
+        source = file_path if file_path else (content or "").encode('utf-8')
+        content_hash = await run_in_threadpool(normalized_sha256, source)
         
-        for meta_file in self.documents_dir.glob("*.meta.json"):
-            try:
-                with open(meta_file, "r", encoding="utf-8") as f:
-                    meta = json.load(f)
-                    meta_folder = meta.get("metadata", {}).get("folder", "")
-                    meta_filename = meta.get("filename", "")
-                    meta_folder_nfc = unicodedata.normalize('NFC', str(meta_folder).strip()) if meta_folder else ""
-                    
-                    if meta_folder_nfc == folder_name_nfc and meta_filename == filename:
-                        existing_doc_id = meta.get("id")
-                        break
-            except:
-                continue
-        
-        # 이미 존재하는 문서가 있으면 기존 정보 반환
-        if existing_doc_id:
-            logger.info(f"문서가 이미 존재합니다: {folder_name}/{filename} (doc_id: {existing_doc_id})")
-            meta_file = self.documents_dir / f"{existing_doc_id}.meta.json"
-            if meta_file.exists():
-                with open(meta_file, "r", encoding="utf-8") as f:
-                    existing_meta = json.load(f)
-                    return DocumentInfo(
-                        id=existing_doc_id,
-                        filename=filename,
-                        chunk_count=0,  # JSON은 청크 개념 없음
-                        created_at=existing_meta.get("created_at", datetime.now().isoformat())
-                    )
-        
-        # doc_id 생성
-        folder_str = folder_name or ""
-        id_string = f"{folder_str}|{filename}"
-        doc_id = hashlib.md5(id_string.encode('utf-8')).hexdigest()
-        
-        # 메타데이터 저장
-        metadata_path = self.documents_dir / f"{doc_id}.meta.json"
-        doc_metadata = {
-            "id": doc_id,
-            "filename": filename,
-            "created_at": datetime.now().isoformat(),
-            "metadata": metadata or {}
-        }
-        
-        with open(metadata_path, "w", encoding="utf-8") as f:
-            json.dump(doc_metadata, f, ensure_ascii=False, indent=2)
-        
-        logger.info(f"JSON 파일 메타데이터 저장 완료: {filename}")
+        # 같은 (NFC 폴더명, 파일명) 문서 조회
+        existing = self.catalog.find(folder_name, filename)
+        if existing and existing["content_hash"] is None:
+            # 해시 도입 전에 등록된 문서: 배치된 파일이 있으면 그 해시로 비교
+            placed = self._document_path(folder_name, filename)
+            if placed.exists():
+                existing["content_hash"] = await run_in_threadpool(normalized_sha256, placed)
         
-        # JSON 파일은 RAGService의 JSON 인덱스에서 자동으로 로드되므로
-        # 여기서는 메타데이터만 저장하고 완료
-        return DocumentInfo(
-            id=doc_id,
-            filename=filename,
-            chunk_count=0,  # JSON은 청크 개념 없음
-            created_at=doc_metadata["created_at"]
-        )
+        if existing and existing["content_hash"] == content_hash:
+            logger.info(f"내용이 같은 문서가 이미 존재합니다: {folder_name}/{filename} (doc_id: {existing['id']})")
+            return self._to_info(existing, "unchanged")
+        
+        if not existing:
+            # 같은 폴더에 이름만 다른 동일 내용이 있으면 두 번 저장/인덱싱하지 않음
+            duplicate = self.catalog.find_by_hash(folder_name, content_hash)
+            if duplicate:
+                logger.info(f"동일 내용 문서가 이미 존재합니다: {folder_name}/{filename} = {duplicate['filename']}")
+                return self._to_info(duplicate, "duplicate")
+        
+        blob_path = await run_in_threadpool(self._store_blob, content_hash, source)
+        target = await run_in_threadpool(self._materialize, blob_path, folder_name, filename)
+        
+        # 새 내용만 인덱스에 반영 (unchanged/duplicate는 재인덱싱하지 않음)
+        # 인덱싱에 실패하면 해시를 기록하지 않아 같은 파일을 다시 올릴 때 재시도됨
+        if not await self._notify_change(target):
+            await self._restore_previous(existing, folder_name, target)
+            raise RuntimeError(f"문서를 저장했지만 인덱싱에 실패했습니다: {filename}")
+        now = datetime.now().isoformat()
+        
+        if existing:
+            doc = self.catalog.update_content(existing["id"], content_hash, now)
+            status = "updated"
+        else:
+            # doc_id 생성
+            folder_str = folder_name or ""
+            id_string = f"{folder_str}|{filename}"
+            doc_id = hashlib.md5(id_string.encode('utf-8')).hexdigest()
+            
+            # 카탈로그에 등록 (동시 업로드 시 먼저 등록된 행 반환)
+            region = None
+            if folder_name == "region":
+                from app.services.rag_service import RAGService
+                region = RAGService._resolve_region_name(filename, target)
+            doc = self.catalog.add(
+                doc_id=doc_id,
+                filename=filename,
+                created_at=now,
+                metadata=metadata,
+                content_hash=content_hash,
+                region=region
+            )
+            status = "created"
+        
+        logger.info(f"JSON 파일 저장 완료 ({status}): {target}")
+        return self._to_info(doc, status)
+    
+    async def _restore_previous(self, existing: Optional[Dict[str, Any]], folder: Optional[str], target: Path):
+        """인덱싱에 실패한 업로드 되돌리기 (기존 문서는 이전 원본으로 복원 후 재인덱싱, 새 문서는 파일 제거)"""
+        from starlette.concurrency import run_in_threadpool
+        
+        previous_hash = existing["content_hash"] if existing else None
+        previous_blob = self.blob_dir / previous_hash[:2] / previous_hash if previous_hash else None
+        if previous_blob is not None and previous_blob.exists():
+            await run_in_threadpool(self._materialize, previous_blob, folder, target.name)
+            await self._notify_change(target)
+        elif not existing:
+            target.unlink(missing_ok=True)
     
     def list_documents(self) -> List[DocumentInfo]:
         """저장된 문서 목록 조회"""
-        documents = []
-        for meta_file in self.documents_dir.glob("*.meta.json"):
-            with open(meta_file, "r", encoding="utf-8") as f:
-                meta = json.load(f)
-                documents.append(DocumentInfo(**meta))
-        return documents
+        return [self._to_info(doc) for doc in self.catalog.list()]
+    
+    def list_documents_page(
+        self,
+        folder: Optional[str] = None,
+        region: Optional[str] = None,
+        doc_type: Optional[str] = None,
+        sort: str = "created_at",
+        descending: bool = True,
+        limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> DocumentPage:
+        """필터/정렬된 문서 목록을 커서 단위로 조회 (잘못된 정렬 키/커서는 ValueError)"""
+        page = self.catalog.page(
+            folder=folder,
+            region=region,
+            doc_type=doc_type,
+            sort=sort,
+            descending=descending,
+            limit=limit,
+            cursor=cursor
+        )
+        return DocumentPage(
+            items=[self._to_info(doc) for doc in page["items"]],
+            next_cursor=page["next_cursor"],
+            total=page["total"]
+        )
+    
+    def list_folders(self) -> List[str]:
+        """documents 폴더 내의 폴더 목록 (숨김 폴더 제외, 폴더 mtime 기준 캐시)"""
+        mtime = self.documents_dir.stat().st_mtime_ns
+        if self._folders_cache is None or mtime != self._folders_mtime:
+            self._folders_cache = sorted(
+                item.name for item in self.documents_dir.iterdir()
+                if item.is_dir() and not item.name.startswith('.')
+            )
+            self._folders_mtime = mtime
+        return list(self._folders_cache)
     
     def get_document(self, doc_id: str) -> str:
         """문서 내용 조회"""
-        # 먼저 메타데이터에서 원본 파일명 확인
-        meta_path = self.documents_dir / f"{doc_id}.meta.json"
-        if meta_path.exists():
-            with open(meta_path, "r", encoding="utf-8") as f:
-                meta = json.load(f)
-                original_filename = meta.get("filename")
-                
-                # 원본 파일이 있으면 원본 파일 사용
-                original_file_path = self.documents_dir / original_filename
-                if original_file_path.exists():
-                    if original_filename.lower().endswith(('.txt', '.md')):
-                        with open(original_file_path, "r", encoding="utf-8") as f:
-                            return f.read()
-                    else:
-                        # 바이너리 파일인 경우 파싱
-                        with open(original_file_path, "rb") as f:
-                            content_bytes = f.read()
-                        from rag.parsers.file_parser import FileParser
-                        return FileParser.parse_file(original_filename, content_bytes)
+        # 먼저 카탈로그에서 원본 파일명 확인
+        doc = self.catalog.get(doc_id)
+        if doc:
+            original_filename = doc["filename"]
+            
+            # 원본 파일이 있으면 원본 파일 사용
+            original_file_path = self.documents_dir / original_filename
+            if original_file_path.exists():
+                if original_filename.lower().endswith(('.txt', '.md')):
+                    with open(original_file_path, "r", encoding="utf-8") as f:
+                        return f.read()
+                else:
+                    # 바이너리 파일인 경우 파싱
+                    with open(original_file_path, "rb") as f:
+                        content_bytes = f.read()
+                    from rag.parsers.file_parser import FileParser
+                    return FileParser.parse_file(original_filename, content_bytes)
         
         # 메타데이터가 없거나 원본 파일이 없는 경우 txt 파일 확인
         doc_path = self.documents_dir / f"{doc_id}.txt"
@@ -139,11 +278,13 @@ class DocumentService:
         
         if doc_path.exists():
             doc_path.unlink()
+        # 카탈로그 이전 전에 만들어진 메타데이터 파일도 함께 삭제
         if meta_path.exists():
             meta_path.unlink()
+        self.catalog.delete(doc_id)
         
         # JSON 파일은 RAGService의 JSON 인덱스에서 자동으로 관리되므로
-        # 여기서는 메타데이터 파일만 삭제
+        # 여기서는 카탈로그 항목만 삭제
         
         return True
     
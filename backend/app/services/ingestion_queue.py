@@ -0,0 +1,358 @@
+"""
+문서 수집(ingestion) 작업 큐
+
+업로드 요청은 파일을 큐 보관 폴더로 옮기고 작업 ID만 즉시 반환합니다.
+asyncio 작업자들이 파싱 → (선택) 임베딩 → 세그먼트 기록 → 문서 등록 순으로 처리하며,
+작업 상태는 SQLite에 저장되어 서버 재시작 후에도 이어서 처리됩니다.
+"""
+import os
+import json
+import uuid
+import shutil
+import sqlite3
+import asyncio
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+
+from app.core.config import settings
+from app.core.sqlite import SQLiteDatabase
+
+logger = logging.getLogger(__name__)
+
+# 작업 상태
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+FINISHED_STATUSES = (SUCCEEDED, FAILED, CANCELLED)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    filename TEXT NOT NULL,
+    folder TEXT,
+    file_path TEXT NOT NULL,
+    metadata TEXT,
+    status TEXT NOT NULL,
+    stage TEXT,
+    progress REAL NOT NULL DEFAULT 0,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    error TEXT,
+    result TEXT,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status, created_at);
+"""
+
+
+class PermanentJobError(Exception):
+    """재시도해도 성공할 수 없는 작업 오류 (형식 오류 등)"""
+
+
+class IngestionQueue:
+    """
+    SQLite에 상태를 저장하는 asyncio 작업자 풀
+
+    Args:
+        db_path: 작업 상태 SQLite 파일 경로
+        spool_dir: 대기 중인 업로드 파일 보관 폴더
+        index_dir: 작업별 청크 세그먼트 출력 폴더
+        num_workers: 동시에 처리할 작업 수
+        max_attempts: 작업당 최대 시도 횟수
+        retry_delay: 재시도 전 대기 시간 (초, 시도마다 2배)
+        embedder: embed_batch를 제공하는 임베더 (None이면 임베딩 단계 생략)
+        embed_batch_size / embed_batch_wait_ms: 작업 간 임베딩 배치 크기와 대기 시간
+        document_service: 완료 시 문서를 등록할 DocumentService
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        spool_dir: str,
+        index_dir: str,
+        num_workers: int = 2,
+        max_attempts: int = 3,
+        retry_delay: float = 2.0,
+        embedder=None,
+        embed_batch_size: int = 64,
+        embed_batch_wait_ms: float = 50.0,
+        document_service=None
+    ):
+        self.db_path = db_path
+        self.spool_dir = Path(spool_dir)
+        self.index_dir = Path(index_dir)
+        self.num_workers = num_workers
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.embedder = embedder
+        self.embed_batch_size = embed_batch_size
+        self.embed_batch_wait_ms = embed_batch_wait_ms
+        self.document_service = document_service
+
+        self.spool_dir.mkdir(parents=True, exist_ok=True)
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        self.db = SQLiteDatabase(db_path, _SCHEMA)
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._running: Dict[str, asyncio.Task] = {}
+        self._retry_handles: Dict[str, asyncio.TimerHandle] = {}
+        self._batcher = None
+        self._stopping = False
+
+    # ------------------------------------------------------------------
+    # SQLite 접근
+    # ------------------------------------------------------------------
+    def _execute(self, sql: str, params: tuple = ()) -> List[sqlite3.Row]:
+        return self.db.execute(sql, params)
+
+    def _update(self, job_id: str, **fields):
+        fields["updated_at"] = datetime.now().isoformat()
+        columns = ", ".join(f"{name} = ?" for name in fields)
+        self._execute(f"UPDATE jobs SET {columns} WHERE id = ?", (*fields.values(), job_id))
+
+    @staticmethod
+    def _row_to_dict(row: sqlite3.Row) -> Dict[str, Any]:
+        job = dict(row)
+        job["metadata"] = json.loads(job["metadata"]) if job["metadata"] else None
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        job.pop("file_path", None)
+        return job
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        rows = self._execute("SELECT * FROM jobs WHERE id = ?", (job_id,))
+        return self._row_to_dict(rows[0]) if rows else None
+
+    def list_jobs(self, status: Optional[str] = None, limit: int = 50) -> List[Dict[str, Any]]:
+        if status:
+            rows = self._execute("SELECT * FROM jobs WHERE status = ? ORDER BY created_at DESC LIMIT ?", (status, limit))
+        else:
+            rows = self._execute("SELECT * FROM jobs ORDER BY created_at DESC LIMIT ?", (limit,))
+        return [self._row_to_dict(row) for row in rows]
+
+    # ------------------------------------------------------------------
+    # 작업 제어
+    # ------------------------------------------------------------------
+    async def start(self):
+        """작업자 시작 (중단된 작업은 대기 상태로 되돌려 다시 처리)"""
+        if self._workers:
+            return
+        self._stopping = False
+        self._queue = asyncio.Queue()
+        if self.embedder is not None:
+            from rag.embedding.batcher import EmbeddingBatcher
+            self._batcher = EmbeddingBatcher(
+                self.embedder,
+                max_batch_size=self.embed_batch_size,
+                max_wait_ms=self.embed_batch_wait_ms
+            )
+            self._batcher.start()
+
+        self._execute(
+            "UPDATE jobs SET status = ?, stage = NULL, updated_at = ? WHERE status = ?",
+            (QUEUED, datetime.now().isoformat(), RUNNING)
+        )
+        pending = self._execute("SELECT id FROM jobs WHERE status = ? ORDER BY created_at", (QUEUED,))
+        for row in pending:
+            self._queue.put_nowait(row["id"])
+        if pending:
+            logger.info(f"수집 작업 {len(pending)}개 재개")
+
+        self._workers = [asyncio.create_task(self._worker(i)) for i in range(self.num_workers)]
+        logger.info(f"수집 작업 큐 시작: 작업자 {self.num_workers}개")
+
+    async def stop(self):
+        """작업자 중지 (진행 중인 작업은 다음 시작 시 재개)"""
+        self._stopping = True
+        for handle in self._retry_handles.values():
+            handle.cancel()
+        self._retry_handles.clear()
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        if self._batcher is not None:
+            await self._batcher.stop()
+            self._batcher = None
+
+    def submit(self, filename: str, source_path: str, metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """업로드 파일을 큐 보관 폴더로 옮기고 작업 등록 (처리할 수 없는 형식이면 ValueError)"""
+        from rag.ingest import SUPPORTED_EXTENSIONS
+
+        if Path(filename).suffix.lower() not in SUPPORTED_EXTENSIONS:
+            raise ValueError(f"지원하지 않는 파일 형식입니다: {filename}")
+        if self.document_service is not None:
+            # 파싱/임베딩 비용을 쓰기 전에 문서 등록 단계와 같은 규칙으로 거부
+            self.document_service.check_supported(filename)
+
+        job_id = uuid.uuid4().hex
+        spooled_path = self.spool_dir / f"{job_id}{Path(filename).suffix}"
+        shutil.move(source_path, spooled_path)
+
+        now = datetime.now().isoformat()
+        folder = (metadata or {}).get("folder")
+        self._execute(
+            "INSERT INTO jobs (id, filename, folder, file_path, metadata, status, progress, attempts, max_attempts, created_at, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, 0, 0, ?, ?, ?)",
+            (job_id, filename, folder, str(spooled_path), json.dumps(metadata, ensure_ascii=False) if metadata else None,
+             QUEUED, self.max_attempts, now, now)
+        )
+        if self._queue is not None:
+            self._queue.put_nowait(job_id)
+        return self.get_job(job_id)
+
+    def cancel(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """대기/실행 중인 작업 취소 (이미 끝난 작업은 그대로 반환)"""
+        job = self.get_job(job_id)
+        if job is None or job["status"] in FINISHED_STATUSES:
+            return job
+        handle = self._retry_handles.pop(job_id, None)
+        if handle:
+            handle.cancel()
+        self._update(job_id, status=CANCELLED, stage=None)
+        task = self._running.get(job_id)
+        if task is not None:
+            task.cancel()
+        return self.get_job(job_id)
+
+    def retry(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """실패/취소된 작업을 다시 대기열에 추가"""
+        job = self.get_job(job_id)
+        if job is None:
+            return None
+        if job["status"] not in (FAILED, CANCELLED):
+            raise ValueError(f"실패하거나 취소된 작업만 재시도할 수 있습니다 (현재 상태: {job['status']})")
+        rows = self._execute("SELECT file_path FROM jobs WHERE id = ?", (job_id,))
+        if not os.path.exists(rows[0]["file_path"]):
+            raise ValueError("업로드 파일이 남아 있지 않아 재시도할 수 없습니다.")
+        self._update(job_id, status=QUEUED, stage=None, progress=0.0, attempts=0, error=None)
+        if self._queue is not None:
+            self._queue.put_nowait(job_id)
+        return self.get_job(job_id)
+
+    # ------------------------------------------------------------------
+    # 작업자
+    # ------------------------------------------------------------------
+    async def _worker(self, worker_id: int):
+        while True:
+            job_id = await self._queue.get()
+            rows = self._execute("SELECT * FROM jobs WHERE id = ?", (job_id,))
+            if not rows or rows[0]["status"] != QUEUED:
+                continue  # 취소되었거나 이미 처리된 작업
+
+            attempts = rows[0]["attempts"] + 1
+            self._update(job_id, status=RUNNING, attempts=attempts, error=None)
+            task = asyncio.create_task(self._process(dict(rows[0])))
+            self._running[job_id] = task
+            try:
+                result = await task
+                self._update(job_id, status=SUCCEEDED, stage="done", progress=1.0,
+                             result=json.dumps(result, ensure_ascii=False))
+                self._cleanup_spool(rows[0]["file_path"])
+                logger.info(f"수집 작업 완료: {job_id} ({rows[0]['filename']})")
+            except asyncio.CancelledError:
+                if self._stopping:
+                    raise  # 서버 종료: 실행 중 상태로 남겨 다음 시작 시 재개
+                self._cleanup_output(job_id)
+                logger.info(f"수집 작업 취소됨: {job_id}")
+            except PermanentJobError as e:
+                self._cleanup_output(job_id)
+                self._update(job_id, status=FAILED, error=str(e))
+                logger.warning(f"수집 작업 실패 (재시도 불가): {job_id}, {str(e)}")
+            except Exception as e:
+                self._handle_failure(job_id, attempts, rows[0]["max_attempts"], e)
+            finally:
+                self._running.pop(job_id, None)
+
+    def _handle_failure(self, job_id: str, attempts: int, max_attempts: int, error: Exception):
+        message = f"{type(error).__name__}: {str(error)}"
+        self._cleanup_output(job_id)
+        if attempts >= max_attempts:
+            self._update(job_id, status=FAILED, error=message)
+            logger.error(f"수집 작업 최종 실패 ({attempts}회 시도): {job_id}, {message}")
+            return
+        delay = self.retry_delay * (2 ** (attempts - 1))
+        self._update(job_id, status=QUEUED, stage=None, error=message)
+        logger.warning(f"수집 작업 실패 (시도 {attempts}/{max_attempts}): {job_id}, {message}. {delay:.1f}초 후 재시도")
+
+        def _requeue():
+            self._retry_handles.pop(job_id, None)
+            self._queue.put_nowait(job_id)
+
+        self._retry_handles[job_id] = asyncio.get_running_loop().call_later(delay, _requeue)
+
+    @staticmethod
+    def _cleanup_spool(file_path: str):
+        try:
+            os.unlink(file_path)
+        except OSError:
+            pass
+
+    def _cleanup_output(self, job_id: str):
+        """실패/취소된 작업이 남긴 세그먼트 폴더 제거"""
+        shutil.rmtree(self.index_dir / job_id, ignore_errors=True)
+
+    async def _process(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        """작업 하나 처리: 파싱 → 임베딩 → 세그먼트 기록 → 문서 등록"""
+        from starlette.concurrency import run_in_threadpool
+        from rag.ingest import IngestTask, SUPPORTED_EXTENSIONS, SegmentWriter, parse_task
+
+        job_id = job["id"]
+        metadata = json.loads(job["metadata"]) if job["metadata"] else None
+        kind = SUPPORTED_EXTENSIONS.get(Path(job["filename"]).suffix.lower())
+        if kind is None:
+            raise PermanentJobError(f"지원하지 않는 파일 형식입니다: {job['filename']}")
+
+        # 1) 파싱/청킹 (스레드에서 실행)
+        self._update(job_id, stage="parse", progress=0.1)
+        task = IngestTask(path=job["file_path"], folder=job["folder"] or "", kind=kind, filename=job["filename"])
+        parsed = await run_in_threadpool(parse_task, task, settings.CHUNK_SIZE, settings.CHUNK_OVERLAP)
+        if parsed["error"]:
+            raise PermanentJobError(f"파싱 실패: {parsed['error']}")
+        records = parsed["records"]
+
+        # 2) 임베딩 (다른 작업의 요청과 함께 배치 처리)
+        if self._batcher is not None and records:
+            self._update(job_id, stage="embed", progress=0.4)
+            targets = [r for r in records if r["content"] and r["content"].strip()]
+            step = max(self.embed_batch_size * 4, 1)
+            for start in range(0, len(targets), step):
+                part = targets[start:start + step]
+                vectors = await self._batcher.embed([r["content"] for r in part])
+                for record, vector in zip(part, vectors):
+                    record["embedding"] = vector
+                self._update(job_id, progress=0.4 + 0.5 * min(1.0, (start + len(part)) / len(targets)))
+
+        # 3) 세그먼트 기록 및 문서 등록
+        self._update(job_id, stage="store", progress=0.9)
+        output_dir = self.index_dir / job_id
+        writer = SegmentWriter(output_dir)
+        try:
+            await run_in_threadpool(writer.write, records)
+        finally:
+            writer.close()
+
+        document = None
+        if self.document_service is not None:
+            try:
+                info = await self.document_service.upload_document(
+                    filename=job["filename"],
+                    metadata=metadata,
+                    file_path=job["file_path"]
+                )
+            except ValueError as e:
+                raise PermanentJobError(str(e))
+            document = info.model_dump() if hasattr(info, "model_dump") else info.dict()
+
+        return {
+            "chunks": len(records),
+            "embedded": sum(1 for r in records if "embedding" in r),
+            "segments": [str(output_dir / s["file"]) for s in writer.segments],
+            "document": document,
+        }
@@ -1,4 +1,4 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, AsyncIterator, Tuple
 import time
 import asyncio
 import logging
@@ -6,11 +6,32 @@ from app.models.rag_models import QueryRequest, QueryResponse, DocumentChunk
 from app.core.config import settings
 from rag.retrieval.json_index import JSONIndex
 from rag.llm.llm_client import LLMClient
+from rag.llm.prompts import build_extractive_answer
+from rag.llm.semantic_cache import SemanticCache
+from rag.retrieval.reranker import FeatureReranker
+from rag.retrieval.diversity import mmr_select, quota_select
+from rag.retrieval.region_registry import REGISTRY_FILENAME, load_region_registry
+from rag.utils.rate_limit import get_shared_rate_limiter
+from rag.utils.circuit_breaker import CircuitBreaker
 
 class RAGService:
     def __init__(self):
         logger = logging.getLogger(__name__)
         
+        # OpenAI 호출 공유 속도 제한기 (동시 요청과 수집 작업 임베딩 전체에 RPM/TPM 및 재시도 예산 적용)
+        self.rate_limiter = get_shared_rate_limiter()
+        
+        # LLM 회로 차단기 (장애/지연 시 LLM 호출 없이 검색 결과 기반 답변 반환)
+        self.llm_breaker = CircuitBreaker(
+            name="llm",
+            window_size=settings.LLM_BREAKER_WINDOW,
+            min_calls=settings.LLM_BREAKER_MIN_CALLS,
+            failure_rate_threshold=settings.LLM_BREAKER_FAILURE_RATE,
+            slow_call_seconds=settings.LLM_BREAKER_SLOW_CALL_SECONDS,
+            slow_call_rate_threshold=settings.LLM_BREAKER_SLOW_CALL_RATE,
+            open_seconds=settings.LLM_BREAKER_OPEN_SECONDS
+        )
+        
         # OpenAI API 키 확인 (LLM만 사용)
         if not settings.OPENAI_API_KEY or settings.OPENAI_API_KEY == "":
             logger.warning("OpenAI API 키가 설정되지 않았습니다. .env 파일을 확인해주세요.")
@@ -19,22 +40,78 @@ class RAGService:
             try:
                 self.llm_client = LLMClient(
                     api_key=settings.OPENAI_API_KEY,
-                    model=settings.OPENAI_MODEL
+                    model=settings.OPENAI_MODEL,
+                    base_url=settings.OPENAI_BASE_URL or None,
+                    rate_limiter=self.rate_limiter
                 )
                 logger.info("OpenAI LLM 클라이언트 초기화 완료")
             except Exception as e:
                 logger.error(f"OpenAI LLM 클라이언트 초기화 실패: {str(e)}", exc_info=True)
                 self.llm_client = None
         
+        # 검색 결과 재순위화기 (검색과 LLM 사이)
+        self.reranker = FeatureReranker(budget_ms=settings.RERANK_BUDGET_MS) if settings.RERANK_ENABLED else None
+        
+        # 여러 지역 비교 검색의 폴더별 검색 스레드 풀 (0이면 순차 실행)
+        self.fanout_executor = None
+        if settings.REGION_FANOUT_WORKERS > 0:
+            from concurrent.futures import ThreadPoolExecutor
+            self.fanout_executor = ThreadPoolExecutor(
+                max_workers=settings.REGION_FANOUT_WORKERS, thread_name_prefix="region-fanout"
+            )
+        
+        # region 폴더 파일명 -> 색인된 지역명 (레지스트리가 바뀌면 옮겨 색인)
+        self._region_files: Dict[str, str] = {}
+        
+        # 의미 기반 답변 캐시 (LLM 호출 앞단)
+        self.answer_cache = self._create_answer_cache() if settings.SEMANTIC_CACHE_ENABLED else None
+        
         # JSON 인덱스 초기화 (JSON만 사용)
         try:
-            self.json_index = JSONIndex()
+            self.json_index = JSONIndex(
+                dedup_threshold=settings.ITEM_DEDUP_THRESHOLD or None,
+                fuzzy_max_distance=settings.FUZZY_MAX_EDIT_DISTANCE
+            )
             self._load_json_index()
+            self.json_index.load_synonyms(self._synonyms_path())
+            if settings.FUZZY_MAX_EDIT_DISTANCE > 0:
+                # 첫 쿼리가 사전 생성을 기다리지 않도록 미리 생성
+                self.json_index.build_fuzzy()
             logger.info("JSON 인덱스 초기화 완료")
         except Exception as e:
             logger.error(f"JSON 인덱스 초기화 실패: {str(e)}", exc_info=True)
             raise RuntimeError(f"JSON 인덱스 초기화 실패: {str(e)}") from e
     
+    def _create_answer_cache(self) -> SemanticCache:
+        """설정에 맞는 쿼리 임베더로 답변 캐시 생성 (API 키가 없으면 로컬 임베더)"""
+        logger = logging.getLogger(__name__)
+        from rag.llm.semantic_cache import HashingEmbedder
+        
+        embedder = None
+        if settings.SEMANTIC_CACHE_EMBEDDER == "openai" and settings.OPENAI_API_KEY:
+            from rag.embedding.embedder import Embedder
+            embedder = Embedder(
+                api_key=settings.OPENAI_API_KEY,
+                model=settings.OPENAI_EMBEDDING_MODEL,
+                base_url=settings.OPENAI_BASE_URL or None,
+                rate_limiter=self.rate_limiter
+            )
+        if embedder is None:
+            embedder = HashingEmbedder()
+        logger.info(f"의미 답변 캐시 사용: {type(embedder).__name__}, 임계값 {settings.SEMANTIC_CACHE_THRESHOLD}")
+        return SemanticCache(
+            embedder,
+            threshold=settings.SEMANTIC_CACHE_THRESHOLD,
+            ttl_seconds=settings.SEMANTIC_CACHE_TTL_SECONDS,
+            max_entries=settings.SEMANTIC_CACHE_MAX_ENTRIES
+        )
+    
+    @staticmethod
+    def _synonyms_path():
+        """동의어 사전 파일 경로"""
+        from pathlib import Path
+        return Path(settings.SYNONYMS_PATH) if settings.SYNONYMS_PATH else Path(settings.DOCUMENTS_DIR) / "synonyms.json"
+    
     def _load_json_index(self):
         """documents 폴더의 JSON 파일들을 JSON 인덱스에 로드"""
         logger = logging.getLogger(__name__)
@@ -55,58 +132,208 @@ class RAGService:
             
             folder_name = folder_path.name
             
-            # 폴더 내의 JSON 파일 찾기
+            # 폴더 내의 JSON 파일 찾기 (지역 레지스트리는 검색 항목이 아니므로 제외)
             for json_file in folder_path.glob("*.json"):
-                if json_file.name.startswith('~$'):
+                if json_file.name.startswith('~$') or (folder_name == "region" and json_file.name == REGISTRY_FILENAME):
                     continue
                 if self.json_index.load_json_file(json_file, folder_name):
                     json_count += 1
         
-        # 루트 폴더의 JSON 파일도 찾기
+        # 루트 폴더의 JSON 파일도 찾기 (동의어 사전은 검색 항목이 아니므로 제외)
+        synonyms_path = self._synonyms_path().resolve()
         for json_file in documents_dir.glob("*.json"):
-            if json_file.name.startswith('~$'):
+            if json_file.name.startswith('~$') or json_file.resolve() == synonyms_path:
                 continue
             if self.json_index.load_json_file(json_file, ""):
                 json_count += 1
         
         # region 폴더의 JSON 파일 (지역명을 폴더명으로 사용)
-        # 파일명 매핑: Jeonju_Construction_Ordinance.json -> 전주시
         region_folder = documents_dir / "region"
         if region_folder.exists():
-            # 지역명 매핑 (JSON 파일명 -> 지역명)
-            region_file_mapping = {
-                "Jeonju_Construction_Ordinance.json": "전주시"
-                # 향후 다른 지역 추가:
-                # "Seoul_Construction_Ordinance.json": "서울시",
-                # "Busan_Construction_Ordinance.json": "부산시",
-            }
-            
             for json_file in region_folder.glob("*.json"):
-                if json_file.name.startswith('~$'):
+                if json_file.name.startswith('~$') or json_file.name == REGISTRY_FILENAME:
                     continue
                 
-                # 파일명으로 지역명 찾기
-                region_name = region_file_mapping.get(json_file.name)
-                if not region_name:
-                    # 매핑에 없으면 파일명에서 추출 시도
-                    if "Jeonju" in json_file.name or "전주" in json_file.name:
-                        region_name = "전주시"
-                    else:
-                        # 기본값으로 "region" 사용 (향후 확장 고려)
-                        region_name = "region"
+                # 지역 레지스트리로 지역명 찾기 (파일명 매핑 > 항목 jurisdiction > 파일명 별칭)
+                region_name = self._resolve_region_name(json_file.name, json_file)
+                self._region_files[json_file.name] = region_name
                 
                 if self.json_index.load_json_file(json_file, region_name):
                     json_count += 1
                     logger.info(f"지역 JSON 파일 인덱싱: {region_name}/{json_file.name}")
         
         logger.info(f"JSON 인덱스 로드 완료: {json_count}개 JSON 파일 인덱싱됨")
+        if self.json_index.skipped_duplicates:
+            logger.info(f"근사 중복 항목 {self.json_index.skipped_duplicates}개는 한 번만 인덱싱됨")
+        if self.json_index.kept_variants:
+            logger.info(f"근사 중복이지만 숫자/용도지역이 달라 유지한 항목 {self.json_index.kept_variants}개")
+    
+    @classmethod
+    def _resolve_region_name(cls, filename: str, path=None) -> str:
+        """region 폴더 파일의 지역명 (documents/region/regions.json 레지스트리, 없으면 "region")"""
+        return load_region_registry(settings.DOCUMENTS_DIR).resolve(filename, path)
+    
+    def _request_regions(self, request: QueryRequest) -> List[str]:
+        """요청의 region + regions를 별칭 정규화 후 중복 없이 (순서 유지)"""
+        registry = load_region_registry(settings.DOCUMENTS_DIR)
+        names = [request.region] + list(request.regions or [])
+        return list(dict.fromkeys(registry.canonical(name) for name in names if name and name.strip()))
+    
+    def _reindex_regions(self) -> bool:
+        """지역 레지스트리가 바뀌면 지역명이 달라진 region 파일을 새 지역명으로 옮겨 색인"""
+        logger = logging.getLogger(__name__)
+        
+        from pathlib import Path
+        region_folder = Path(settings.DOCUMENTS_DIR) / "region"
+        changed = []
+        for filename, old_region in list(self._region_files.items()):
+            json_file = region_folder / filename
+            if not json_file.exists():
+                continue
+            new_region = self._resolve_region_name(filename, json_file)
+            if new_region == old_region:
+                continue
+            with self.json_index.writing():
+                self.json_index.remove_file(old_region, filename)
+                self.json_index.load_json_file(json_file, new_region)
+            self._region_files[filename] = new_region
+            changed.extend([old_region, new_region])
+            logger.info(f"지역 변경 재인덱싱: {filename} ({old_region} -> {new_region})")
+        if changed and self.answer_cache is not None:
+            self.answer_cache.invalidate(changed)
+        return True
+    
+    def reindex_file(self, file_path) -> bool:
+        """documents 폴더 안의 JSON 파일 하나만 다시 인덱싱 (내용이 바뀐 업로드 반영)"""
+        logger = logging.getLogger(__name__)
+        
+        from pathlib import Path
+        file_path = Path(file_path)
+        documents_dir = Path(settings.DOCUMENTS_DIR)
+        if file_path.resolve() == self._synonyms_path().resolve():
+            loaded = self.json_index.load_synonyms(file_path)
+            logger.info(f"동의어 사전 다시 로드: {file_path} ({'성공' if loaded else '실패'})")
+            if self.answer_cache is not None:
+                self.answer_cache.invalidate()
+            return loaded
+        relative = file_path.resolve().relative_to(documents_dir.resolve())
+        if relative.parts == ("region", REGISTRY_FILENAME):
+            logger.info(f"지역 레지스트리 변경: {file_path}")
+            return self._reindex_regions()
+        # _load_json_index와 같은 폴더명으로 인덱싱 (region 파일은 지역명으로도 인덱싱됨)
+        folders = [relative.parts[0]] if len(relative.parts) > 1 else [""]
+        stale_folders = []
+        if folders[0] == "region":
+            region_name = self._resolve_region_name(file_path.name, file_path)
+            # 내용이 바뀌어 지역(jurisdiction)이 달라졌으면 이전 지역에서 제거
+            previous = self._region_files.get(file_path.name)
+            if previous is not None and previous != region_name:
+                self.json_index.remove_file(previous, file_path.name)
+                stale_folders.append(previous)
+            self._region_files[file_path.name] = region_name
+            folders.append(region_name)
+        
+        loaded = False
+        for folder in folders:
+            loaded = self.json_index.replace_file(file_path, folder)
+            logger.info(f"JSON 파일 재인덱싱: {folder}/{file_path.name} ({'성공' if loaded else '실패'})")
+        # 바뀐 폴더를 검색 범위로 하는 캐시 답변은 더 이상 검색 결과와 맞지 않음
+        if self.answer_cache is not None:
+            self.answer_cache.invalidate(folders + stale_folders)
+        return loaded
+    
+    def _search_sizes(self, request: QueryRequest, top_k: Optional[int]) -> Tuple[int, int]:
+        """(컨텍스트로 쓸 결과 수, JSON 인덱스에서 가져올 후보 수)"""
+        if self.reranker is not None or settings.MMR_ENABLED:
+            # 후보를 넉넉히 가져와 재순위화/다양성 선택 후 정밀한 상위 몇 개만 컨텍스트로 사용
+            search_top_k = top_k or request.top_k or settings.RERANK_TOP_N
+            return search_top_k, max(search_top_k, settings.RERANK_CANDIDATES)
+        search_top_k = top_k or request.top_k or 5
+        return search_top_k, search_top_k
+    
+    def _prefetch_candidates(self, requests: List[QueryRequest], top_k: Optional[int]) -> Dict[int, List[Dict[str, Any]]]:
+        """같은 건물 유형/지역/패싯/후보 수의 쿼리끼리 묶어 후보 검색 (요청 순번 -> 후보)"""
+        logger = logging.getLogger(__name__)
+        
+        groups: Dict[tuple, List[int]] = {}
+        for index, request in enumerate(requests):
+            if not request.query or not request.query.strip() or not request.folder or not request.folder.strip():
+                continue
+            regions = self._request_regions(request)
+            if len(regions) > 1:
+                # 여러 지역 비교 검색은 query에서 폴더별로 검색
+                continue
+            region = regions[0] if regions else None
+            facet_key = tuple(sorted((field, tuple(values)) for field, values in (request.facets or {}).items()))
+            key = (request.folder, region, facet_key, self._search_sizes(request, top_k)[1])
+            groups.setdefault(key, []).append(index)
+        
+        candidates: Dict[int, List[Dict[str, Any]]] = {}
+        for (folder, region, _, candidate_k), indexes in groups.items():
+            facets = requests[indexes[0]].facets
+            try:
+                results = self.json_index.search_batch(
+                    [requests[i].query for i in indexes],
+                    folder_filter=folder,
+                    region_filter=region,
+                    top_k=candidate_k,
+                    facets=facets
+                )
+            except Exception as e:
+                # 잘못된 패싯 등은 쿼리별 처리에서 같은 오류 응답을 만들도록 건너뜀
+                logger.warning(f"일괄 후보 검색 실패 (쿼리별 검색으로 처리): {str(e)}")
+                continue
+            candidates.update(zip(indexes, results))
+        return candidates
+    
+    async def query_batch(
+        self,
+        requests: List[QueryRequest],
+        top_k: Optional[int] = None,
+        max_concurrency: Optional[int] = None
+    ) -> AsyncIterator[Tuple[int, QueryResponse]]:
+        """
+        여러 쿼리 일괄 처리 (끝나는 순서대로 (요청 순번, 응답) 반환)
+        
+        후보 검색은 같은 조건의 쿼리끼리 한 번에 하고, LLM 호출은 동시에 max_concurrency개까지만 진행합니다.
+        """
+        logger = logging.getLogger(__name__)
+        
+        # 후보 검색은 순수 Python 루프라 큰 배치에서는 이벤트 루프를 막지 않도록 스레드에서 실행
+        candidates = {}
+        if self.json_index is not None:
+            from starlette.concurrency import run_in_threadpool
+            candidates = await run_in_threadpool(self._prefetch_candidates, requests, top_k)
+        semaphore = asyncio.Semaphore(max_concurrency or settings.QUERY_BATCH_CONCURRENCY)
+        
+        async def _run(index: int, request: QueryRequest) -> Tuple[int, QueryResponse]:
+            if not request.query or not request.query.strip():
+                return index, QueryResponse(answer="질문을 입력해주세요.", chunks=[], sources=[])
+            async with semaphore:
+                return index, await self.query(request, top_k=top_k, candidates=candidates.get(index))
+        
+        start_time = time.time()
+        tasks = [asyncio.ensure_future(_run(index, request)) for index, request in enumerate(requests)]
+        try:
+            for finished in asyncio.as_completed(tasks):
+                yield await finished
+            logger.info(f"일괄 쿼리 완료: {len(requests)}개, {time.time() - start_time:.2f}초")
+        finally:
+            # 클라이언트 연결이 끊기면 남은 쿼리 취소
+            for task in tasks:
+                task.cancel()
     
     async def query(
         self,
         request: QueryRequest,
-        top_k: Optional[int] = None
+        top_k: Optional[int] = None,
+        candidates: Optional[List[Dict[str, Any]]] = None
     ) -> QueryResponse:
-        """RAG 쿼리 처리 (JSON만 사용)"""
+        """
+        RAG 쿼리 처리 (JSON만 사용)
+        
+        candidates: 일괄 처리에서 미리 검색한 JSON 인덱스 후보 (None이면 직접 검색)
+        """
         logger = logging.getLogger(__name__)
         
         try:
@@ -138,10 +365,10 @@ class RAGService:
                     sources=[]
                 )
             
-            # 지역 필터링 (선택사항)
-            region_filter = request.region
+            # 지역 필터링 (선택사항, region + regions를 별칭 정규화, 여러 개면 지역 비교 검색)
+            regions = self._request_regions(request)
+            region_filter = ", ".join(regions) if regions else None
             if region_filter:
-                region_filter = region_filter.strip()
                 logger.info(f"지역 필터 적용: {region_filter}")
             
             logger.info(f"검색 필터 - 건물 타입: {folder_filter}, 지역: {region_filter or '없음'}")
@@ -151,19 +378,52 @@ class RAGService:
             json_results = []
             
             try:
-                search_top_k = top_k or request.top_k or 5
-                json_results = self.json_index.search(
-                    query=request.query,
-                    folder_filter=folder_filter,
-                    region_filter=region_filter,
-                    top_k=search_top_k
-                )
+                search_top_k, candidate_k = self._search_sizes(request, top_k)
+                if candidates is not None:
+                    json_results = candidates
+                elif len(regions) > 1:
+                    # 여러 지역 비교: 건물 유형 폴더와 각 지역 폴더를 따로 검색
+                    per_source = self.json_index.search_sources(
+                        request.query,
+                        [folder_filter, *regions],
+                        top_k=candidate_k,
+                        facets=request.facets,
+                        executor=self.fanout_executor
+                    )
+                    json_results = [result for results in per_source.values() for result in results]
+                else:
+                    json_results = self.json_index.search(
+                        query=request.query,
+                        folder_filter=folder_filter,
+                        region_filter=regions[0] if regions else None,
+                        top_k=candidate_k,
+                        facets=request.facets
+                    )
+                if len(regions) > 1:
+                    # 출처(폴더)별 할당량으로 병합해 모든 지역 조례가 컨텍스트에 들어가도록 함
+                    if self.reranker is not None:
+                        json_results = self.reranker.rerank(request.query, json_results, len(json_results))
+                    json_results = quota_select(
+                        json_results,
+                        max(search_top_k, len(regions) + 1),
+                        lambda result: result["metadata"]["folder"]
+                    )
+                else:
+                    if self.reranker is not None:
+                        # MMR을 쓰면 후보 전체의 순위가 필요하므로 자르지 않음
+                        rerank_k = len(json_results) if settings.MMR_ENABLED else search_top_k
+                        json_results = self.reranker.rerank(request.query, json_results, rerank_k)
+                    if settings.MMR_ENABLED:
+                        # 같은 답변의 다른 표현이 컨텍스트를 채우지 않도록 서로 덜 겹치는 항목 선택
+                        json_results = mmr_select(json_results, search_top_k, lambda_=settings.MMR_LAMBDA)
                 search_time = time.time() - start_time
                 
                 if json_results:
                     logger.info(f"JSON 인덱스 검색 완료: {len(json_results)}개 결과, {search_time:.3f}초")
                 else:
                     logger.warning(f"JSON 검색 결과 없음: {search_time:.3f}초")
+            except ValueError:
+                raise
             except Exception as e:
                 logger.error(f"JSON 인덱스 검색 실패: {str(e)}", exc_info=True)
                 return QueryResponse(
@@ -172,13 +432,17 @@ class RAGService:
                     sources=[]
                 )
             
+            # 검색 대상 폴더의 미리 집계된 패싯 수 (UI 필터 좁히기용)
+            facet_counts = self.json_index.facet_counts([folder_filter, *regions])
+            
             # 검색된 문서가 없는 경우 처리
             if not json_results or len(json_results) == 0:
                 logger.warning(f"검색된 문서가 없습니다. (폴더: {folder_filter}, 쿼리: {request.query[:50]}...)")
                 return QueryResponse(
                     answer=f"죄송합니다. 선택하신 건축 양식({folder_filter})의 JSON 문서에서 질문과 관련된 내용을 찾을 수 없습니다.\n\n다음 사항을 확인해주세요:\n1. 해당 폴더에 Construction_law_qa.json 파일이 있는지\n2. 질문을 다시 정리해서 시도해보세요",
                     chunks=[],
-                    sources=[]
+                    sources=[],
+                    facet_counts=facet_counts
                 )
             
             # JSON 결과를 retrieved_chunks로 변환
@@ -200,8 +464,8 @@ class RAGService:
                     metadata = chunk.get("metadata") or {}
                     content = chunk.get("content", "")
                     
-                    # 내용이 있고 비어있지 않은 경우만 추가
-                    if content and content.strip():
+                    # 내용이 있는 경우만 추가 (JSON 인덱스가 색인 시 포맷팅/공백 정리를 끝낸 본문)
+                    if content:
                         # score 안전하게 처리
                         score = chunk.get("score")
                         if score is None or not isinstance(score, (int, float)):
@@ -211,14 +475,14 @@ class RAGService:
                         
                         document_chunks.append(
                             DocumentChunk(
-                                content=content.strip(),
+                                content=content,
                                 metadata=metadata,
                                 score=score
                             )
                         )
                         
                         # 컨텍스트용 텍스트 수집
-                        context_parts.append(content.strip())
+                        context_parts.append(content)
                         
                         # 출처 추가
                         source = metadata.get("source")
@@ -238,12 +502,49 @@ class RAGService:
             context = "\n\n".join(context_parts)
             
             # 컨텍스트가 비어있는 경우 처리
-            if not context.strip():
+            if not context:
                 logger.warning("컨텍스트가 비어있습니다.")
                 return QueryResponse(
                     answer=f"죄송합니다. '{folder_filter}' 폴더의 JSON 문서에서 질문과 관련된 내용을 찾을 수 없습니다.",
                     chunks=[],
-                    sources=[]
+                    sources=[],
+                    facet_counts=facet_counts
+                )
+            
+            # 의미 캐시 조회 (같은 범위의 비슷한 질문이면 LLM 호출 없이 최근 답변 재사용)
+            # 회로가 열려 있으면 장애 중인 공급자에 임베딩을 요청하지 않도록 로컬 임베더 캐시만 조회
+            cache_scope = cache_vector = None
+            cache_generation = 0
+            breaker_open = self.llm_breaker.state == CircuitBreaker.OPEN
+            if self.answer_cache is not None and not (breaker_open and self.answer_cache.remote):
+                cache_generation = self.answer_cache.generation
+                cache_vector = await self.answer_cache.embed(request.query)
+                if cache_vector is not None:
+                    cache_scope = SemanticCache.scope_key(folder_filter, region_filter, request.facets, search_top_k)
+                    cached = self.answer_cache.lookup(cache_scope, cache_vector)
+                    if cached is not None:
+                        logger.info(f"의미 캐시 적중 (유사도 {cached[1]:.3f})")
+                        return QueryResponse(
+                            answer=cached[0],
+                            chunks=document_chunks,
+                            sources=list(sources_set),
+                            cached=True,
+                            facet_counts=facet_counts
+                        )
+            
+            # 회로 차단기가 열려 있으면 LLM을 기다리지 않고 추출형 답변 즉시 반환
+            if not self.llm_breaker.allow_request():
+                logger.warning("LLM 회로 차단기 열림 - 검색 결과 기반 추출형 답변 반환")
+                return QueryResponse(
+                    answer=build_extractive_answer(
+                        request.query,
+                        retrieved_chunks,
+                        notice="현재 AI 답변 생성이 지연되고 있어 검색된 자료를 그대로 요약해 드립니다."
+                    ),
+                    chunks=document_chunks,
+                    sources=list(sources_set),
+                    degraded=True,
+                    facet_counts=facet_counts
                 )
             
             # LLM 답변 생성
@@ -256,31 +557,53 @@ class RAGService:
                         query=request.query,
                         context=context,
                         scenario=folder_filter,
-                        region=region_filter
+                        region=region_filter,
+                        raise_errors=True
                     ),
                     timeout=20.0
                 )
                 llm_time = time.time() - llm_start
+                self.llm_breaker.record_success(llm_time)
                 logger.info(f"LLM 답변 생성 완료: {llm_time:.2f}초")
             except asyncio.TimeoutError:
+                self.llm_breaker.record_failure(time.time() - llm_start)
                 logger.error("LLM 답변 생성 타임아웃 (20초 초과)")
                 return QueryResponse(
-                    answer="죄송합니다. 답변 생성 시간이 초과되었습니다. 질문을 더 간단하게 다시 시도해주세요.",
+                    answer=build_extractive_answer(
+                        request.query,
+                        retrieved_chunks,
+                        notice="답변 생성 시간이 초과되어 검색된 자료를 그대로 요약해 드립니다."
+                    ),
                     chunks=document_chunks,
-                    sources=list(sources_set)
+                    sources=list(sources_set),
+                    degraded=True,
+                    facet_counts=facet_counts
                 )
             except Exception as e:
+                self.llm_breaker.record_failure(time.time() - llm_start)
                 logger.error(f"LLM 답변 생성 실패: {str(e)}", exc_info=True)
                 return QueryResponse(
-                    answer="죄송합니다. 답변 생성 중 오류가 발생했습니다. 검색된 문서 정보는 아래 참고 문서에서 확인하실 수 있습니다.",
+                    answer=build_extractive_answer(
+                        request.query,
+                        retrieved_chunks,
+                        notice="답변 생성 중 오류가 발생하여 검색된 자료를 그대로 요약해 드립니다."
+                    ),
                     chunks=document_chunks,
-                    sources=list(sources_set)
+                    sources=list(sources_set),
+                    degraded=True,
+                    facet_counts=facet_counts
+                )
+            
+            if cache_vector is not None:
+                self.answer_cache.put(
+                    cache_scope, (folder_filter, *regions), request.query, cache_vector, answer, cache_generation
                 )
             
             return QueryResponse(
                 answer=answer,
                 chunks=document_chunks,
-                sources=list(sources_set)
+                sources=list(sources_set),
+                facet_counts=facet_counts
             )
     
         except ValueError as e:
@@ -0,0 +1,5 @@
+"""
+검색/RAG 성능 벤치마크 모듈
+
+실제 OpenAI API 없이 합성 코퍼스와 스텁 LLM으로 재현 가능한 측정을 수행합니다.
+"""
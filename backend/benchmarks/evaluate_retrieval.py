@@ -0,0 +1,303 @@
+"""
+오프라인 검색 품질 평가 도구
+
+라벨링된 골든 Q&A 세트(query, folder, region, expected_ids)에 대해 검색 모드별로
+recall@k, MRR, nDCG@k, 지연시간, 컨텍스트 크기를 나란히 보고합니다.
+컨텍스트 크기(= LLM 비용/지연)와 품질을 데이터로 비교하기 위한 도구입니다.
+
+골든 세트 형식 (JSON 배열):
+    [
+      {"query": "다중주택 주차장 기준은?", "folder": "다중주택", "region": "전주시",
+       "expected_ids": ["qa-12", "ord-3"]}
+    ]
+
+사용 예시 (backend 폴더에서):
+    python -m benchmarks.evaluate_retrieval --golden golden.json --documents-dir documents
+    python -m benchmarks.evaluate_retrieval --golden golden.json --k 3 5 8 \\
+        --weights exact=5,question=2,keyword=1,answer=0.5 --weights exact=3,question=3
+    python -m benchmarks.evaluate_retrieval --synthetic 2000
+    python -m benchmarks.evaluate_retrieval --synthetic 500 --modes json_index retriever
+
+retriever 모드는 벡터 검색 경로(Retriever.retrieve)를 스텁 임베딩(문자 bigram 해싱)으로 채워 평가합니다.
+임베딩 API 호출 없이 재현 가능한 대신 점수는 OpenAI 임베딩의 품질을 나타내지 않으며,
+Retriever에는 지역 필터가 없어 골든 항목의 region은 무시됩니다.
+"""
+import sys
+import os
+import json
+import math
+import time
+import asyncio
+import random
+import logging
+import argparse
+import tempfile
+from pathlib import Path
+from typing import List, Dict, Any, Callable, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.run_benchmark import _iter_corpus_files, _percentile, stub_embedding
+from benchmarks.synthetic_corpus import generate_corpus
+
+# 검색 모드: (검색 대상, 골든 항목, top_k) -> 결과 리스트 (검색 대상은 JSONIndex, VECTOR_MODES는 Retriever)
+RetrievalMode = Callable[[Any, Dict[str, Any], int], List[Dict[str, Any]]]
+
+
+def _json_index_mode(index, case: Dict[str, Any], top_k: int) -> List[Dict[str, Any]]:
+    """기본 JSONIndex.search 모드"""
+    return index.search(
+        query=case["query"],
+        folder_filter=case.get("folder"),
+        region_filter=case.get("region"),
+        top_k=top_k,
+    )
+
+
+def _json_index_fuzzy_mode(index, case: Dict[str, Any], top_k: int) -> List[Dict[str, Any]]:
+    """오타/띄어쓰기 변형 확장을 켠 JSONIndex.search 모드"""
+    return index.search(
+        query=case["query"],
+        folder_filter=case.get("folder"),
+        region_filter=case.get("region"),
+        top_k=top_k,
+        fuzzy=True,
+    )
+
+
+def _json_index_rerank_mode(index, case: Dict[str, Any], top_k: int) -> List[Dict[str, Any]]:
+    """JSONIndex.search 후보 50개를 특징 기반 재순위화기로 top_k개까지 줄이는 모드"""
+    from rag.retrieval.reranker import FeatureReranker
+
+    candidates = index.search(
+        query=case["query"],
+        folder_filter=case.get("folder"),
+        region_filter=case.get("region"),
+        top_k=max(top_k, 50),
+    )
+    return FeatureReranker(tokenize=index._extract_keywords).rerank(case["query"], candidates, top_k)
+
+
+def _json_index_rerank_mmr_mode(index, case: Dict[str, Any], top_k: int) -> List[Dict[str, Any]]:
+    """재순위화한 후보 50개에서 MMR로 서로 덜 겹치는 top_k개를 고르는 모드"""
+    from rag.retrieval.diversity import mmr_select
+    from rag.retrieval.reranker import FeatureReranker
+
+    candidates = index.search(
+        query=case["query"],
+        folder_filter=case.get("folder"),
+        region_filter=case.get("region"),
+        top_k=max(top_k, 50),
+    )
+    ranked = FeatureReranker(tokenize=index._extract_keywords).rerank(case["query"], candidates, len(candidates))
+    return mmr_select(ranked, top_k)
+
+
+def _retriever_mode(retriever, case: Dict[str, Any], top_k: int) -> List[Dict[str, Any]]:
+    """스텁 임베딩 벡터로 Retriever.retrieve를 호출하는 모드 (폴더 필터만 적용)"""
+    return asyncio.run(retriever.retrieve(
+        query_embedding=stub_embedding(case["query"]),
+        top_k=top_k,
+        folder_filter=case.get("folder"),
+    ))
+
+
+RETRIEVAL_MODES: Dict[str, RetrievalMode] = {
+    "json_index": _json_index_mode,
+    "json_index_fuzzy": _json_index_fuzzy_mode,
+    "json_index_rerank": _json_index_rerank_mode,
+    "json_index_rerank_mmr": _json_index_rerank_mmr_mode,
+    "retriever": _retriever_mode,
+}
+
+# JSONIndex 대신 Retriever를 검색 대상으로 받는 모드 (JSONIndex 가중치와 무관)
+VECTOR_MODES = ("retriever",)
+
+
+def recall_at_k(retrieved: List[str], expected: set, k: int) -> float:
+    if not expected:
+        return 0.0
+    return len(set(retrieved[:k]) & expected) / len(expected)
+
+
+def reciprocal_rank(retrieved: List[str], expected: set) -> float:
+    for rank, item_id in enumerate(retrieved, 1):
+        if item_id in expected:
+            return 1.0 / rank
+    return 0.0
+
+
+def ndcg_at_k(retrieved: List[str], expected: set, k: int) -> float:
+    """이진 관련도 기준 nDCG@k"""
+    dcg = sum(1.0 / math.log2(rank + 1) for rank, item_id in enumerate(retrieved[:k], 1) if item_id in expected)
+    ideal = sum(1.0 / math.log2(rank + 1) for rank in range(1, min(len(expected), k) + 1))
+    return dcg / ideal if ideal > 0 else 0.0
+
+
+def _redundancy(results: List[Dict[str, Any]]) -> float:
+    """결과 본문 쌍의 평균 Jaccard 유사도 (컨텍스트 중복 정도)"""
+    if len(results) < 2:
+        return 0.0
+    from rag.retrieval.diversity import jaccard_matrix
+
+    similarity = jaccard_matrix([r.get("content", "") for r in results])
+    n = len(results)
+    return float((similarity.sum() - n) / (n * (n - 1)))
+
+
+def build_index(documents_dir: Path, weights: Optional[Dict[str, float]] = None):
+    """RAGService와 같은 폴더 규칙으로 JSONIndex 구성"""
+    from rag.retrieval.json_index import JSONIndex
+
+    index = JSONIndex(weights=weights)
+    for json_file, folder in _iter_corpus_files(documents_dir):
+        index.load_json_file(json_file, folder)
+    return index
+
+
+def build_retriever(documents_dir: Path, store_dir: str):
+    """RAGService와 같은 폴더 규칙의 청크를 스텁 임베딩으로 Retriever에 적재"""
+    from rag.parsers.file_parser import FileParser
+    from rag.retrieval.retriever import Retriever
+
+    retriever = Retriever(vector_store_path=store_dir, similarity_threshold=0.0)
+    for json_file, folder in _iter_corpus_files(documents_dir):
+        for chunk in FileParser.parse_json_file(json_file.read_bytes(), json_file.name, folder):
+            # add_document는 매번 디스크에 저장하므로 메모리에 직접 적재
+            retriever.vectors.append(stub_embedding(chunk["content"]))
+            retriever.contents.append(chunk["content"])
+            retriever.metadatas.append(chunk["metadata"])
+    return retriever
+
+
+def evaluate(
+    index,
+    golden: List[Dict[str, Any]],
+    mode: RetrievalMode,
+    ks: List[int],
+) -> Dict[str, float]:
+    """골든 세트 전체에 대해 한 검색 모드의 지표 계산"""
+    max_k = max(ks)
+    totals = {f"recall@{k}": 0.0 for k in ks}
+    totals.update({f"ndcg@{k}": 0.0 for k in ks})
+    totals["mrr"] = 0.0
+    context_chars = 0
+    redundancy = 0.0
+    latencies = []
+
+    for case in golden:
+        expected = set(case.get("expected_ids", []))
+        start = time.perf_counter()
+        results = mode(index, case, max_k)
+        latencies.append(time.perf_counter() - start)
+
+        retrieved = [r.get("metadata", {}).get("id", "") for r in results]
+        for k in ks:
+            totals[f"recall@{k}"] += recall_at_k(retrieved, expected, k)
+            totals[f"ndcg@{k}"] += ndcg_at_k(retrieved, expected, k)
+        totals["mrr"] += reciprocal_rank(retrieved, expected)
+        context_chars += sum(len(r.get("content", "")) for r in results)
+        redundancy += _redundancy(results)
+
+    n = max(len(golden), 1)
+    report = {name: value / n for name, value in totals.items()}
+    ordered = sorted(latencies)
+    report["p50_ms"] = _percentile(ordered, 50) * 1000
+    report["p95_ms"] = _percentile(ordered, 95) * 1000
+    report["context_chars"] = context_chars / n
+    report["redundancy"] = redundancy / n
+    return report
+
+
+def parse_weights(spec: str) -> Dict[str, float]:
+    """'exact=5,question=2' 형식을 가중치 딕셔너리로 변환"""
+    weights = {}
+    for part in spec.split(","):
+        if not part.strip():
+            continue
+        name, value = part.split("=", 1)
+        weights[name.strip()] = float(value)
+    return weights
+
+
+def synthetic_golden(documents_dir: Path, num_cases: int, seed: int = 11) -> List[Dict[str, Any]]:
+    """합성 코퍼스의 실제 질문을 쿼리로, 해당 항목 id를 정답으로 하는 골든 세트 생성"""
+    rng = random.Random(seed)
+    cases = []
+    qa_files = [(f, folder) for f, folder in _iter_corpus_files(documents_dir) if f.parent.name != "region"]
+    for _ in range(num_cases):
+        json_file, folder = rng.choice(qa_files)
+        with open(json_file, "r", encoding="utf-8") as f:
+            items = json.load(f)
+        item = rng.choice(items)
+        cases.append({"query": item["question"], "folder": folder, "region": None, "expected_ids": [item["id"]]})
+    return cases
+
+
+def _print_report(reports: Dict[str, Dict[str, float]], ks: List[int]):
+    columns = [f"recall@{k}" for k in ks] + ["mrr"] + [f"ndcg@{k}" for k in ks] + ["p50_ms", "p95_ms", "context_chars", "redundancy"]
+    header = f"{'모드':<56}" + "".join(f"{c:>14}" for c in columns)
+    print(header)
+    print("-" * len(header))
+    for name, report in reports.items():
+        print(f"{name:<56}" + "".join(f"{report[c]:>14.3f}" for c in columns))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="검색 품질 오프라인 평가")
+    parser.add_argument("--golden", type=str, help="골든 Q&A 세트 JSON 경로")
+    parser.add_argument("--documents-dir", type=str, default=None, help="평가할 documents 폴더")
+    parser.add_argument("--synthetic", type=int, default=0, help="합성 코퍼스와 골든 세트(N개)로 평가")
+    parser.add_argument("--modes", nargs="+", default=["json_index"], help=f"검색 모드 ({', '.join(RETRIEVAL_MODES)})")
+    parser.add_argument("--weights", action="append", default=[], help="JSONIndex 가중치 (예: exact=5,question=2)")
+    parser.add_argument("--k", type=int, nargs="+", default=[3, 5], help="recall/nDCG 컷오프")
+    parser.add_argument("--output", type=str, default=None, help="결과 JSON 저장 경로")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+
+    unknown = [m for m in args.modes if m not in RETRIEVAL_MODES]
+    if unknown:
+        parser.error(f"알 수 없는 검색 모드: {', '.join(unknown)}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.synthetic:
+            documents_dir = Path(tmp) / "documents"
+            generate_corpus(documents_dir, max(args.synthetic * 5, 1000))
+            golden = synthetic_golden(documents_dir, args.synthetic)
+        else:
+            if not args.golden:
+                parser.error("--golden 또는 --synthetic 중 하나가 필요합니다.")
+            from app.core.config import settings
+            documents_dir = Path(args.documents_dir or settings.DOCUMENTS_DIR)
+            with open(args.golden, "r", encoding="utf-8") as f:
+                golden = json.load(f)
+
+        weight_configs = [parse_weights(spec) for spec in args.weights] or [{}]
+        reports: Dict[str, Dict[str, float]] = {}
+        index_modes = [m for m in args.modes if m not in VECTOR_MODES]
+        if index_modes:
+            for weights in weight_configs:
+                index = build_index(documents_dir, weights)
+                label_suffix = ",".join(f"{k}={v:g}" for k, v in weights.items())
+                for mode_name in index_modes:
+                    label = f"{mode_name}[{label_suffix}]" if label_suffix else mode_name
+                    reports[label] = evaluate(index, golden, RETRIEVAL_MODES[mode_name], args.k)
+
+        vector_modes = [m for m in args.modes if m in VECTOR_MODES]
+        if vector_modes:
+            retriever = build_retriever(documents_dir, str(Path(tmp) / "vector_store"))
+            for mode_name in vector_modes:
+                reports[mode_name] = evaluate(retriever, golden, RETRIEVAL_MODES[mode_name], args.k)
+
+    print(f"골든 세트: {len(golden)}개 쿼리\n")
+    _print_report(reports, args.k)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(reports, f, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
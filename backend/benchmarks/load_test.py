@@ -0,0 +1,125 @@
+"""
+/api/rag/query 부하 생성 스크립트
+
+목표 RPS로 요청을 일정 간격(open-loop)으로 발생시켜 지연시간 분포와 오류율을 측정합니다.
+모의 OpenAI 서버(mock_openai_server.py)와 함께 사용하면 실제 키 없이 재현 가능합니다.
+
+사용 예시 (backend 폴더에서):
+    # 1) 모의 서버 실행
+    python -m benchmarks.mock_openai_server --port 8100 --latency lognormal:300,0.5
+    # 2) API 서버 실행 (OPENAI_API_KEY=mock, OPENAI_BASE_URL=http://localhost:8100/v1)
+    uvicorn app.main:app --port 8000
+    # 3) 부하 생성
+    python -m benchmarks.load_test --url http://localhost:8000 --rps 20 --duration 30
+
+    # API 서버 없이 같은 프로세스에서 앱 직접 호출
+    python -m benchmarks.load_test --in-process --rps 20 --duration 10
+"""
+import sys
+import os
+import json
+import time
+import asyncio
+import argparse
+from collections import Counter
+from typing import List, Dict, Any, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+
+from benchmarks.run_benchmark import _percentile
+from benchmarks.synthetic_corpus import generate_queries
+
+
+async def run_load(
+    client: httpx.AsyncClient,
+    queries: List[Dict[str, Any]],
+    rps: float,
+    duration_s: float,
+    timeout_s: float,
+) -> Dict[str, Any]:
+    """목표 RPS로 duration 동안 요청 발생 (응답 대기와 무관하게 일정 간격 발사)"""
+    latencies: List[float] = []
+    statuses: Counter = Counter()
+    fallback_answers = 0
+    tasks = []
+
+    async def _one(payload: Dict[str, Any]):
+        nonlocal fallback_answers
+        start = time.perf_counter()
+        try:
+            response = await client.post("/api/rag/query", json=payload, timeout=timeout_s)
+            statuses[str(response.status_code)] += 1
+            # LLM 실패/회로 차단 시 추출형 답변은 degraded=True로 표시됨
+            if response.status_code == 200 and response.json().get("degraded"):
+                fallback_answers += 1
+        except httpx.TimeoutException:
+            statuses["timeout"] += 1
+        except httpx.HTTPError as e:
+            statuses[type(e).__name__] += 1
+        latencies.append(time.perf_counter() - start)
+
+    interval = 1.0 / rps
+    total = int(rps * duration_s)
+    wall_start = time.perf_counter()
+    for i in range(total):
+        # 누적 오차 없이 예정 시각에 발사
+        delay = wall_start + i * interval - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        q = queries[i % len(queries)]
+        payload = {k: v for k, v in q.items() if v is not None}
+        tasks.append(asyncio.create_task(_one(payload)))
+    await asyncio.gather(*tasks)
+    wall_s = time.perf_counter() - wall_start
+
+    ordered = sorted(latencies)
+    return {
+        "target_rps": rps,
+        "achieved_rps": len(ordered) / wall_s if wall_s > 0 else 0.0,
+        "requests": len(ordered),
+        "p50_ms": _percentile(ordered, 50) * 1000,
+        "p95_ms": _percentile(ordered, 95) * 1000,
+        "p99_ms": _percentile(ordered, 99) * 1000,
+        "max_ms": (ordered[-1] if ordered else 0.0) * 1000,
+        "statuses": dict(statuses),
+        "fallback_answers": fallback_answers,
+    }
+
+
+async def _main_async(args) -> Dict[str, Any]:
+    queries = generate_queries(max(args.queries, 1), seed=args.seed)
+    limits = httpx.Limits(max_connections=args.max_connections)
+    if args.in_process:
+        from app.main import app
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://loadtest", limits=limits) as client:
+            return await run_load(client, queries, args.rps, args.duration, args.timeout)
+    async with httpx.AsyncClient(base_url=args.url, limits=limits) as client:
+        return await run_load(client, queries, args.rps, args.duration, args.timeout)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="/api/rag/query 부하 생성")
+    parser.add_argument("--url", default="http://localhost:8000", help="API 서버 주소")
+    parser.add_argument("--in-process", action="store_true", help="app.main:app을 같은 프로세스에서 직접 호출")
+    parser.add_argument("--rps", type=float, default=10.0, help="목표 초당 요청 수")
+    parser.add_argument("--duration", type=float, default=30.0, help="부하 지속 시간 (초)")
+    parser.add_argument("--timeout", type=float, default=60.0, help="요청 타임아웃 (초)")
+    parser.add_argument("--queries", type=int, default=200, help="순환할 쿼리 수")
+    parser.add_argument("--max-connections", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", type=str, default=None, help="결과 JSON 저장 경로")
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(_main_async(args))
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,228 @@
+"""
+OpenAI 호환 로컬 모의 서버 (LLM + 임베딩)
+
+실제 OpenAI 키 없이 /api/rag/query 부하 테스트와 지연시간 재현을 위해 사용합니다.
+- POST /v1/chat/completions (stream 지원)
+- POST /v1/embeddings
+- 지연시간 분포, 토큰 생성 속도, 429/타임아웃 오류 주입 설정 가능
+- 같은 seed와 입력이면 같은 응답 (결정적)
+
+사용 예시 (backend 폴더에서):
+    python -m benchmarks.mock_openai_server --port 8100 --latency lognormal:300,0.5 \\
+        --tokens-per-sec 80 --error-rate 0.02 --timeout-rate 0.01
+
+    # .env
+    OPENAI_API_KEY=mock
+    OPENAI_BASE_URL=http://localhost:8100/v1
+"""
+import sys
+import os
+import json
+import time
+import uuid
+import random
+import asyncio
+import hashlib
+import argparse
+from dataclasses import dataclass
+from typing import List, Dict, Any, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from benchmarks.run_benchmark import stub_embedding
+
+
+@dataclass
+class MockConfig:
+    """모의 서버 동작 설정"""
+    latency: str = "fixed:0"          # fixed:MS | uniform:MIN,MAX | lognormal:MEDIAN_MS,SIGMA
+    tokens_per_sec: float = 0.0       # 0이면 생성 시간 없음
+    error_rate: float = 0.0           # 429 응답 비율
+    timeout_rate: float = 0.0         # 응답하지 않고 대기하는 비율
+    timeout_hang_s: float = 60.0      # 타임아웃 주입 시 대기 시간
+    retry_after_s: float = 1.0        # 429 응답의 Retry-After 헤더
+    embedding_dim: int = 1536
+    seed: int = 0
+
+
+def sample_latency_s(spec: str, rng: random.Random) -> float:
+    """지연시간 분포 문자열에서 표본 추출 (초 단위)"""
+    kind, _, params = spec.partition(":")
+    values = [float(v) for v in params.split(",") if v.strip()] if params else []
+    if kind == "fixed":
+        return (values[0] if values else 0.0) / 1000.0
+    if kind == "uniform":
+        low, high = values
+        return rng.uniform(low, high) / 1000.0
+    if kind == "lognormal":
+        import math
+        median_ms, sigma = values
+        return rng.lognormvariate(math.log(median_ms), sigma) / 1000.0
+    raise ValueError(f"알 수 없는 지연시간 분포: {spec}")
+
+
+def _count_tokens(text: str) -> int:
+    """대략적인 토큰 수 (한글 2자 ≈ 1토큰, 공백 단위 보정)"""
+    return max(1, len(text) // 2)
+
+
+def _fake_answer(messages: List[Dict[str, Any]], max_tokens: int) -> str:
+    """프롬프트 해시 기반 결정적 마크다운 답변"""
+    user_text = next((m.get("content", "") for m in reversed(messages) if m.get("role") == "user"), "")
+    digest = hashlib.sha256(user_text.encode("utf-8")).hexdigest()
+    query = user_text.rsplit("사용자 질문:", 1)[-1].strip().split("\n", 1)[0][:80]
+    lines = [
+        f"## {query or '질문'}에 대한 답변",
+        "",
+        "### 1. 검토 결과",
+        f"- 모의 응답입니다 (해시 {digest[:12]}). [근거: 건축법 제{int(digest[:4], 16) % 100 + 1}조]",
+        "- 실제 법령 검토 결과가 아닙니다.",
+        "",
+        "더 자세한 내용이 필요하신가요?",
+    ]
+    answer = "\n".join(lines)
+    # max_tokens 근사 적용
+    return answer[: max(1, max_tokens) * 2]
+
+
+def create_app(config: Optional[MockConfig] = None) -> FastAPI:
+    """모의 서버 FastAPI 앱 생성"""
+    config = config or MockConfig()
+    rng = random.Random(config.seed)
+    app = FastAPI(title="Mock OpenAI API")
+    app.state.config = config
+    app.state.stats = {"requests": 0, "errors_429": 0, "timeouts": 0}
+
+    async def _inject_faults() -> Optional[JSONResponse]:
+        """지연 적용 및 오류 주입 (응답이 필요하면 반환)"""
+        app.state.stats["requests"] += 1
+        roll = rng.random()
+        if roll < config.error_rate:
+            app.state.stats["errors_429"] += 1
+            return JSONResponse(
+                status_code=429,
+                headers={"Retry-After": f"{config.retry_after_s:g}"},
+                content={"error": {"message": "Rate limit reached (mock)", "type": "rate_limit_error", "code": "rate_limit_exceeded"}},
+            )
+        if roll < config.error_rate + config.timeout_rate:
+            app.state.stats["timeouts"] += 1
+            await asyncio.sleep(config.timeout_hang_s)
+        await asyncio.sleep(sample_latency_s(config.latency, rng))
+        return None
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        fault = await _inject_faults()
+        if fault is not None:
+            return fault
+
+        messages = body.get("messages", [])
+        model = body.get("model", "mock-gpt")
+        answer = _fake_answer(messages, body.get("max_tokens") or 1000)
+        prompt_tokens = sum(_count_tokens(m.get("content", "")) for m in messages)
+        completion_tokens = _count_tokens(answer)
+        completion_id = f"chatcmpl-mock-{uuid.uuid4().hex[:12]}"
+        created = int(time.time())
+
+        if body.get("stream"):
+            async def _stream():
+                step = 8  # 청크당 문자 수
+                delay = (step / 2) / config.tokens_per_sec if config.tokens_per_sec > 0 else 0.0
+                for i in range(0, len(answer), step):
+                    chunk = {
+                        "id": completion_id, "object": "chat.completion.chunk", "created": created, "model": model,
+                        "choices": [{"index": 0, "delta": {"content": answer[i:i + step]}, "finish_reason": None}],
+                    }
+                    yield f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n"
+                    if delay:
+                        await asyncio.sleep(delay)
+                done = {
+                    "id": completion_id, "object": "chat.completion.chunk", "created": created, "model": model,
+                    "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+                }
+                yield f"data: {json.dumps(done)}\n\n"
+                yield "data: [DONE]\n\n"
+            return StreamingResponse(_stream(), media_type="text/event-stream")
+
+        if config.tokens_per_sec > 0:
+            await asyncio.sleep(completion_tokens / config.tokens_per_sec)
+
+        return {
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": created,
+            "model": model,
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": answer}, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens, "total_tokens": prompt_tokens + completion_tokens},
+        }
+
+    @app.post("/v1/embeddings")
+    async def embeddings(request: Request):
+        body = await request.json()
+        fault = await _inject_faults()
+        if fault is not None:
+            return fault
+
+        inputs = body.get("input", [])
+        if isinstance(inputs, str):
+            inputs = [inputs]
+        data = [
+            {"object": "embedding", "index": i, "embedding": stub_embedding(text, dim=config.embedding_dim)}
+            for i, text in enumerate(inputs)
+        ]
+        tokens = sum(_count_tokens(t) for t in inputs)
+        return {
+            "object": "list",
+            "data": data,
+            "model": body.get("model", "mock-embedding"),
+            "usage": {"prompt_tokens": tokens, "total_tokens": tokens},
+        }
+
+    @app.get("/v1/models")
+    async def models():
+        return {"object": "list", "data": [{"id": "mock-gpt", "object": "model", "owned_by": "mock"}]}
+
+    @app.get("/stats")
+    async def stats():
+        return app.state.stats
+
+    return app
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="OpenAI 호환 모의 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--latency", default="fixed:0", help="fixed:MS | uniform:MIN,MAX | lognormal:MEDIAN_MS,SIGMA")
+    parser.add_argument("--tokens-per-sec", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="429 응답 비율 (0~1)")
+    parser.add_argument("--timeout-rate", type=float, default=0.0, help="타임아웃(무응답) 비율 (0~1)")
+    parser.add_argument("--timeout-hang", type=float, default=60.0, help="타임아웃 주입 시 대기 시간 (초)")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="429 응답의 Retry-After (초)")
+    parser.add_argument("--embedding-dim", type=int, default=1536)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    config = MockConfig(
+        latency=args.latency,
+        tokens_per_sec=args.tokens_per_sec,
+        error_rate=args.error_rate,
+        timeout_rate=args.timeout_rate,
+        timeout_hang_s=args.timeout_hang,
+        retry_after_s=args.retry_after,
+        embedding_dim=args.embedding_dim,
+        seed=args.seed,
+    )
+    # 분포 문자열 검증
+    sample_latency_s(config.latency, random.Random(0))
+
+    import uvicorn
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,333 @@
+"""
+재현 가능한 검색 벤치마크
+
+합성 코퍼스를 생성한 뒤 JSONIndex.search / Retriever.retrieve / RAGService.query(스텁 LLM)에
+쿼리 세트를 재생하고 p50/p95/p99 지연시간, 처리량, 최대 RSS, 인덱스 빌드 시간을 측정합니다.
+저장된 기준값(baseline)과 비교하여 성능 회귀를 보고합니다.
+
+사용 예시 (backend 폴더에서):
+    python -m benchmarks.run_benchmark --sizes 1000 10000 --queries 300
+    python -m benchmarks.run_benchmark --sizes 1000 --update-baseline
+"""
+import sys
+import os
+import json
+import time
+import asyncio
+import hashlib
+import logging
+import resource
+import tempfile
+import argparse
+import multiprocessing
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic_corpus import generate_corpus, generate_queries
+
+DEFAULT_BASELINE = Path(__file__).parent / "baseline.json"
+
+# 값이 클수록 나쁜 지표 / 값이 클수록 좋은 지표
+LOWER_IS_BETTER = ("p50_ms", "p95_ms", "p99_ms", "build_s", "peak_rss_mb")
+HIGHER_IS_BETTER = ("qps",)
+
+EMBEDDING_DIM = 256
+
+
+class StubLLMClient:
+    """LLMClient.generate_answer와 같은 시그니처를 가진 스텁 (네트워크 호출 없음)"""
+
+    def __init__(self, latency_ms: float = 0.0):
+        self.latency_s = latency_ms / 1000.0
+
+    async def generate_answer(self, query: str, context: str = None, chunks=None, scenario: str = None, region: str = None, **kwargs) -> str:
+        if self.latency_s > 0:
+            await asyncio.sleep(self.latency_s)
+        first_line = (context or "").split("\n", 1)[0]
+        return f"## 스텁 답변\n- {first_line[:200]}"
+
+
+def stub_embedding(text: str, dim: int = EMBEDDING_DIM) -> List[float]:
+    """문자 bigram 해싱 기반 결정적 임베딩 (OpenAI 임베딩 대체)"""
+    import numpy as np
+    vec = np.zeros(dim, dtype=np.float32)
+    for i in range(len(text) - 1):
+        h = int.from_bytes(hashlib.blake2b(text[i:i + 2].encode("utf-8"), digest_size=4).digest(), "little")
+        vec[h % dim] += 1.0 if h & 1 else -1.0
+    norm = np.linalg.norm(vec)
+    if norm > 0:
+        vec /= norm
+    return vec.tolist()
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    """정렬된 값에서 백분위수 계산 (선형 보간)"""
+    if not sorted_values:
+        return 0.0
+    k = (len(sorted_values) - 1) * pct / 100.0
+    lo = int(k)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+
+def _summarize(latencies_s: List[float], wall_s: float) -> Dict[str, float]:
+    """지연시간 목록을 p50/p95/p99(ms)와 처리량으로 요약"""
+    ordered = sorted(latencies_s)
+    return {
+        "p50_ms": _percentile(ordered, 50) * 1000,
+        "p95_ms": _percentile(ordered, 95) * 1000,
+        "p99_ms": _percentile(ordered, 99) * 1000,
+        "qps": len(ordered) / wall_s if wall_s > 0 else 0.0,
+    }
+
+
+def _peak_rss_mb() -> float:
+    """현재 프로세스의 최대 RSS (MB, Linux 기준 ru_maxrss는 KB)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        return peak / (1024 * 1024)
+    return peak / 1024
+
+
+def _iter_corpus_files(corpus_dir: Path):
+    """(JSON 파일 경로, 인덱스 폴더명) 순회 - RAGService와 같은 폴더 규칙
+
+    region 폴더 파일은 서버처럼 "region" 폴더와 레지스트리 지역명 폴더에 모두 색인합니다.
+    """
+    from rag.retrieval.region_registry import REGISTRY_FILENAME, load_region_registry
+
+    registry = load_region_registry(corpus_dir)
+    for folder_path in sorted(corpus_dir.iterdir()):
+        if not folder_path.is_dir():
+            continue
+        for json_file in sorted(folder_path.glob("*.json")):
+            if folder_path.name == "region" and json_file.name == REGISTRY_FILENAME:
+                continue
+            yield json_file, folder_path.name
+            if folder_path.name == "region":
+                yield json_file, registry.resolve(json_file.name, json_file)
+
+
+def bench_json_index(corpus_dir: Path, queries: List[Dict[str, Any]], top_k: int) -> Dict[str, Any]:
+    """JSONIndex 빌드 시간과 search 지연시간 측정"""
+    from rag.retrieval.json_index import JSONIndex
+
+    build_start = time.perf_counter()
+    index = JSONIndex()
+    for json_file, folder in _iter_corpus_files(corpus_dir):
+        index.load_json_file(json_file, folder)
+    build_s = time.perf_counter() - build_start
+
+    latencies = []
+    wall_start = time.perf_counter()
+    for q in queries:
+        start = time.perf_counter()
+        index.search(query=q["query"], folder_filter=q["folder"], region_filter=q["region"], top_k=top_k)
+        latencies.append(time.perf_counter() - start)
+    wall_s = time.perf_counter() - wall_start
+
+    result = _summarize(latencies, wall_s)
+    result["build_s"] = build_s
+    result["peak_rss_mb"] = _peak_rss_mb()
+    return result
+
+
+def bench_retriever(corpus_dir: Path, queries: List[Dict[str, Any]], top_k: int, max_items: int) -> Dict[str, Any]:
+    """스텁 임베딩으로 채운 Retriever의 retrieve 지연시간 측정"""
+    from rag.parsers.file_parser import FileParser
+    from rag.retrieval.retriever import Retriever
+
+    with tempfile.TemporaryDirectory() as store_dir:
+        build_start = time.perf_counter()
+        retriever = Retriever(vector_store_path=store_dir, top_k=top_k, similarity_threshold=0.0)
+        added = 0
+        for json_file, folder in _iter_corpus_files(corpus_dir):
+            if added >= max_items:
+                break
+            chunks = FileParser.parse_json_file(json_file.read_bytes(), json_file.name, folder)
+            for chunk in chunks[: max_items - added]:
+                # add_document는 매번 디스크에 저장하므로 메모리에 직접 적재
+                retriever.vectors.append(stub_embedding(chunk["content"]))
+                retriever.contents.append(chunk["content"])
+                retriever.metadatas.append(chunk["metadata"])
+                added += 1
+        build_s = time.perf_counter() - build_start
+
+        query_vectors = [stub_embedding(q["query"]) for q in queries]
+
+        async def _replay():
+            latencies = []
+            for q, vec in zip(queries, query_vectors):
+                start = time.perf_counter()
+                await retriever.retrieve(query_embedding=vec, top_k=top_k, folder_filter=q["folder"])
+                latencies.append(time.perf_counter() - start)
+            return latencies
+
+        wall_start = time.perf_counter()
+        latencies = asyncio.run(_replay())
+        wall_s = time.perf_counter() - wall_start
+
+    result = _summarize(latencies, wall_s)
+    result["build_s"] = build_s
+    result["peak_rss_mb"] = _peak_rss_mb()
+    result["vectors"] = added
+    return result
+
+
+def bench_rag_query(corpus_dir: Path, queries: List[Dict[str, Any]], top_k: int, llm_latency_ms: float) -> Dict[str, Any]:
+    """스텁 LLM을 주입한 RAGService.query 전체 경로 측정"""
+    from app.core.config import settings
+    from app.models.rag_models import QueryRequest
+    from app.services.rag_service import RAGService
+
+    settings.DOCUMENTS_DIR = str(corpus_dir)
+    build_start = time.perf_counter()
+    service = RAGService()
+    build_s = time.perf_counter() - build_start
+    service.llm_client = StubLLMClient(latency_ms=llm_latency_ms)
+
+    async def _replay():
+        latencies = []
+        for q in queries:
+            request = QueryRequest(query=q["query"], folder=q["folder"], region=q["region"], top_k=top_k)
+            start = time.perf_counter()
+            await service.query(request=request)
+            latencies.append(time.perf_counter() - start)
+        return latencies
+
+    wall_start = time.perf_counter()
+    latencies = asyncio.run(_replay())
+    wall_s = time.perf_counter() - wall_start
+
+    result = _summarize(latencies, wall_s)
+    result["build_s"] = build_s
+    result["peak_rss_mb"] = _peak_rss_mb()
+    return result
+
+
+def run_size(size: int, options: Dict[str, Any]) -> Dict[str, Any]:
+    """한 코퍼스 크기에 대해 선택된 시나리오 실행 (별도 프로세스에서 호출)"""
+    logging.basicConfig(level=logging.WARNING)
+    logging.getLogger().setLevel(logging.WARNING)
+
+    queries = generate_queries(options["queries"], seed=options["seed"] + 1)
+    results: Dict[str, Any] = {}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if options.get("corpus_dir"):
+            corpus_dir = Path(options["corpus_dir"]) / f"items_{size}"
+            if not corpus_dir.exists():
+                generate_corpus(corpus_dir, size, seed=options["seed"])
+        else:
+            corpus_dir = Path(tmp) / "documents"
+            generate_corpus(corpus_dir, size, seed=options["seed"])
+
+        scenario = options["scenario"]
+        if scenario == "json_index":
+            results = bench_json_index(corpus_dir, queries, options["top_k"])
+        elif scenario == "retriever":
+            results = bench_retriever(corpus_dir, queries, options["top_k"], options["retriever_max_items"])
+        elif scenario == "rag_query":
+            results = bench_rag_query(corpus_dir, queries, options["top_k"], options["llm_latency_ms"])
+        else:
+            raise ValueError(f"알 수 없는 시나리오: {scenario}")
+
+    return results
+
+
+def compare_with_baseline(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """기준값 대비 허용 오차를 넘는 회귀 목록 반환"""
+    regressions = []
+    for key, metrics in current.items():
+        base = baseline.get(key)
+        if not base:
+            continue
+        for metric in LOWER_IS_BETTER:
+            if metric in metrics and base.get(metric):
+                if metrics[metric] > base[metric] * (1 + tolerance):
+                    regressions.append(f"{key} {metric}: {base[metric]:.2f} -> {metrics[metric]:.2f}")
+        for metric in HIGHER_IS_BETTER:
+            if metric in metrics and base.get(metric):
+                if metrics[metric] < base[metric] * (1 - tolerance):
+                    regressions.append(f"{key} {metric}: {base[metric]:.2f} -> {metrics[metric]:.2f}")
+    return regressions
+
+
+def _print_table(results: Dict[str, Any]):
+    header = f"{'시나리오/크기':<24}{'p50(ms)':>10}{'p95(ms)':>10}{'p99(ms)':>10}{'qps':>10}{'build(s)':>10}{'RSS(MB)':>10}"
+    print(header)
+    print("-" * len(header))
+    for key, m in results.items():
+        print(
+            f"{key:<24}{m['p50_ms']:>10.2f}{m['p95_ms']:>10.2f}{m['p99_ms']:>10.2f}"
+            f"{m['qps']:>10.1f}{m['build_s']:>10.2f}{m['peak_rss_mb']:>10.1f}"
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="JSONIndex / Retriever / RAGService 벤치마크")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000], help="코퍼스 항목 수 (1k ~ 1M)")
+    parser.add_argument("--scenarios", nargs="+", default=["json_index", "retriever", "rag_query"],
+                        choices=["json_index", "retriever", "rag_query"])
+    parser.add_argument("--queries", type=int, default=300, help="재생할 쿼리 수")
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--corpus-dir", type=str, default=None, help="생성한 코퍼스를 재사용할 폴더")
+    parser.add_argument("--retriever-max-items", type=int, default=50000, help="Retriever에 적재할 최대 벡터 수")
+    parser.add_argument("--llm-latency-ms", type=float, default=0.0, help="스텁 LLM 응답 지연 (ms)")
+    parser.add_argument("--output", type=str, default=None, help="결과 JSON 저장 경로")
+    parser.add_argument("--baseline", type=str, default=str(DEFAULT_BASELINE))
+    parser.add_argument("--update-baseline", action="store_true", help="이번 결과를 기준값으로 저장")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="회귀로 판단할 허용 오차 비율")
+    args = parser.parse_args(argv)
+
+    options = {
+        "queries": args.queries,
+        "top_k": args.top_k,
+        "seed": args.seed,
+        "corpus_dir": args.corpus_dir,
+        "retriever_max_items": args.retriever_max_items,
+        "llm_latency_ms": args.llm_latency_ms,
+    }
+
+    results: Dict[str, Any] = {}
+    # 최대 RSS를 시나리오/크기별로 분리하기 위해 매번 새 프로세스에서 실행
+    mp_context = multiprocessing.get_context("spawn")
+    for size in args.sizes:
+        for scenario in args.scenarios:
+            with ProcessPoolExecutor(max_workers=1, mp_context=mp_context) as pool:
+                results[f"{scenario}/{size}"] = pool.submit(run_size, size, {**options, "scenario": scenario}).result()
+
+    _print_table(results)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+    baseline_path = Path(args.baseline)
+    if args.update_baseline:
+        with open(baseline_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"\n기준값 저장: {baseline_path}")
+        return 0
+
+    if baseline_path.exists():
+        with open(baseline_path, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare_with_baseline(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\n⚠️ 성능 회귀 감지 (허용 오차 {args.tolerance:.0%}):")
+            for line in regressions:
+                print(f"   - {line}")
+            return 1
+        print(f"\n✅ 기준값 대비 회귀 없음 ({baseline_path.name})")
+    else:
+        print(f"\nℹ️  기준값 파일이 없습니다: {baseline_path} (--update-baseline으로 생성)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,204 @@
+"""
+벤치마크용 합성 건축 법령 코퍼스 생성기
+
+documents/ 폴더와 동일한 구조로 Construction_law_qa.json / 지역 조례 JSON 파일을 생성합니다.
+같은 seed로 생성하면 항상 같은 코퍼스와 쿼리 세트가 만들어집니다.
+"""
+import json
+import random
+from pathlib import Path
+from typing import List, Dict, Any, Iterator, Optional
+
+# 건축 양식 폴더 (documents/{건축양식}/Construction_law_qa.json)
+BUILDING_TYPES = [
+    "다중주택", "단독주택", "다가구주택", "공동주택", "판매시설",
+    "숙박시설", "제1종근린생활시설", "제2종근린생활시설", "업무시설", "창고시설",
+]
+
+# 지역 조례 파일 (파일명 -> 지역명)
+REGIONS = {
+    "Jeonju_Construction_Ordinance.json": "전주시",
+    "Seoul_Construction_Ordinance.json": "서울시",
+    "Busan_Construction_Ordinance.json": "부산시",
+    "Daegu_Construction_Ordinance.json": "대구시",
+}
+
+TOPICS = [
+    "건축허가", "착공신고", "사용승인", "용적률", "건폐율", "연면적", "대지면적",
+    "주차장", "스프링클러", "피난계단", "직통계단", "방화구획", "일조권", "높이제한",
+    "조경", "도로", "접도", "대지안의공지", "건축선", "내화구조", "소방시설",
+    "에너지절약계획서", "구조안전", "내진설계", "장애인편의시설", "정화조", "옥상광장",
+]
+
+CATEGORIES = ["허가절차", "건축기준", "소방", "주차", "구조", "환경", "설비", "도시계획"]
+
+LAWS = ["건축법", "건축법 시행령", "건축법 시행규칙", "주차장법", "소방시설법", "국토계획법"]
+
+QUESTION_TEMPLATES = [
+    "{building}의 {topic} 기준은 무엇인가요?",
+    "{building}을 신축할 때 {topic} 관련 규정을 알려주세요",
+    "{topic} 요건을 충족하려면 어떤 서류가 필요한가요?",
+    "{building} {topic} 적용 대상과 예외는?",
+    "{topic}와 {topic2}의 관계는 어떻게 되나요?",
+]
+
+ANSWER_TEMPLATES = [
+    "{building}의 경우 {topic}은 {law} 제{article}조에 따라 {value}% 이하로 적용됩니다.",
+    "{topic} 관련하여 {law} 제{article}조 제{paragraph}항을 확인해야 하며, {topic2} 기준도 함께 검토합니다.",
+    "{law}에 따르면 {building}은 {topic} 요건을 충족해야 하고, 연면적 {area}제곱미터 이상이면 {topic2} 설치 대상입니다.",
+]
+
+
+def _qa_item(rng: random.Random, folder: str, idx: int) -> Dict[str, Any]:
+    """Q&A 형식 항목 생성 (Construction_law_qa.json)"""
+    topic, topic2 = rng.sample(TOPICS, 2)
+    law = rng.choice(LAWS)
+    article = rng.randint(1, 120)
+    fields = {
+        "building": folder,
+        "topic": topic,
+        "topic2": topic2,
+        "law": law,
+        "article": article,
+        "paragraph": rng.randint(1, 5),
+        "value": rng.choice([20, 40, 60, 80, 150, 200]),
+        "area": rng.choice([200, 500, 1000, 3000, 5000]),
+    }
+    answer = " ".join(rng.choice(ANSWER_TEMPLATES).format(**fields) for _ in range(rng.randint(2, 5)))
+    return {
+        "id": f"{folder}-qa-{idx}",
+        "question": rng.choice(QUESTION_TEMPLATES).format(**fields),
+        "answer": answer,
+        "category": rng.choice(CATEGORIES),
+        "keywords": [topic, topic2, folder] + rng.sample(TOPICS, 2),
+        "legal_basis": [f"{law} 제{article}조"],
+        "reference_document": f"{law} 해설서",
+        "application_scope": folder,
+    }
+
+
+def _ordinance_item(rng: random.Random, region: str, idx: int) -> Dict[str, Any]:
+    """조례 형식 항목 생성 (Jeonju_Construction_Ordinance.json)"""
+    topic, topic2 = rng.sample(TOPICS, 2)
+    article = rng.randint(1, 60)
+    fields = {
+        "building": rng.choice(BUILDING_TYPES),
+        "topic": topic,
+        "topic2": topic2,
+        "law": f"{region} 건축 조례",
+        "article": article,
+        "paragraph": rng.randint(1, 5),
+        "value": rng.choice([50, 60, 70, 200, 250]),
+        "area": rng.choice([100, 300, 660, 1000]),
+    }
+    return {
+        "id": f"{region}-ord-{idx}",
+        "title": f"제{article}조({topic})",
+        "question": rng.choice(QUESTION_TEMPLATES).format(**fields),
+        "answer": rng.choice(ANSWER_TEMPLATES).format(**fields),
+        "category": rng.choice(CATEGORIES),
+        "source_file": f"{region}_건축조례.pdf",
+        "keywords": [topic, topic2, region],
+        "regulation_type": rng.choice(["허가기준", "건축기준", "위임사항"]),
+        "jurisdiction": region,
+        "reference_law": rng.choice(LAWS),
+    }
+
+
+def _write_json_array(path: Path, items: Iterator[Dict[str, Any]]) -> int:
+    """항목을 한 개씩 직렬화하여 JSON 배열로 기록 (대용량에서도 메모리 일정)"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    count = 0
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("[\n")
+        for item in items:
+            if count:
+                f.write(",\n")
+            f.write(json.dumps(item, ensure_ascii=False))
+            count += 1
+        f.write("\n]\n")
+    return count
+
+
+def generate_corpus(
+    output_dir: Path,
+    num_items: int,
+    seed: int = 42,
+    ordinance_ratio: float = 0.2,
+    building_types: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    """
+    documents/ 구조의 합성 코퍼스 생성
+
+    Args:
+        output_dir: 생성할 documents 루트 폴더
+        num_items: 전체 항목 수 (1k ~ 1M)
+        seed: 난수 시드
+        ordinance_ratio: 전체 항목 중 지역 조례 비율
+        building_types: 사용할 건축 양식 폴더 목록
+
+    Returns:
+        생성된 파일/항목 수 요약
+    """
+    output_dir = Path(output_dir)
+    building_types = building_types or BUILDING_TYPES
+    rng = random.Random(seed)
+
+    ordinance_total = int(num_items * ordinance_ratio)
+    qa_total = num_items - ordinance_total
+    manifest = {"seed": seed, "num_items": num_items, "files": {}}
+
+    for i, folder in enumerate(building_types):
+        count = qa_total // len(building_types) + (1 if i < qa_total % len(building_types) else 0)
+        path = output_dir / folder / "Construction_law_qa.json"
+        items = (_qa_item(rng, folder, idx) for idx in range(count))
+        manifest["files"][f"{folder}/{path.name}"] = _write_json_array(path, items)
+
+    region_files = list(REGIONS.items())
+    for i, (filename, region) in enumerate(region_files):
+        count = ordinance_total // len(region_files) + (1 if i < ordinance_total % len(region_files) else 0)
+        path = output_dir / "region" / filename
+        items = (_ordinance_item(rng, region, idx) for idx in range(count))
+        manifest["files"][f"region/{filename}"] = _write_json_array(path, items)
+
+    return manifest
+
+
+def generate_queries(num_queries: int, seed: int = 7) -> List[Dict[str, Any]]:
+    """
+    재생용 쿼리 세트 생성
+
+    정확한 질문 문장, 키워드 조합, 자연어 변형을 섞어 실제 사용 패턴을 흉내 냅니다.
+    """
+    rng = random.Random(seed)
+    queries = []
+    region_names = list(REGIONS.values())
+    for i in range(num_queries):
+        folder = rng.choice(BUILDING_TYPES)
+        topic, topic2 = rng.sample(TOPICS, 2)
+        kind = i % 3
+        if kind == 0:
+            text = rng.choice(QUESTION_TEMPLATES).format(building=folder, topic=topic, topic2=topic2)
+        elif kind == 1:
+            text = f"{topic} {topic2}"
+        else:
+            text = f"{folder} {topic} 기준 알려줘"
+        queries.append({
+            "query": text,
+            "folder": folder,
+            "region": rng.choice(region_names) if rng.random() < 0.5 else None,
+        })
+    return queries
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="합성 건축 법령 코퍼스 생성")
+    parser.add_argument("output_dir", type=Path)
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    summary = generate_corpus(args.output_dir, args.items, seed=args.seed)
+    print(json.dumps(summary, ensure_ascii=False, indent=2))
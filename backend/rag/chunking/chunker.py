@@ -1,4 +1,4 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterable, Iterator, Union
 import re
 
 class Chunker:
@@ -181,10 +181,20 @@ class Chunker:
         
         return overlap_chunks
     
-    def _chunk_by_row(self, text: str) -> List[str]:
-        """Row 단위로 청킹 (CSV/Excel 데이터용)"""
-        lines = text.split('\n')
-        chunks = []
+    def _chunk_by_row(self, text: Union[str, Iterable[str]]) -> List[str]:
+        """Row 단위로 청킹 (CSV/Excel 데이터용, 텍스트 또는 행 단위 줄 iterable)"""
+        lines = text.split('\n') if isinstance(text, str) else text
+        chunks = list(self.chunk_rows(lines))
+        if chunks:
+            return chunks
+        return [text] if isinstance(text, str) else []
+    
+    def chunk_rows(self, lines: Iterable[str]) -> Iterator[str]:
+        """
+        행 단위 줄을 받아 청크를 순차적으로 생성
+        
+        FileParser.iter_rows와 함께 사용하면 전체 텍스트를 만들지 않고 청킹할 수 있습니다.
+        """
         current_chunk = []
         current_length = 0
         
@@ -198,12 +208,12 @@ class Chunker:
             # 행 단위로 청크 생성
             if line.startswith('행 '):
                 if current_chunk:
-                    chunks.append('\n'.join(current_chunk))
+                    yield '\n'.join(current_chunk)
                 current_chunk = [line]
                 current_length = line_length
             else:
                 if current_length + line_length > self.chunk_size and current_chunk:
-                    chunks.append('\n'.join(current_chunk))
+                    yield '\n'.join(current_chunk)
                     current_chunk = [line]
                     current_length = line_length
                 else:
@@ -211,9 +221,7 @@ class Chunker:
                     current_length += line_length
         
         if current_chunk:
-            chunks.append('\n'.join(current_chunk))
-        
-        return chunks if chunks else [text]
+            yield '\n'.join(current_chunk)
     
     def update_config(self, chunk_size: int = None, chunk_overlap: int = None, chunk_by_row: bool = None):
         """청킹 설정 업데이트"""
@@ -1,4 +1,4 @@
 from .embedder import Embedder
+from .batcher import EmbeddingBatcher
 
-__all__ = ["Embedder"]
-
+__all__ = ["Embedder", "EmbeddingBatcher"]
@@ -0,0 +1,100 @@
+"""
+여러 호출자의 임베딩 요청을 모아 한 번의 API 호출로 처리하는 배처
+
+동시에 실행되는 작업들이 각자 embed()를 호출해도, max_wait_ms 동안 모인 텍스트를
+max_batch_size 단위로 묶어 Embedder.embed_batch 한 번으로 요청합니다.
+"""
+import asyncio
+import logging
+from typing import List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingBatcher:
+    """
+    호출자 간 임베딩 요청 병합기
+
+    Args:
+        embedder: embed_batch(texts)를 제공하는 임베더
+        max_batch_size: API 호출 한 번에 보낼 최대 텍스트 수
+        max_wait_ms: 배치를 채우기 위해 첫 요청 이후 기다리는 최대 시간 (밀리초)
+        max_concurrency: 동시에 진행할 API 호출 수
+    """
+
+    def __init__(self, embedder, max_batch_size: int = 64, max_wait_ms: float = 50.0, max_concurrency: int = 4):
+        self.embedder = embedder
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._pending: "asyncio.Queue[Tuple[str, asyncio.Future]]" = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+        self._inflight: set = set()
+        self.calls = 0
+        self.texts = 0
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._inflight:
+            await asyncio.gather(*self._inflight, return_exceptions=True)
+
+    async def embed(self, texts: List[str]) -> List[List[float]]:
+        """텍스트 리스트 임베딩 (다른 호출자의 텍스트와 함께 배치로 요청될 수 있음)"""
+        self.start()
+        loop = asyncio.get_running_loop()
+        futures = []
+        for text in texts:
+            future = loop.create_future()
+            self._pending.put_nowait((text, future))
+            futures.append(future)
+        return list(await asyncio.gather(*futures))
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._pending.get()]
+            deadline = loop.time() + self.max_wait_ms / 1000.0
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._pending.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            # 취소된 요청은 제외
+            batch = [(text, future) for text, future in batch if not future.done()]
+            if not batch:
+                continue
+            await self._semaphore.acquire()
+            task = asyncio.create_task(self._flush(batch))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+
+    async def _flush(self, batch: List[Tuple[str, asyncio.Future]]):
+        try:
+            vectors = await self.embedder.embed_batch([text for text, _ in batch])
+            if len(vectors) != len(batch):
+                raise ValueError(f"임베딩 개수 불일치: 요청 {len(batch)}개, 응답 {len(vectors)}개")
+            self.calls += 1
+            self.texts += len(batch)
+            for (_, future), vector in zip(batch, vectors):
+                if not future.done():
+                    future.set_result(vector)
+        except Exception as e:
+            logger.error(f"배치 임베딩 실패 ({len(batch)}개): {str(e)}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        finally:
+            self._semaphore.release()
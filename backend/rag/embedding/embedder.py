@@ -1,24 +1,38 @@
-from typing import List
+from typing import List, Optional
 import numpy as np
 from openai import AsyncOpenAI
-from openai import APIError, RateLimitError, APIConnectionError
+from openai import APIError, RateLimitError, APIConnectionError, APITimeoutError, InternalServerError
 from rag.utils.retry import retry_with_backoff
+from rag.utils.rate_limit import OpenAIRateLimiter, estimate_tokens
 
 class Embedder:
-    def __init__(self, api_key: str, model: str = "text-embedding-3-small"):
+    # 재시도 대상 오류 (속도 제한, 연결 실패, 서버 오류)
+    RETRYABLE_ERRORS = (RateLimitError, APIConnectionError, APITimeoutError, InternalServerError)
+    
+    def __init__(
+        self,
+        api_key: str,
+        model: str = "text-embedding-3-small",
+        base_url: Optional[str] = None,
+        rate_limiter: Optional[OpenAIRateLimiter] = None
+    ):
         if not api_key or api_key == "":
             raise ValueError("OpenAI API 키가 설정되지 않았습니다.")
-        self.client = AsyncOpenAI(api_key=api_key)
+        self.rate_limiter = rate_limiter
+        # base_url을 지정하면 OpenAI 호환 서버(예: 로컬 모의 서버)로 요청
+        # rate_limiter가 있으면 재시도는 rate_limiter가 담당 (SDK 자체 재시도 비활성화)
+        client_kwargs = {"max_retries": 0} if rate_limiter else {}
+        self.client = AsyncOpenAI(api_key=api_key, base_url=base_url or None, **client_kwargs)
         self.model = model
     
     async def _call_openai_embedding(self, input_data):
-        """OpenAI Embedding API 호출 (타임아웃 설정, 재시도 없음 - 빠른 실패)"""
+        """OpenAI Embedding API 호출 (타임아웃 설정, rate_limiter가 있으면 속도 제한 + 재시도)"""
         import asyncio
         import logging
         logger = logging.getLogger(__name__)
         
-        try:
-            # 타임아웃 설정: 10초 (재시도 없이 빠르게)
+        async def _request():
+            # 타임아웃 설정: 10초
             return await asyncio.wait_for(
                 self.client.embeddings.create(
                     model=self.model,
@@ -27,6 +41,16 @@ class Embedder:
                 ),
                 timeout=12.0  # 전체 타임아웃
             )
+        
+        try:
+            if self.rate_limiter is None:
+                return await _request()
+            texts = [input_data] if isinstance(input_data, str) else input_data
+            return await self.rate_limiter.call(
+                _request,
+                estimated_tokens=sum(estimate_tokens(t) for t in texts),
+                retry_on=self.RETRYABLE_ERRORS
+            )
         except asyncio.TimeoutError:
             logger.error("OpenAI Embedding API 호출 타임아웃 (10초 초과)")
             raise TimeoutError("임베딩 생성이 10초를 초과했습니다.")
@@ -0,0 +1,411 @@
+"""
+documents 폴더 일괄 인덱싱 (벌크 수집) CLI
+
+파일 탐색 → 프로세스 풀 병렬 파싱/청킹 → (선택) 동시성 제한 임베딩 → JSONL 세그먼트 기록
+순서로 처리하고, 단계별 처리량을 보고합니다.
+
+지원 형식:
+    - JSON (Q&A / 조례)            : FileParser.build_json_chunks
+    - 법령 테이블 HTML (.html/.htm) : FileParser.parse_law_table_file (시나리오 = 폴더명)
+    - Excel / CSV (.xlsx/.csv)     : FileParser.iter_rows + Chunker.chunk_rows (스트리밍)
+    - Word (.docx)                 : FileParser._parse_docx + Chunker.chunk_text
+
+출력 (--output 폴더):
+    segments/seg-00000.jsonl ...  레코드 한 줄당 {"id", "content", "metadata", "embedding"?}
+    manifest.json                 파일별 결과, 세그먼트 목록, 단계별 처리량
+
+대상 파일은 서버(RAGService._load_json_index)와 같은 규칙으로 고릅니다. 세그먼트는 청크/임베딩 빌드
+결과물로, 아직 JSONIndex/Retriever가 직접 읽어 서비스하지는 않습니다 (서버는 시작 시 documents 폴더의
+JSON을 다시 인덱싱). 외부 벡터 저장소 적재나 검증에는 iter_segment_records를 사용합니다.
+
+사용 예시 (backend 폴더에서):
+    python -m rag.ingest --documents-dir documents --output index_build
+    python -m rag.ingest --documents-dir documents --output index_build --embed --embed-concurrency 8
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+import hashlib
+import logging
+import argparse
+from datetime import datetime
+from pathlib import Path
+from dataclasses import dataclass, field, asdict
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Optional, Iterator
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_EXTENSIONS = {
+    ".json": "json",
+    ".html": "law_table",
+    ".htm": "law_table",
+    ".xlsx": "table",
+    ".csv": "table",
+    ".docx": "docx",
+}
+
+MANIFEST_NAME = "manifest.json"
+SEGMENT_DIR = "segments"
+
+
+@dataclass
+class IngestTask:
+    """파싱 단위 (파일 하나)"""
+    path: str
+    folder: str
+    kind: str
+    size: int = 0
+    filename: Optional[str] = None  # 원본 파일명 (경로의 파일명과 다를 때, 예: 업로드 임시 파일)
+
+
+@dataclass
+class StageStats:
+    """단계별 처리량 집계"""
+    name: str
+    items: int = 0
+    bytes: int = 0
+    seconds: float = 0.0
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["items_per_sec"] = self.items / self.seconds if self.seconds > 0 else 0.0
+        data["mb_per_sec"] = self.bytes / 1024 / 1024 / self.seconds if self.seconds > 0 else 0.0
+        return data
+
+
+def discover_files(documents_dir: Path, synonyms_path: Optional[Path] = None) -> List[IngestTask]:
+    """
+    documents 폴더에서 인덱싱 대상 파일 탐색 (RAGService._load_json_index와 같은 범위)
+
+    - 루트 파일 (동의어 사전 제외, 폴더 "")
+    - 각 하위 폴더의 최상위 파일 (더 깊은 폴더는 서버도 읽지 않으므로 제외, 폴더명)
+    - region 폴더 파일은 "region"과 지역 레지스트리의 지역명으로 한 번씩 (레지스트리 파일 제외)
+    """
+    from rag.retrieval.region_registry import REGISTRY_FILENAME, load_region_registry
+
+    tasks = []
+    synonyms_path = (synonyms_path or documents_dir / "synonyms.json").resolve()
+
+    def _add(path: Path, folder: str):
+        kind = SUPPORTED_EXTENSIONS.get(path.suffix.lower())
+        if not kind or path.name.startswith('~$') or path.name.endswith('.meta.json'):
+            return
+        tasks.append(IngestTask(path=str(path), folder=folder, kind=kind, size=path.stat().st_size))
+
+    for path in sorted(documents_dir.iterdir()):
+        if path.is_file():
+            if path.resolve() != synonyms_path:
+                _add(path, "")
+        elif path.is_dir():
+            for child in sorted(path.iterdir()):
+                if child.is_file() and not (path.name == "region" and child.name == REGISTRY_FILENAME):
+                    _add(child, path.name)
+
+    region_dir = documents_dir / "region"
+    if region_dir.is_dir():
+        registry = load_region_registry(documents_dir)
+        for region_file in sorted(region_dir.iterdir()):
+            if region_file.is_file() and region_file.name != REGISTRY_FILENAME:
+                _add(region_file, registry.resolve(region_file.name, region_file))
+    return tasks
+
+
+def _source_id(folder: str, filename: str) -> str:
+    """DocumentService와 같은 규칙의 문서 ID (md5(folder|filename))"""
+    return hashlib.md5(f"{folder}|{filename}".encode('utf-8')).hexdigest()
+
+
+def parse_task(task: IngestTask, chunk_size: int = 1000, chunk_overlap: int = 200) -> Dict[str, Any]:
+    """
+    파일 하나를 파싱/청킹하여 레코드 리스트 반환 (프로세스 풀 작업자)
+
+    Returns:
+        {"path", "records", "seconds", "error"}
+    """
+    from rag.chunking.chunker import Chunker
+    from rag.parsers.file_parser import FileParser
+
+    start = time.perf_counter()
+    path = Path(task.path)
+    filename = task.filename or path.name
+    base_metadata = {"folder": task.folder, "filename": filename, "source": _source_id(task.folder, filename)}
+    records: List[Dict[str, Any]] = []
+
+    try:
+        if task.kind == "json":
+            # parse_json_file은 형식 오류를 빈 결과로 돌려주므로 직접 디코딩하여 오류를 보고
+            data = json.loads(path.read_bytes().decode('utf-8-sig'))
+            for chunk in FileParser.build_json_chunks(data, filename, task.folder):
+                records.append({"content": chunk["content"], "metadata": {**chunk["metadata"], **base_metadata}})
+        elif task.kind == "law_table":
+            from rag.parsers.law_table_parser import LawTableParser
+            for chunk in FileParser.parse_law_table_file(path.read_bytes(), filename, task.folder):
+                records.append({"content": LawTableParser.create_embedding_text(chunk), "metadata": {**chunk, **base_metadata}})
+        elif task.kind == "table":
+            chunker = Chunker(chunk_size=chunk_size, chunk_overlap=chunk_overlap, chunk_by_row=True)
+            for text in chunker.chunk_rows(FileParser.iter_rows(filename, path)):
+                records.append({"content": text, "metadata": {**base_metadata, "is_structured_data": True}})
+        elif task.kind == "docx":
+            chunker = Chunker(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+            for text in chunker.chunk_text(FileParser._parse_docx(path.read_bytes())):
+                records.append({"content": text, "metadata": dict(base_metadata)})
+        error = None
+    except Exception as e:
+        records = []
+        error = f"{type(e).__name__}: {str(e)}"
+
+    for i, record in enumerate(records):
+        record["id"] = f"{base_metadata['source']}#{i}"
+        record["metadata"]["chunk_index"] = i
+
+    return {"path": task.path, "records": records, "seconds": time.perf_counter() - start, "error": error}
+
+
+class SegmentWriter:
+    """레코드를 JSONL 세그먼트 파일로 기록 (segment_size 레코드마다 새 세그먼트)"""
+
+    def __init__(self, output_dir: Path, segment_size: int = 10000):
+        self.segment_dir = output_dir / SEGMENT_DIR
+        self.segment_dir.mkdir(parents=True, exist_ok=True)
+        self.segment_size = segment_size
+        self.segments: List[Dict[str, Any]] = []
+        self._file = None
+        self._count = 0
+        self.bytes_written = 0
+
+    def _open_next(self):
+        self.close()
+        name = f"seg-{len(self.segments):05d}.jsonl"
+        self._file = open(self.segment_dir / name, "w", encoding="utf-8")
+        self.segments.append({"file": f"{SEGMENT_DIR}/{name}", "records": 0})
+        self._count = 0
+
+    def write(self, records: List[Dict[str, Any]]):
+        for record in records:
+            if self._file is None or self._count >= self.segment_size:
+                self._open_next()
+            line = json.dumps(record, ensure_ascii=False) + "\n"
+            self._file.write(line)
+            self.bytes_written += len(line.encode("utf-8"))
+            self._count += 1
+            self.segments[-1]["records"] += 1
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+async def _embed_records(
+    embedder,
+    records: List[Dict[str, Any]],
+    semaphore: asyncio.Semaphore,
+    batch_size: int,
+    stats: StageStats
+):
+    """레코드를 배치로 나누어 동시성 제한 하에 임베딩 (빈 텍스트는 건너뜀)"""
+    targets = [r for r in records if r["content"] and r["content"].strip()]
+
+    async def _one_batch(batch: List[Dict[str, Any]]):
+        async with semaphore:
+            start = time.perf_counter()
+            vectors = await embedder.embed_batch([r["content"] for r in batch])
+            end = time.perf_counter()
+        # 동시 요청이 겹치므로 처리량은 첫 요청 시작~마지막 요청 종료 구간 기준
+        stats.extra["busy_seconds"] = stats.extra.get("busy_seconds", 0.0) + (end - start)
+        stats.extra["_first_start"] = min(stats.extra.get("_first_start", start), start)
+        stats.seconds = max(stats.seconds, end - stats.extra["_first_start"])
+        for record, vector in zip(batch, vectors):
+            record["embedding"] = vector
+        stats.items += len(batch)
+        stats.bytes += sum(len(r["content"].encode("utf-8")) for r in batch)
+        stats.extra["batches"] = stats.extra.get("batches", 0) + 1
+
+    await asyncio.gather(*[
+        _one_batch(targets[i:i + batch_size]) for i in range(0, len(targets), batch_size)
+    ])
+
+
+async def run_ingest(
+    documents_dir: Path,
+    output_dir: Path,
+    workers: Optional[int] = None,
+    chunk_size: int = 1000,
+    chunk_overlap: int = 200,
+    segment_size: int = 10000,
+    embedder=None,
+    embed_concurrency: int = 4,
+    embed_batch_size: int = 64,
+    synonyms_path: Optional[Path] = None
+) -> Dict[str, Any]:
+    """
+    documents 폴더 전체를 인덱싱하여 output_dir에 세그먼트와 매니페스트 기록
+
+    파싱은 프로세스 풀에서 병렬로 수행하고, 완료된 파일부터 임베딩/기록합니다.
+    embedder가 None이면 임베딩 단계를 건너뜁니다.
+    """
+    wall_start = time.perf_counter()
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    discover_stats = StageStats("discover")
+    start = time.perf_counter()
+    tasks = discover_files(documents_dir, synonyms_path)
+    discover_stats.seconds = time.perf_counter() - start
+    discover_stats.items = len(tasks)
+    discover_stats.bytes = sum(t.size for t in tasks)
+    logger.info(f"인덱싱 대상 파일 {len(tasks)}개 발견 ({discover_stats.bytes / 1024 / 1024:.1f}MB)")
+
+    parse_stats = StageStats("parse")
+    embed_stats = StageStats("embed")
+    write_stats = StageStats("write")
+    writer = SegmentWriter(output_dir, segment_size=segment_size)
+    semaphore = asyncio.Semaphore(max(1, embed_concurrency))
+    file_results: List[Dict[str, Any]] = []
+    async def _consume(task: IngestTask, result: Dict[str, Any]):
+        records = result["records"]
+        if embedder is not None and records:
+            try:
+                await _embed_records(embedder, records, semaphore, embed_batch_size, embed_stats)
+            except Exception as e:
+                result["error"] = f"임베딩 실패: {str(e)}"
+                logger.error(f"임베딩 실패: {task.path}, {str(e)}")
+        start = time.perf_counter()
+        writer.write(records)
+        write_stats.seconds += time.perf_counter() - start
+        write_stats.items += len(records)
+        file_results.append({
+            "path": os.path.relpath(task.path, documents_dir),
+            "folder": task.folder,
+            "kind": task.kind,
+            "bytes": task.size,
+            "chunks": len(records),
+            "parse_seconds": round(result["seconds"], 4),
+            "error": result["error"],
+        })
+        if result["error"]:
+            logger.warning(f"인덱싱 실패: {task.path} ({result['error']})")
+
+    loop = asyncio.get_running_loop()
+    parse_start = time.perf_counter()
+    consumers = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # region 파일은 "region"과 지역명 두 작업으로 나오므로 결과를 경로가 아닌 작업 자체와 묶음
+        async def _parse(task: IngestTask):
+            return task, await loop.run_in_executor(pool, parse_task, task, chunk_size, chunk_overlap)
+
+        for future in asyncio.as_completed([_parse(task) for task in tasks]):
+            task, result = await future
+            parse_stats.items += 1
+            parse_stats.bytes += task.size
+            parse_stats.extra["chunks"] = parse_stats.extra.get("chunks", 0) + len(result["records"])
+            parse_stats.extra["cpu_seconds"] = parse_stats.extra.get("cpu_seconds", 0.0) + result["seconds"]
+            consumers.append(asyncio.create_task(_consume(task, result)))
+        parse_stats.seconds = time.perf_counter() - parse_start
+        await asyncio.gather(*consumers)
+    writer.close()
+    write_stats.bytes = writer.bytes_written
+    embed_stats.extra.pop("_first_start", None)
+
+    stages = [discover_stats, parse_stats, embed_stats, write_stats] if embedder is not None \
+        else [discover_stats, parse_stats, write_stats]
+    manifest = {
+        "created_at": datetime.now().isoformat(),
+        "documents_dir": str(documents_dir),
+        "embedding_model": getattr(embedder, "model", None),
+        "total_records": write_stats.items,
+        "segments": writer.segments,
+        "files": sorted(file_results, key=lambda r: (r["path"], r["folder"])),
+        "stages": {s.name: s.to_dict() for s in stages},
+        "wall_seconds": time.perf_counter() - wall_start,
+    }
+    with open(output_dir / MANIFEST_NAME, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    return manifest
+
+
+def iter_segment_records(index_dir: Path) -> Iterator[Dict[str, Any]]:
+    """매니페스트 순서대로 세그먼트 레코드 순회"""
+    with open(Path(index_dir) / MANIFEST_NAME, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    for segment in manifest["segments"]:
+        with open(Path(index_dir) / segment["file"], "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def _print_stages(manifest: Dict[str, Any]):
+    print(f"{'단계':<10}{'항목':>10}{'MB':>10}{'초':>10}{'항목/초':>12}{'MB/초':>10}")
+    for name, stage in manifest["stages"].items():
+        print(
+            f"{name:<10}{stage['items']:>10}{stage['bytes'] / 1024 / 1024:>10.1f}{stage['seconds']:>10.2f}"
+            f"{stage['items_per_sec']:>12.1f}{stage['mb_per_sec']:>10.1f}"
+        )
+    failed = [f for f in manifest["files"] if f["error"]]
+    print(f"\n레코드 {manifest['total_records']}개, 세그먼트 {len(manifest['segments'])}개, "
+          f"실패 파일 {len(failed)}개, 전체 {manifest['wall_seconds']:.2f}초")
+
+
+def _build_embedder(args):
+    """설정 기반 Embedder 생성 (속도 제한 포함)"""
+    from app.core.config import settings
+    from rag.embedding.embedder import Embedder
+    from rag.utils.rate_limit import get_shared_rate_limiter
+
+    # CLI는 서버와 다른 프로세스라 한도를 따로 셈 - 서버가 같은 API 키로 동작 중이면
+    # OPENAI_RPM_LIMIT / OPENAI_TPM_LIMIT을 나눠서(예: 절반) 지정해 실행
+    rate_limiter = get_shared_rate_limiter()
+    embedder = Embedder(
+        api_key=settings.OPENAI_API_KEY,
+        model=args.embed_model or settings.OPENAI_EMBEDDING_MODEL,
+        base_url=settings.OPENAI_BASE_URL or None,
+        rate_limiter=rate_limiter
+    )
+    return embedder
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="documents 폴더 일괄 인덱싱")
+    parser.add_argument("--documents-dir", type=str, default=None, help="인덱싱할 documents 폴더 (기본: 설정값)")
+    parser.add_argument("--output", type=str, default="index_build", help="세그먼트/매니페스트 출력 폴더")
+    parser.add_argument("--workers", type=int, default=None, help="파싱 프로세스 수 (기본: CPU 수)")
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--chunk-overlap", type=int, default=200)
+    parser.add_argument("--segment-size", type=int, default=10000, help="세그먼트당 레코드 수")
+    parser.add_argument("--embed", action="store_true", help="OpenAI 임베딩 생성 (기본: 파싱/청킹만)")
+    parser.add_argument("--embed-model", type=str, default=None)
+    parser.add_argument("--embed-concurrency", type=int, default=4, help="동시 임베딩 요청 수")
+    parser.add_argument("--embed-batch-size", type=int, default=64, help="임베딩 요청당 텍스트 수")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+
+    from app.core.config import settings
+    documents_dir = Path(args.documents_dir or settings.DOCUMENTS_DIR)
+    synonyms_path = Path(settings.SYNONYMS_PATH) if settings.SYNONYMS_PATH else None
+    if not documents_dir.exists():
+        parser.error(f"documents 폴더가 없습니다: {documents_dir}")
+
+    embedder = _build_embedder(args) if args.embed else None
+    manifest = asyncio.run(run_ingest(
+        documents_dir=documents_dir,
+        output_dir=Path(args.output),
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+        chunk_overlap=args.chunk_overlap,
+        segment_size=args.segment_size,
+        embedder=embedder,
+        embed_concurrency=args.embed_concurrency,
+        embed_batch_size=args.embed_batch_size,
+        synonyms_path=synonyms_path,
+    ))
+    _print_stages(manifest)
+    return 0 if not any(f["error"] for f in manifest["files"]) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
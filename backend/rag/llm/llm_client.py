@@ -1,24 +1,38 @@
 from openai import AsyncOpenAI
-from openai import APIError, RateLimitError, APIConnectionError
+from openai import APIError, RateLimitError, APIConnectionError, APITimeoutError, InternalServerError
 from rag.utils.retry import retry_with_backoff
+from rag.utils.rate_limit import OpenAIRateLimiter, estimate_tokens
 from rag.llm.prompts import SYSTEM_PROMPT, get_rag_prompt, format_context_chunks
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
 class LLMClient:
-    def __init__(self, api_key: str, model: str = "gpt-4o-mini"):
+    # 재시도 대상 오류 (속도 제한, 연결 실패, 서버 오류)
+    RETRYABLE_ERRORS = (RateLimitError, APIConnectionError, APITimeoutError, InternalServerError)
+    
+    def __init__(
+        self,
+        api_key: str,
+        model: str = "gpt-4o-mini",
+        base_url: Optional[str] = None,
+        rate_limiter: Optional[OpenAIRateLimiter] = None
+    ):
         if not api_key or api_key == "":
             raise ValueError("OpenAI API 키가 설정되지 않았습니다.")
-        self.client = AsyncOpenAI(api_key=api_key)
+        self.rate_limiter = rate_limiter
+        # base_url을 지정하면 OpenAI 호환 서버(예: 로컬 모의 서버)로 요청
+        # rate_limiter가 있으면 재시도는 rate_limiter가 담당 (SDK 자체 재시도 비활성화)
+        client_kwargs = {"max_retries": 0} if rate_limiter else {}
+        self.client = AsyncOpenAI(api_key=api_key, base_url=base_url or None, **client_kwargs)
         self.model = model
     
     async def _call_openai(self, messages, temperature=0.7, max_tokens=1000):
-        """OpenAI API 호출 (타임아웃 설정, 재시도 없음 - 빠른 실패)"""
+        """OpenAI API 호출 (타임아웃 설정, rate_limiter가 있으면 속도 제한 + 재시도)"""
         import asyncio
         import logging
         logger = logging.getLogger(__name__)
         
-        try:
-            # 타임아웃 설정: 15초 (재시도 없이 빠르게)
+        async def _request():
+            # 타임아웃 설정: 15초
             return await asyncio.wait_for(
                 self.client.chat.completions.create(
                     model=self.model,
@@ -29,6 +43,16 @@ class LLMClient:
                 ),
                 timeout=18.0  # 전체 타임아웃
             )
+        
+        try:
+            if self.rate_limiter is None:
+                return await _request()
+            prompt_tokens = sum(estimate_tokens(m.get("content", "")) for m in messages)
+            return await self.rate_limiter.call(
+                _request,
+                estimated_tokens=prompt_tokens + max_tokens,
+                retry_on=self.RETRYABLE_ERRORS
+            )
         except asyncio.TimeoutError:
             logger.error("OpenAI API 호출 타임아웃 (15초 초과)")
             raise TimeoutError("OpenAI API 호출이 15초를 초과했습니다.")
@@ -42,9 +66,10 @@ class LLMClient:
         context: str = None,
         chunks: List[Dict[str, Any]] = None,
         scenario: str = None,
-        region: str = None
+        region: str = None,
+        raise_errors: bool = False
     ) -> str:
-        """컨텍스트를 기반으로 답변 생성"""
+        """컨텍스트를 기반으로 답변 생성 (raise_errors=True면 API 오류를 호출자에게 전달)"""
         # 입력값 검증
         if not query or not query.strip():
             return "질문이 비어있습니다."
@@ -85,6 +110,8 @@ class LLMClient:
             
             return answer.strip()
         except Exception as e:
+            if raise_errors:
+                raise
             import logging
             logger = logging.getLogger(__name__)
             logger.error(f"LLM generate_answer error: {str(e)}", exc_info=True)
@@ -96,3 +96,43 @@ def format_context_chunks(chunks: List[Dict[str, Any]]) -> str:
     
     return "\n\n".join(context_blocks)
 
+
+def _parse_labeled_content(content: str) -> Dict[str, str]:
+    """'질문: ...', '답변: ...' 형식의 청크 내용을 필드별로 분리"""
+    fields: Dict[str, str] = {}
+    current = None
+    for line in content.split("\n"):
+        label, sep, value = line.partition(": ")
+        if sep and label in ("질문", "답변", "제목", "카테고리", "키워드"):
+            current = label
+            fields[current] = value.strip()
+        elif current:
+            fields[current] += "\n" + line
+    return fields
+
+def build_extractive_answer(
+    query: str,
+    chunks: List[Dict[str, Any]],
+    notice: str,
+    max_items: int = 3,
+    max_answer_chars: int = 400
+) -> str:
+    """LLM 없이 상위 검색 결과(Q&A 항목)로 구성한 추출형 답변 (LLM 장애 시 사용)"""
+    lines = [f"## '{query[:50]}' 관련 검색 결과 요약", "", f"> {notice}", ""]
+    
+    for i, chunk in enumerate(chunks[:max_items], 1):
+        fields = _parse_labeled_content(chunk.get("content", ""))
+        title = fields.get("질문") or fields.get("제목") or f"참고 자료 {i}"
+        answer = fields.get("답변") or chunk.get("content", "")
+        if len(answer) > max_answer_chars:
+            answer = answer[:max_answer_chars] + "..."
+        source = (chunk.get("metadata") or {}).get("source", "")
+        
+        lines.append(f"### {i}. {title}")
+        lines.append(f"- {answer}")
+        if source:
+            lines.append(f"- [출처: {source}]")
+        lines.append("")
+    
+    lines.append("더 자세한 내용이 필요하신가요?")
+    return "\n".join(lines)
@@ -0,0 +1,228 @@
+"""
+쿼리 임베딩 유사도 기반 답변 캐시 (LLM 호출 앞단)
+
+"건축허가 서류 뭐 필요해요?"와 "건축허가에 필요한 서류는?"처럼 표현만 다른 질문은
+정확한 키 캐시로는 맞지 않으므로, 쿼리 임베딩의 코사인 유사도가 임계값 이상인
+최근 답변을 재사용합니다. 항목은 검색 범위(건물 유형, 지역, 패싯, top_k)별로 나누어
+같은 범위 안에서만 비교하며, TTL이 지나거나 해당 폴더가 재인덱싱되면 제거됩니다.
+
+범위당 항목 수가 작으므로(max_entries 이하) 근사 색인 대신 정규화된 벡터 행렬과의
+내적 한 번으로 정확한 최근접 항목을 찾습니다.
+"""
+import asyncio
+import logging
+import re
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_NON_WORD = re.compile(r'[\s\W_]+')
+
+
+class HashingEmbedder:
+    """
+    API 호출 없는 로컬 쿼리 임베더 (문자 n-gram 해싱)
+
+    띄어쓰기/문장부호/어순 정도만 다른 질문을 잡는 용도이며, 뜻이 같은 다른 표현까지
+    잡으려면 Embedder(OpenAI 임베딩)를 사용합니다.
+    """
+
+    def __init__(self, dimensions: int = 1024, ngram_sizes: Tuple[int, ...] = (2, 3)):
+        self.dimensions = dimensions
+        self.ngram_sizes = ngram_sizes
+
+    def embed(self, text: str) -> List[float]:
+        normalized = _NON_WORD.sub('', text.lower())
+        vector = np.zeros(self.dimensions, dtype=np.float32)
+        for n in self.ngram_sizes:
+            for i in range(max(len(normalized) - n + 1, 1 if normalized else 0)):
+                h = zlib.crc32(normalized[i:i + n].encode('utf-8'))
+                vector[h % self.dimensions] += 1.0 if h & 0x80000000 else -1.0
+        return vector.tolist()
+
+    async def embed_query(self, query: str) -> List[float]:
+        """Embedder.embed_query와 같은 인터페이스"""
+        return self.embed(query)
+
+
+@dataclass
+class _Entry:
+    scope: Hashable
+    folders: Tuple[str, ...]
+    query: str
+    answer: str
+    vector: np.ndarray
+    expires_at: float
+
+
+class SemanticCache:
+    """
+    범위별 쿼리 임베딩 -> 답변 캐시
+
+    Args:
+        embedder: embed_query(text) 코루틴을 제공하는 임베더 (Embedder 또는 HashingEmbedder)
+        threshold: 캐시 답변을 사용할 코사인 유사도 하한
+        ttl_seconds: 항목 유효 시간 (초)
+        max_entries: 전체 최대 항목 수 (초과 시 가장 오래 사용되지 않은 항목부터 제거)
+        embed_timeout: 쿼리 임베딩 최대 대기 시간 (초, 초과 시 캐시를 건너뛰고 LLM 호출)
+    """
+
+    def __init__(
+        self,
+        embedder,
+        threshold: float = 0.9,
+        ttl_seconds: float = 3600.0,
+        max_entries: int = 1000,
+        embed_timeout: float = 2.0
+    ):
+        self.embedder = embedder
+        # 원격(API) 임베더 여부 (LLM 공급자 장애 중에는 조회를 건너뛰는 데 사용)
+        self.remote = not isinstance(embedder, HashingEmbedder)
+        self.embed_timeout = embed_timeout
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        # 조회/저장은 이벤트 루프, 무효화는 재인덱싱 작업 스레드에서 호출되므로 항목 변경은 잠금 안에서만
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[int, _Entry]" = OrderedDict()
+        # 범위 -> (항목 id 목록, 정규화된 벡터 행렬), 항목이 바뀌면 None으로 두고 다음 조회 때 다시 구성
+        self._scopes: Dict[Hashable, Optional[Tuple[List[int], np.ndarray]]] = {}
+        self._next_id = 0
+        # 무효화 세대 (조회 후 LLM 응답을 기다리는 동안 재인덱싱되면 그 답변은 저장하지 않음)
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def scope_key(folder: str, region: Optional[str], facets: Optional[Dict[str, List[str]]], top_k: int) -> Hashable:
+        """검색 결과(컨텍스트)를 결정하는 요청 값으로 만든 범위 키"""
+        facet_key = tuple(sorted(
+            (field, tuple(sorted(str(v).strip().lower() for v in values)))
+            for field, values in (facets or {}).items()
+            if values
+        ))
+        return (folder, region or "", facet_key, top_k)
+
+    async def embed(self, query: str) -> Optional[np.ndarray]:
+        """쿼리 임베딩 (정규화, 실패하면 None - 캐시를 건너뜀)"""
+        try:
+            embedding = await asyncio.wait_for(self.embedder.embed_query(query), timeout=self.embed_timeout)
+            vector = np.asarray(embedding, dtype=np.float32)
+        except asyncio.CancelledError:
+            raise
+        except asyncio.TimeoutError:
+            logger.warning(f"캐시용 쿼리 임베딩 타임아웃 ({self.embed_timeout}초 초과, 캐시 건너뜀)")
+            return None
+        except Exception as e:
+            logger.warning(f"캐시용 쿼리 임베딩 실패 (캐시 건너뜀): {str(e)}")
+            return None
+        norm = float(np.linalg.norm(vector))
+        if norm == 0.0:
+            return None
+        return vector / norm
+
+    def _scope_matrix(self, scope: Hashable) -> Optional[Tuple[List[int], np.ndarray]]:
+        if scope not in self._scopes:
+            return None
+        cached = self._scopes[scope]
+        if cached is None:
+            ids = [entry_id for entry_id, entry in self._entries.items() if entry.scope == scope]
+            if not ids:
+                del self._scopes[scope]
+                return None
+            cached = (ids, np.vstack([self._entries[entry_id].vector for entry_id in ids]))
+            self._scopes[scope] = cached
+        return cached
+
+    def _remove(self, entry_ids: Iterable[int]):
+        for entry_id in entry_ids:
+            entry = self._entries.pop(entry_id, None)
+            if entry is not None:
+                self._scopes[entry.scope] = None
+
+    def lookup(self, scope: Hashable, vector: np.ndarray) -> Optional[Tuple[str, float]]:
+        """범위 안에서 가장 유사한 유효 항목의 (답변, 유사도) (임계값 미만이면 None)"""
+        with self._lock:
+            cached = self._scope_matrix(scope)
+            if cached is None:
+                self.misses += 1
+                return None
+
+            ids, matrix = cached
+            similarities = matrix @ vector
+            now = time.monotonic()
+            expired = []
+            result = None
+            for index in np.argsort(-similarities):
+                similarity = float(similarities[index])
+                if similarity < self.threshold:
+                    break
+                entry = self._entries[ids[index]]
+                if entry.expires_at <= now:
+                    expired.append(ids[index])
+                    continue
+                self._entries.move_to_end(ids[index])
+                result = (entry.answer, similarity)
+                break
+            self._remove(expired)
+
+            if result is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return result
+
+    def put(self, scope: Hashable, folders: Iterable[str], query: str, vector: np.ndarray, answer: str, generation: int):
+        """답변 저장 (조회 이후 무효화가 있었으면 저장하지 않음)"""
+        with self._lock:
+            if generation != self.generation:
+                return
+            entry_id = self._next_id
+            self._next_id += 1
+            self._entries[entry_id] = _Entry(
+                scope=scope,
+                folders=tuple(f for f in folders if f),
+                query=query,
+                answer=answer,
+                vector=vector,
+                expires_at=time.monotonic() + self.ttl_seconds
+            )
+            self._scopes[scope] = None
+
+            if len(self._entries) > self.max_entries:
+                now = time.monotonic()
+                expired = [entry_id for entry_id, entry in self._entries.items() if entry.expires_at <= now]
+                self._remove(expired)
+                while len(self._entries) > self.max_entries:
+                    self._remove([next(iter(self._entries))])
+
+    def invalidate(self, folders: Optional[Iterable[str]] = None) -> int:
+        """폴더(건물 유형/지역)가 검색 범위에 포함된 항목 제거 (None이면 전체), 제거된 수 반환"""
+        with self._lock:
+            self.generation += 1
+            if folders is None:
+                removed = len(self._entries)
+                self._entries.clear()
+                self._scopes.clear()
+            else:
+                targets = set(folders)
+                stale = [entry_id for entry_id, entry in self._entries.items() if targets.intersection(entry.folders)]
+                self._remove(stale)
+                removed = len(stale)
+            if removed:
+                logger.info(f"답변 캐시 무효화: {removed}개 항목 제거")
+            return removed
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
@@ -1,6 +1,10 @@
 import io
+import csv
 import json
-from typing import Optional, List, Dict, Any
+import codecs
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional, List, Dict, Any, Iterator, Tuple, Union, BinaryIO
 import pandas as pd
 
 class FileParser:
@@ -48,56 +52,147 @@ class FileParser:
                     return file_content.decode('latin-1')  # 폴백
     
     @staticmethod
-    def _parse_excel(file_content: bytes) -> str:
+    def _parse_excel(file_content: Union[bytes, str, Path, BinaryIO]) -> str:
         """Excel 파일을 텍스트로 변환"""
         try:
-            # 모든 시트 읽기
-            excel_file = io.BytesIO(file_content)
-            excel_data = pd.read_excel(excel_file, sheet_name=None, engine='openpyxl')
-            
-            text_parts = []
-            for sheet_name, df in excel_data.items():
-                text_parts.append(f"=== 시트: {sheet_name} ===")
-                text_parts.append(FileParser._dataframe_to_text(df))
-                text_parts.append("")  # 빈 줄 추가
-            
-            return "\n".join(text_parts)
+            return "\n".join(FileParser.iter_excel_rows(file_content))
         except Exception as e:
             raise ValueError(f"Excel 파일 파싱 오류: {str(e)}")
     
     @staticmethod
-    def _parse_csv(file_content: bytes, filename: str) -> str:
+    def _parse_csv(file_content: Union[bytes, str, Path, BinaryIO], filename: str) -> str:
         """CSV 파일을 텍스트로 변환"""
         try:
-            # 인코딩 자동 감지 시도
-            encodings = ['utf-8', 'utf-8-sig', 'cp949', 'euc-kr', 'latin-1']
-            separators = [',', ';', '\t', '|']
-            df = None
+            return "\n".join(FileParser.iter_csv_rows(file_content))
+        except Exception as e:
+            raise ValueError(f"CSV 파일 파싱 오류: {str(e)}")
+    
+    @staticmethod
+    @contextmanager
+    def _open_binary(source: Union[bytes, str, Path, BinaryIO]) -> Iterator[BinaryIO]:
+        """bytes / 파일 경로 / 바이너리 파일 객체를 읽기용 파일 객체로 통일"""
+        if isinstance(source, (bytes, bytearray)):
+            yield io.BytesIO(source)
+        elif isinstance(source, (str, Path)):
+            with open(source, "rb") as f:
+                yield f
+        else:
+            source.seek(0)
+            yield source
+    
+    @staticmethod
+    def _sniff_csv_format(prefix: bytes, truncated: bool) -> Tuple[str, str]:
+        """파일 앞부분만으로 인코딩과 구분자를 한 번에 추정"""
+        if truncated and b"\n" in prefix:
+            # 잘린 마지막 줄(멀티바이트 문자 중간일 수 있음) 제외
+            prefix = prefix[:prefix.rfind(b"\n") + 1]
+        
+        encoding = "latin-1"
+        sample = ""
+        candidates = ["utf-8-sig"] if prefix.startswith(codecs.BOM_UTF8) else []
+        candidates += ["utf-8", "cp949", "euc-kr"]
+        for candidate in candidates:
+            try:
+                sample = prefix.decode(candidate)
+                encoding = candidate
+                break
+            except UnicodeDecodeError:
+                continue
+        else:
+            sample = prefix.decode("latin-1")
+        
+        separator = ","
+        try:
+            separator = csv.Sniffer().sniff(sample, delimiters=",;\t|").delimiter
+        except csv.Error:
+            # 스니퍼 실패 시 첫 줄들에서 가장 일관되게 나타나는 구분자 선택
+            lines = [line for line in sample.splitlines()[:20] if line.strip()]
+            best_score = 0
+            for sep in [",", ";", "\t", "|"]:
+                counts = [line.count(sep) for line in lines]
+                if counts and min(counts) > 0 and min(counts) * len(counts) > best_score:
+                    best_score = min(counts) * len(counts)
+                    separator = sep
+        return encoding, separator
+    
+    @staticmethod
+    def iter_csv_rows(
+        source: Union[bytes, str, Path, BinaryIO],
+        chunksize: int = 5000,
+        sniff_bytes: int = 64 * 1024
+    ) -> Iterator[str]:
+        """
+        CSV를 청크 단위로 읽어 텍스트 줄을 생성 (전체 파일을 메모리에 올리지 않음)
+        
+        인코딩/구분자는 앞부분 sniff_bytes만 읽어 한 번에 추정합니다.
+        생성 형식은 _dataframe_to_text와 같습니다 ("컬럼: ...", "", "행 N: ...").
+        """
+        with FileParser._open_binary(source) as f:
+            prefix = f.read(sniff_bytes + 1)
+            truncated = len(prefix) > sniff_bytes
+            encoding, separator = FileParser._sniff_csv_format(prefix[:sniff_bytes], truncated)
+            f.seek(0)
             
-            for encoding in encodings:
-                for sep in separators:
-                    try:
-                        csv_file = io.BytesIO(file_content)
-                        df = pd.read_csv(
-                            csv_file, 
-                            encoding=encoding,
-                            sep=sep,
-                            on_bad_lines='skip'  # 잘못된 줄 건너뛰기
-                        )
-                        # 최소한의 데이터가 있는지 확인
-                        if len(df) > 0 or len(df.columns) > 0:
-                            break
-                    except (UnicodeDecodeError, pd.errors.ParserError, ValueError):
-                        continue
-                if df is not None and (len(df) > 0 or len(df.columns) > 0):
-                    break
+            reader = pd.read_csv(
+                f,
+                encoding=encoding,
+                encoding_errors="replace",
+                sep=separator,
+                on_bad_lines='skip',  # 잘못된 줄 건너뛰기
+                chunksize=chunksize
+            )
+            header_written = False
+            with reader:
+                for chunk in reader:
+                    if not header_written:
+                        yield f"컬럼: {' | '.join(str(col) for col in chunk.columns)}"
+                        yield ""
+                        header_written = True
+                    yield from FileParser._iter_dataframe_rows(chunk)
             
-            if df is None or (len(df) == 0 and len(df.columns) == 0):
+            if not header_written:
                 raise ValueError("CSV 파일을 파싱할 수 없습니다. 인코딩이나 구분자를 확인해주세요.")
-            
-            return FileParser._dataframe_to_text(df)
-        except Exception as e:
-            raise ValueError(f"CSV 파일 파싱 오류: {str(e)}")
+    
+    @staticmethod
+    def iter_excel_rows(source: Union[bytes, str, Path, BinaryIO]) -> Iterator[str]:
+        """
+        Excel(xlsx)을 openpyxl read_only 모드로 한 행씩 읽어 텍스트 줄을 생성
+        
+        시트별로 "=== 시트: 이름 ===" 헤더 뒤에 _dataframe_to_text와 같은 형식의 행을 생성합니다.
+        """
+        from openpyxl import load_workbook
+        
+        with FileParser._open_binary(source) as f:
+            workbook = load_workbook(f, read_only=True, data_only=True)
+            try:
+                for sheet in workbook.worksheets:
+                    yield f"=== 시트: {sheet.title} ==="
+                    rows = sheet.iter_rows(values_only=True)
+                    header = next(rows, None)
+                    if header is None:
+                        yield ""
+                        continue
+                    columns = [
+                        str(col) if col is not None else f"Unnamed: {i}"
+                        for i, col in enumerate(header)
+                    ]
+                    yield f"컬럼: {' | '.join(columns)}"
+                    yield ""
+                    
+                    row_number = 0
+                    for values in rows:
+                        # 완전히 빈 행은 건너뜀
+                        if all(v is None for v in values):
+                            continue
+                        row_number += 1
+                        row_text = " | ".join(
+                            f"{col}: {value}" if value is not None else f"{col}: (비어있음)"
+                            for col, value in zip(columns, values)
+                        )
+                        yield f"행 {row_number}: {row_text}"
+                    yield ""  # 빈 줄 추가
+            finally:
+                workbook.close()
     
     @staticmethod
     def _dataframe_to_text(df: pd.DataFrame) -> str:
@@ -108,22 +203,117 @@ class FileParser:
         columns = " | ".join([str(col) for col in df.columns])
         text_parts.append(f"컬럼: {columns}")
         text_parts.append("")
-        
-        # 각 행을 텍스트로 변환
-        for idx, row in df.iterrows():
-            row_text_parts = []
-            for col in df.columns:
-                value = row[col]
-                if pd.notna(value):
-                    row_text_parts.append(f"{col}: {value}")
-                else:
-                    row_text_parts.append(f"{col}: (비어있음)")
-            
-            row_text = " | ".join(row_text_parts)
-            text_parts.append(f"행 {idx + 1}: {row_text}")
+        text_parts.extend(FileParser._iter_dataframe_rows(df))
         
         return "\n".join(text_parts)
     
+    @staticmethod
+    def _iter_dataframe_rows(df: pd.DataFrame) -> Iterator[str]:
+        """
+        DataFrame의 각 행을 "행 N: 컬럼: 값 | ..." 텍스트로 생성 (N은 인덱스 + 1)
+        
+        iterrows 대신 컬럼 단위 벡터화 문자열 연산으로 전체 행을 한 번에 구성합니다.
+        """
+        if df.empty:
+            return
+        
+        rendered_rows = None
+        for position, col in enumerate(df.columns):
+            series = df.iloc[:, position]
+            if pd.api.types.is_datetime64_any_dtype(series) or pd.api.types.is_timedelta64_dtype(series):
+                # str(Timestamp)와 같은 형식 유지
+                values = series.map(str)
+            else:
+                values = series.astype(str)
+            values = values.mask(series.isna(), "(비어있음)")
+            column_text = f"{col}: " + values
+            rendered_rows = column_text if rendered_rows is None else rendered_rows + " | " + column_text
+        
+        row_numbers = pd.Series(df.index + 1, index=df.index).astype(str)
+        yield from ("행 " + row_numbers + ": " + rendered_rows).tolist()
+    
+    @staticmethod
+    def iter_rows(filename: str, source: Union[bytes, str, Path, BinaryIO]) -> Iterator[str]:
+        """
+        CSV/Excel 파일을 행 단위 텍스트 줄로 생성 (Chunker.chunk_rows에 바로 전달 가능)
+        
+        전체 텍스트를 만들지 않으므로 대용량 표 파일도 메모리가 일정하게 유지됩니다.
+        """
+        file_ext = filename.lower().split('.')[-1] if '.' in filename else ''
+        if file_ext in ['xlsx', 'xls']:
+            return FileParser.iter_excel_rows(source)
+        if file_ext == 'csv':
+            return FileParser.iter_csv_rows(source)
+        raise ValueError(f"행 단위 파싱을 지원하지 않는 파일 형식입니다: {filename}")
+    
+    @staticmethod
+    def iter_json_items(
+        source: Union[bytes, str, Path, BinaryIO],
+        read_size: int = 1024 * 1024
+    ) -> Iterator[Any]:
+        """
+        JSON 배열 파일을 항목 단위로 생성 (read_size씩 읽어 항목 하나씩 디코딩)
+
+        최상위가 배열이 아니면 전체를 읽어 단일 값으로 생성합니다.
+        형식 오류는 json.JSONDecodeError로 발생합니다.
+        """
+        decoder = json.JSONDecoder()
+        with FileParser._open_binary(source) as f:
+            text_decoder = codecs.getincrementaldecoder("utf-8-sig")()
+            buffer = ""
+            eof = False
+
+            def _fill() -> bool:
+                nonlocal buffer, eof
+                if eof:
+                    return False
+                data = f.read(read_size)
+                eof = not data
+                buffer += text_decoder.decode(data, final=eof)
+                return True
+
+            def _skip_whitespace(pos: int) -> int:
+                nonlocal buffer
+                while True:
+                    while pos < len(buffer) and buffer[pos].isspace():
+                        pos += 1
+                    if pos < len(buffer) or not _fill():
+                        return pos
+
+            pos = _skip_whitespace(0)
+            if pos >= len(buffer) or buffer[pos] != '[':
+                # 배열이 아니면 전체를 한 번에 디코딩
+                while _fill():
+                    pass
+                yield json.loads(buffer)
+                return
+
+            pos = _skip_whitespace(pos + 1)
+            if pos < len(buffer) and buffer[pos] == ']':
+                return
+            while True:
+                try:
+                    item, end = decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    # 항목이 버퍼 경계에서 잘렸으면 더 읽고 재시도
+                    if _fill():
+                        continue
+                    raise
+                if end == len(buffer) and _fill():
+                    # 숫자 등 경계에서 끝난 값은 뒤따르는 내용을 확인 후 다시 디코딩
+                    continue
+                yield item
+                # 처리한 부분은 버퍼에서 제거
+                buffer = buffer[end:]
+                pos = _skip_whitespace(0)
+                if pos >= len(buffer):
+                    raise json.JSONDecodeError("배열이 닫히지 않았습니다", buffer, pos)
+                if buffer[pos] == ']':
+                    return
+                if buffer[pos] != ',':
+                    raise json.JSONDecodeError("',' 또는 ']'가 필요합니다", buffer, pos)
+                pos = _skip_whitespace(pos + 1)
+
     @staticmethod
     def _parse_docx(file_content: bytes) -> str:
         """DOCX 파일을 텍스트로 변환"""
@@ -263,95 +453,7 @@ class FileParser:
             # JSON 디코딩
             json_content = file_content.decode('utf-8')
             data = json.loads(json_content)
-            
-            if not isinstance(data, list):
-                # 배열이 아니면 단일 객체를 배열로 변환
-                data = [data]
-            
-            chunks = []
-            for item in data:
-                if not isinstance(item, dict):
-                    continue
-                
-                # JSON 항목을 구조화된 텍스트로 변환
-                chunk_text_parts = []
-                
-                # Q&A 형식 (Construction_law_qa.json)
-                if "question" in item and "answer" in item:
-                    chunk_text_parts.append(f"질문: {item.get('question', '')}")
-                    chunk_text_parts.append(f"답변: {item.get('answer', '')}")
-                    
-                    if item.get('category'):
-                        chunk_text_parts.append(f"카테고리: {item.get('category')}")
-                    if item.get('keywords'):
-                        keywords = item.get('keywords', [])
-                        if isinstance(keywords, list):
-                            chunk_text_parts.append(f"키워드: {', '.join(keywords)}")
-                    if item.get('legal_basis'):
-                        legal_basis = item.get('legal_basis', [])
-                        if isinstance(legal_basis, list) and legal_basis:
-                            chunk_text_parts.append(f"법적 근거: {', '.join(str(b) for b in legal_basis)}")
-                    if item.get('reference_document'):
-                        chunk_text_parts.append(f"참고 문서: {item.get('reference_document')}")
-                    if item.get('application_scope'):
-                        chunk_text_parts.append(f"적용 범위: {item.get('application_scope')}")
-                
-                # 조례 형식 (Jeonju_Construction_Ordinance.json)
-                elif "title" in item and "answer" in item:
-                    chunk_text_parts.append(f"제목: {item.get('title', '')}")
-                    if item.get('question'):
-                        chunk_text_parts.append(f"질문: {item.get('question')}")
-                    chunk_text_parts.append(f"답변: {item.get('answer', '')}")
-                    
-                    if item.get('category'):
-                        chunk_text_parts.append(f"카테고리: {item.get('category')}")
-                    if item.get('source_file'):
-                        chunk_text_parts.append(f"출처 파일: {item.get('source_file')}")
-                    if item.get('keywords'):
-                        keywords = item.get('keywords', [])
-                        if isinstance(keywords, list):
-                            chunk_text_parts.append(f"키워드: {', '.join(keywords)}")
-                    if item.get('regulation_type'):
-                        chunk_text_parts.append(f"규정 유형: {item.get('regulation_type')}")
-                    if item.get('jurisdiction'):
-                        chunk_text_parts.append(f"관할: {item.get('jurisdiction')}")
-                    if item.get('reference_law'):
-                        chunk_text_parts.append(f"참고 법령: {item.get('reference_law')}")
-                
-                # 기본 형식 (다른 필드들)
-                else:
-                    # 모든 필드를 텍스트로 변환
-                    for key, value in item.items():
-                        if value is not None:
-                            if isinstance(value, list):
-                                chunk_text_parts.append(f"{key}: {', '.join(str(v) for v in value)}")
-                            elif isinstance(value, dict):
-                                chunk_text_parts.append(f"{key}: {json.dumps(value, ensure_ascii=False)}")
-                            else:
-                                chunk_text_parts.append(f"{key}: {value}")
-                
-                # 청크 텍스트 생성
-                chunk_text = "\n".join(chunk_text_parts)
-                
-                # 메타데이터 구성
-                chunk_metadata = {
-                    "id": item.get("id", ""),
-                    "filename": filename,
-                    "folder": folder,
-                    "source_file": item.get("source_file", ""),
-                    "category": item.get("category", ""),
-                    "json_type": "qa" if "question" in item else "ordinance" if "title" in item else "general"
-                }
-                
-                # 원본 JSON 데이터도 메타데이터에 포함 (필요시 사용)
-                chunk_metadata.update({k: v for k, v in item.items() if k not in chunk_metadata})
-                
-                chunks.append({
-                    "content": chunk_text,
-                    "metadata": chunk_metadata
-                })
-            
-            return chunks
+            return FileParser.build_json_chunks(data, filename, folder)
         except json.JSONDecodeError as e:
             import logging
             logger = logging.getLogger(__name__)
@@ -362,4 +464,95 @@ class FileParser:
             logger = logging.getLogger(__name__)
             logger.error(f"JSON 파일 처리 오류: {filename}, {str(e)}")
             return []
-
+    
+    @staticmethod
+    def build_json_chunks(data: Any, filename: str, folder: str = None) -> List[Dict[str, Any]]:
+        """디코딩된 JSON 데이터(배열 또는 단일 객체)를 구조화된 청크로 변환"""
+        if not isinstance(data, list):
+            # 배열이 아니면 단일 객체를 배열로 변환
+            data = [data]
+        
+        chunks = []
+        for item in data:
+            if not isinstance(item, dict):
+                continue
+            
+            # JSON 항목을 구조화된 텍스트로 변환
+            chunk_text_parts = []
+            
+            # Q&A 형식 (Construction_law_qa.json)
+            if "question" in item and "answer" in item:
+                chunk_text_parts.append(f"질문: {item.get('question', '')}")
+                chunk_text_parts.append(f"답변: {item.get('answer', '')}")
+                
+                if item.get('category'):
+                    chunk_text_parts.append(f"카테고리: {item.get('category')}")
+                if item.get('keywords'):
+                    keywords = item.get('keywords', [])
+                    if isinstance(keywords, list):
+                        chunk_text_parts.append(f"키워드: {', '.join(keywords)}")
+                if item.get('legal_basis'):
+                    legal_basis = item.get('legal_basis', [])
+                    if isinstance(legal_basis, list) and legal_basis:
+                        chunk_text_parts.append(f"법적 근거: {', '.join(str(b) for b in legal_basis)}")
+                if item.get('reference_document'):
+                    chunk_text_parts.append(f"참고 문서: {item.get('reference_document')}")
+                if item.get('application_scope'):
+                    chunk_text_parts.append(f"적용 범위: {item.get('application_scope')}")
+            
+            # 조례 형식 (Jeonju_Construction_Ordinance.json)
+            elif "title" in item and "answer" in item:
+                chunk_text_parts.append(f"제목: {item.get('title', '')}")
+                if item.get('question'):
+                    chunk_text_parts.append(f"질문: {item.get('question')}")
+                chunk_text_parts.append(f"답변: {item.get('answer', '')}")
+                
+                if item.get('category'):
+                    chunk_text_parts.append(f"카테고리: {item.get('category')}")
+                if item.get('source_file'):
+                    chunk_text_parts.append(f"출처 파일: {item.get('source_file')}")
+                if item.get('keywords'):
+                    keywords = item.get('keywords', [])
+                    if isinstance(keywords, list):
+                        chunk_text_parts.append(f"키워드: {', '.join(keywords)}")
+                if item.get('regulation_type'):
+                    chunk_text_parts.append(f"규정 유형: {item.get('regulation_type')}")
+                if item.get('jurisdiction'):
+                    chunk_text_parts.append(f"관할: {item.get('jurisdiction')}")
+                if item.get('reference_law'):
+                    chunk_text_parts.append(f"참고 법령: {item.get('reference_law')}")
+            
+            # 기본 형식 (다른 필드들)
+            else:
+                # 모든 필드를 텍스트로 변환
+                for key, value in item.items():
+                    if value is not None:
+                        if isinstance(value, list):
+                            chunk_text_parts.append(f"{key}: {', '.join(str(v) for v in value)}")
+                        elif isinstance(value, dict):
+                            chunk_text_parts.append(f"{key}: {json.dumps(value, ensure_ascii=False)}")
+                        else:
+                            chunk_text_parts.append(f"{key}: {value}")
+            
+            # 청크 텍스트 생성
+            chunk_text = "\n".join(chunk_text_parts)
+            
+            # 메타데이터 구성
+            chunk_metadata = {
+                "id": item.get("id", ""),
+                "filename": filename,
+                "folder": folder,
+                "source_file": item.get("source_file", ""),
+                "category": item.get("category", ""),
+                "json_type": "qa" if "question" in item else "ordinance" if "title" in item else "general"
+            }
+            
+            # 원본 JSON 데이터도 메타데이터에 포함 (필요시 사용)
+            chunk_metadata.update({k: v for k, v in item.items() if k not in chunk_metadata})
+            
+            chunks.append({
+                "content": chunk_text,
+                "metadata": chunk_metadata
+            })
+        
+        return chunks
@@ -1,7 +1,31 @@
 """5-2.법령별 문서 전용 파서 - 행 단위 구조화 파싱"""
 from typing import List, Dict, Any, Optional
+import io
 import re
-from bs4 import BeautifulSoup
+
+try:
+    from lxml import etree
+    HAS_LXML = True
+except ImportError:  # lxml이 없으면 BeautifulSoup(html.parser)로 폴백
+    etree = None
+    HAS_LXML = False
+
+# 미리 컴파일한 정규식
+LAW_GROUP_PATTERN = re.compile(r'■\s*\d+\.\s*(.+)')
+ARTICLE_PATTERN = re.compile(r'제(\d+)조')
+# <p> 태그 (lxml은 <p> 안의 블록 요소/다음 <p>에서 문단을 암묵적으로 닫아 html.parser와 트리가 달라지므로 이름을 바꿔 파싱)
+P_TAG_PATTERN = re.compile(r'<(/?)p(?=[\s>/])', re.IGNORECASE)
+
+# note1 메타데이터: (라벨, 메타데이터 키, 패턴) - 앞에서부터 처음 일치하는 라벨 하나만 적용
+REVIEW_METADATA_PATTERNS = [
+    ('건축종류', 'building_type', re.compile(r'건축종류\s*:\s*(.+)')),
+    ('건축물용도', 'usage', re.compile(r'건축물용도\s*:\s*(.+)')),
+    ('건축주', 'owner_type', re.compile(r'건축주\s*:\s*(.+)')),
+    ('주요구조부', 'main_structure', re.compile(r'주요구조부\s*:\s*(.+)')),
+    ('건물특성', 'building_characteristics', re.compile(r'건물특성\s*:\s*(.+)')),
+]
+
+LAW_TEXT_CLASSES = {'tag1', 'tag2', 'tag3', 'tag4'}
 
 
 class LawTableParser:
@@ -9,7 +33,159 @@ class LawTableParser:
     
     @staticmethod
     def parse_law_table(html_content: str, scenario: str, filename: str) -> List[Dict[str, Any]]:
-        """HTML 테이블을 파싱하여 행 단위 청크 리스트 반환"""
+        """HTML 테이블을 파싱하여 행 단위 청크 리스트 반환 (lxml 우선, 없으면 BeautifulSoup)"""
+        if HAS_LXML:
+            return LawTableParser._parse_with_lxml(html_content, scenario, filename)
+        return LawTableParser._parse_with_bs4(html_content, scenario, filename)
+    
+    @staticmethod
+    def _parse_with_lxml(html_content: str, scenario: str, filename: str) -> List[Dict[str, Any]]:
+        """
+        lxml iterparse 기반 파싱
+        
+        table 요소만 순회하며 ruleCheckTable이 아닌 최상위 테이블은 즉시 비우고,
+        각 행의 셀은 한 번의 하위 요소 순회로 필요한 필드를 모두 추출합니다.
+        다른 테이블 안의 테이블은 바깥 테이블보다 먼저 닫히므로 비우지 않습니다
+        (ruleCheckTable 셀 안의 별표 등 중첩 테이블 텍스트 보존).
+        <p>는 BeautifulSoup(html.parser)처럼 쓰인 그대로 중첩되도록 다른 이름으로 바꿔 파싱합니다.
+        """
+        chunks = []
+        current_law_group = None
+        
+        table = None
+        source = io.BytesIO(P_TAG_PATTERN.sub(r'<\1lawp', html_content).encode('utf-8'))
+        for _, element in etree.iterparse(source, events=('end',), tag='table', html=True, encoding='utf-8'):
+            if 'ruleCheckTable' in (element.get('class') or '').split():
+                table = element
+                break
+            if next(element.iterancestors('table'), None) is None:
+                element.clear()
+        if table is None:
+            return chunks
+        
+        for row in table.iter('tr'):
+            cells = list(row.iter('td'))
+            if len(cells) < 2:
+                continue
+            
+            # 법령 묶음 헤더 확인 (colspan이 4인 경우)
+            if len(cells) == 1 and cells[0].get('colspan') == '4':
+                match = LAW_GROUP_PATTERN.search(LawTableParser._lxml_text(cells[0]))
+                if match:
+                    current_law_group = match.group(1).strip()
+                continue
+            
+            if len(cells) < 4:
+                continue
+            
+            # 헤더 행 스킵 (No, 항목, 법령내용, 검토내용)
+            cell_texts = [LawTableParser._lxml_text(cell) for cell in cells[:4]]
+            header_text = ' '.join(cell_texts)
+            if 'No' in header_text and '항목' in header_text and '법령내용' in header_text:
+                continue
+            
+            # No가 숫자가 아니거나 항목이 없으면 셀 상세 순회 생략
+            if not cell_texts[0].isdigit() or not cell_texts[1]:
+                continue
+            
+            law_text, article_ids = LawTableParser._lxml_law_content(cells[2])
+            review_text, metadata = LawTableParser._lxml_review_content(cells[3])
+            chunk = LawTableParser._build_chunk(
+                no_text=cell_texts[0],
+                item_name=cell_texts[1],
+                law_text=law_text,
+                article_ids=article_ids,
+                review_text=review_text,
+                metadata=metadata,
+                scenario=scenario,
+                law_group=current_law_group,
+                filename=filename
+            )
+            if chunk:
+                chunks.append(chunk)
+        
+        return chunks
+    
+    @staticmethod
+    def _lxml_text(element) -> str:
+        """BeautifulSoup get_text(strip=True)와 같은 결과 (각 문자열 strip 후 이어붙임)"""
+        return ''.join(text.strip() for text in element.itertext())
+    
+    @staticmethod
+    def _lxml_law_content(cell) -> tuple[str, List[str]]:
+        """법령내용 셀 한 번 순회로 조문 제목(jonote)과 조문 내용(tag1~4) 추출"""
+        jonote_parts = []
+        tag_parts = []
+        article_ids = []
+        
+        for element in cell.iterdescendants():
+            if not isinstance(element.tag, str):
+                continue  # 주석 등
+            classes = (element.get('class') or '').split()
+            if not classes:
+                continue
+            if 'jonote' in classes:
+                text = LawTableParser._lxml_text(element)
+                jonote_parts.append(text)
+                article_match = ARTICLE_PATTERN.search(text)
+                if article_match:
+                    article_ids.append(f"제{article_match.group(1)}조")
+            if element.tag in ('div', 'span') and LAW_TEXT_CLASSES.intersection(classes):
+                text = LawTableParser._lxml_text(element)
+                if text:
+                    tag_parts.append(text)
+        
+        return "\n".join(jonote_parts + tag_parts), article_ids
+    
+    @staticmethod
+    def _lxml_review_content(cell) -> tuple[str, Dict[str, Any]]:
+        """검토내용 셀 한 번 순회로 메타데이터(note1)와 검토 텍스트(note2) 추출"""
+        review_parts = []
+        metadata = LawTableParser._empty_review_metadata()
+        
+        for element in cell.iterdescendants():
+            if not isinstance(element.tag, str):
+                continue
+            classes = (element.get('class') or '').split()
+            if 'note1' in classes:
+                LawTableParser._apply_review_metadata(LawTableParser._lxml_text(element), metadata)
+            if 'note2' in classes:
+                text = LawTableParser._lxml_text(element)
+                if text:
+                    review_parts.append(text)
+        
+        return "\n".join(review_parts), metadata
+    
+    @staticmethod
+    def _empty_review_metadata() -> Dict[str, Any]:
+        return {
+            "building_type": None,  # 건축종류
+            "usage": None,  # 건축물용도
+            "owner_type": None,  # 건축주 유형
+            "main_structure": None,  # 주요구조부
+            "building_characteristics": []  # 건물특성
+        }
+    
+    @staticmethod
+    def _apply_review_metadata(text: str, metadata: Dict[str, Any]):
+        """note1 텍스트("• 건축종류 : 신축")를 메타데이터에 반영"""
+        if not text.startswith('•'):
+            return
+        for label, key, pattern in REVIEW_METADATA_PATTERNS:
+            if label in text:
+                match = pattern.search(text)
+                if match:
+                    value = match.group(1).strip()
+                    if key == "building_characteristics":
+                        metadata[key].append(value)
+                    else:
+                        metadata[key] = value
+                return
+    
+    @staticmethod
+    def _parse_with_bs4(html_content: str, scenario: str, filename: str) -> List[Dict[str, Any]]:
+        """BeautifulSoup(html.parser) 기반 파싱 (lxml 미설치 시 폴백)"""
+        from bs4 import BeautifulSoup
         soup = BeautifulSoup(html_content, 'html.parser')
         
         chunks = []
@@ -31,7 +207,7 @@ class LawTableParser:
             if len(cells) == 1 and cells[0].get('colspan') == '4':
                 law_group_text = cells[0].get_text(strip=True)
                 # "■ 1. 건축법" 형식에서 "건축법" 추출
-                match = re.search(r'■\s*\d+\.\s*(.+)', law_group_text)
+                match = LAW_GROUP_PATTERN.search(law_group_text)
                 if match:
                     current_law_group = match.group(1).strip()
                 continue
@@ -63,7 +239,6 @@ class LawTableParser:
             no_text = cells[0].get_text(strip=True)
             if not no_text or not no_text.isdigit():
                 return None
-            no = int(no_text)
             
             # 항목 (두 번째 셀)
             item_name = cells[1].get_text(strip=True)
@@ -78,30 +253,57 @@ class LawTableParser:
             review_content_cell = cells[3]
             review_text, metadata = LawTableParser._extract_review_content(review_content_cell)
             
-            # 청크 ID 생성
-            chunk_id = f"{scenario}|{filename}|{law_group}|{no}" if law_group else f"{scenario}|{filename}|{no}"
-            
-            # 구조화된 청크 메타데이터
-            chunk = {
-                "id": chunk_id,
-                "scenario": scenario,
-                "law_group": law_group or "기타",
-                "article_ids": article_ids,
-                "item_name": item_name,
-                "law_text": law_text,
-                "review_text": review_text,
-                "no": no,
-                "filename": filename,
-                **metadata  # 건축종류, 건축물용도, 주요구조부 등 추가 메타데이터
-            }
-            
-            return chunk
+            return LawTableParser._build_chunk(
+                no_text=no_text,
+                item_name=item_name,
+                law_text=law_text,
+                article_ids=article_ids,
+                review_text=review_text,
+                metadata=metadata,
+                scenario=scenario,
+                law_group=law_group,
+                filename=filename
+            )
         except Exception as e:
             import logging
             logger = logging.getLogger(__name__)
             logger.warning(f"행 파싱 오류: {str(e)}")
             return None
     
+    @staticmethod
+    def _build_chunk(
+        no_text: str,
+        item_name: str,
+        law_text: str,
+        article_ids: List[str],
+        review_text: str,
+        metadata: Dict[str, Any],
+        scenario: str,
+        law_group: Optional[str],
+        filename: str
+    ) -> Optional[Dict[str, Any]]:
+        """추출한 셀 값으로 구조화된 청크 메타데이터 생성 (No가 숫자가 아니거나 항목이 없으면 None)"""
+        if not no_text or not no_text.isdigit() or not item_name:
+            return None
+        no = int(no_text)
+        
+        # 청크 ID 생성
+        chunk_id = f"{scenario}|{filename}|{law_group}|{no}" if law_group else f"{scenario}|{filename}|{no}"
+        
+        # 구조화된 청크 메타데이터
+        return {
+            "id": chunk_id,
+            "scenario": scenario,
+            "law_group": law_group or "기타",
+            "article_ids": article_ids,
+            "item_name": item_name,
+            "law_text": law_text,
+            "review_text": review_text,
+            "no": no,
+            "filename": filename,
+            **metadata  # 건축종류, 건축물용도, 주요구조부 등 추가 메타데이터
+        }
+    
     @staticmethod
     def _extract_law_content(cell) -> tuple[str, List[str]]:
         """법령내용 셀에서 법령 텍스트와 조문 번호 추출"""
@@ -114,14 +316,14 @@ class LawTableParser:
             law_text_parts.append(text)
             
             # 조문 번호 추출 ("제60조", "제61조" 등)
-            article_match = re.search(r'제(\d+)조', text)
+            article_match = ARTICLE_PATTERN.search(text)
             if article_match:
                 article_ids.append(f"제{article_match.group(1)}조")
         
         # tag1, tag2, tag3 (조문 내용)
         for tag in cell.find_all(['div', 'span']):
             classes = tag.get('class', [])
-            if any(c in ['tag1', 'tag2', 'tag3', 'tag4'] for c in classes):
+            if LAW_TEXT_CLASSES.intersection(classes):
                 text = tag.get_text(strip=True)
                 if text:
                     law_text_parts.append(text)
@@ -134,39 +336,11 @@ class LawTableParser:
     def _extract_review_content(cell) -> tuple[str, Dict[str, Any]]:
         """검토내용 셀에서 검토 텍스트와 메타데이터 추출"""
         review_parts = []
-        metadata = {
-            "building_type": None,  # 건축종류
-            "usage": None,  # 건축물용도
-            "owner_type": None,  # 건축주 유형
-            "main_structure": None,  # 주요구조부
-            "building_characteristics": []  # 건물특성
-        }
+        metadata = LawTableParser._empty_review_metadata()
         
         # note1 클래스 (메타데이터: "• 건축종류 : 신축")
         for note1 in cell.find_all(class_='note1'):
-            text = note1.get_text(strip=True)
-            if text.startswith('•'):
-                # 메타데이터 파싱
-                if '건축종류' in text:
-                    match = re.search(r'건축종류\s*:\s*(.+)', text)
-                    if match:
-                        metadata["building_type"] = match.group(1).strip()
-                elif '건축물용도' in text:
-                    match = re.search(r'건축물용도\s*:\s*(.+)', text)
-                    if match:
-                        metadata["usage"] = match.group(1).strip()
-                elif '건축주' in text:
-                    match = re.search(r'건축주\s*:\s*(.+)', text)
-                    if match:
-                        metadata["owner_type"] = match.group(1).strip()
-                elif '주요구조부' in text:
-                    match = re.search(r'주요구조부\s*:\s*(.+)', text)
-                    if match:
-                        metadata["main_structure"] = match.group(1).strip()
-                elif '건물특성' in text:
-                    match = re.search(r'건물특성\s*:\s*(.+)', text)
-                    if match:
-                        metadata["building_characteristics"].append(match.group(1).strip())
+            LawTableParser._apply_review_metadata(note1.get_text(strip=True), metadata)
         
         # note2 클래스 (검토내용: "01.전용주거지역...")
         for note2 in cell.find_all(class_='note2'):
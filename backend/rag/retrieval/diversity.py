@@ -0,0 +1,107 @@
+"""
+MMR(Maximal Marginal Relevance) 기반 컨텍스트 다양성 선택
+
+Q&A JSON에는 같은 답변을 표현만 바꾼 항목이 많아, 검색 상위 결과가 사실상 같은 내용으로
+채워지기 쉽습니다. 관련도가 높으면서 이미 고른 항목과 덜 겹치는 항목을 차례로 골라
+LLM 컨텍스트가 서로 다른 사실을 담고 토큰은 덜 쓰도록 합니다.
+
+유사도는 후보 본문의 문자 n-gram 집합(근사 중복 제거와 같은 shingle) Jaccard 계수로,
+어미/조사만 다른 한국어 표현도 겹침으로 잡습니다. (후보 x n-gram) 이진 행렬의 곱으로 한 번에 계산합니다.
+"""
+from functools import lru_cache
+from typing import Any, Callable, Dict, FrozenSet, List
+
+import numpy as np
+
+from rag.utils.minhash import shingles
+
+
+@lru_cache(maxsize=4096)
+def _shingle_set(text: str, shingle_size: int) -> FrozenSet[str]:
+    """자주 검색되는 항목 본문의 n-gram 집합 재사용"""
+    return frozenset(shingles(text, shingle_size))
+
+
+def jaccard_matrix(texts: List[str], shingle_size: int = 3) -> np.ndarray:
+    """텍스트 간 문자 n-gram 집합 Jaccard 유사도 행렬 (n x n)"""
+    vocabulary: Dict[str, int] = {}
+    rows = []
+    for text in texts:
+        rows.append({vocabulary.setdefault(gram, len(vocabulary)) for gram in _shingle_set(text, shingle_size)})
+
+    incidence = np.zeros((len(texts), max(len(vocabulary), 1)), dtype=np.float32)
+    for i, columns in enumerate(rows):
+        if columns:
+            incidence[i, list(columns)] = 1.0
+    intersection = incidence @ incidence.T
+    sizes = incidence.sum(axis=1)
+    union = sizes[:, None] + sizes[None, :] - intersection
+    return np.divide(intersection, union, out=np.zeros_like(intersection), where=union > 0)
+
+
+def mmr_select(
+    candidates: List[Dict[str, Any]],
+    top_n: int,
+    lambda_: float = 0.6,
+    shingle_size: int = 3,
+    pool_size: int = 20
+) -> List[Dict[str, Any]]:
+    """
+    관련도(score)와 다양성을 함께 고려해 후보 중 top_n개 선택 (선택 순서대로 반환)
+
+    다음 항목 = argmax(lambda_ * 관련도 - (1 - lambda_) * 이미 고른 항목과의 최대 유사도)
+    lambda_가 1이면 관련도 순서 그대로, 작을수록 중복을 강하게 피합니다.
+    후보는 관련도 순서로 정렬되어 있다고 보고 상위 max(pool_size, top_n)개 안에서만 고릅니다.
+    """
+    if len(candidates) <= 1 or top_n <= 1:
+        return candidates[:top_n]
+    candidates = candidates[:max(pool_size, top_n)]
+
+    relevance = np.array([float(c.get("score") or 0.0) for c in candidates], dtype=np.float32)
+    similarity = jaccard_matrix([c.get("content", "") for c in candidates], shingle_size)
+
+    selected = [int(np.argmax(relevance))]
+    max_similarity = similarity[selected[0]].copy()
+    available = np.ones(len(candidates), dtype=bool)
+    available[selected[0]] = False
+
+    while len(selected) < min(top_n, len(candidates)):
+        marginal = lambda_ * relevance - (1.0 - lambda_) * max_similarity
+        marginal[~available] = -np.inf
+        chosen = int(np.argmax(marginal))
+        selected.append(chosen)
+        available[chosen] = False
+        np.maximum(max_similarity, similarity[chosen], out=max_similarity)
+
+    return [candidates[i] for i in selected]
+
+
+def quota_select(
+    candidates: List[Dict[str, Any]],
+    top_n: int,
+    source_of: Callable[[Dict[str, Any]], str]
+) -> List[Dict[str, Any]]:
+    """
+    출처별 할당량을 지키며 점수 순으로 top_n개 선택 (여러 지역 조례 비교 검색용)
+
+    할당량은 ceil(top_n / 출처 수)이며, 결과가 모자란 출처의 남는 자리는 나머지 후보가 점수 순으로 채웁니다.
+    """
+    ranked = sorted(candidates, key=lambda c: float(c.get("score") or 0.0), reverse=True)
+    sources = {source_of(c) for c in ranked}
+    if not sources:
+        return []
+    quota = -(-top_n // len(sources))
+
+    selected = []
+    counts: Dict[str, int] = {}
+    overflow = []
+    for candidate in ranked:
+        source = source_of(candidate)
+        if counts.get(source, 0) < quota and len(selected) < top_n:
+            counts[source] = counts.get(source, 0) + 1
+            selected.append(candidate)
+        else:
+            overflow.append(candidate)
+    selected.extend(overflow[:top_n - len(selected)])
+    selected.sort(key=lambda c: float(c.get("score") or 0.0), reverse=True)
+    return selected
@@ -0,0 +1,159 @@
+"""
+오타/띄어쓰기 변형 허용 용어 확장 (SymSpell 방식 삭제 사전)
+
+색인 어휘의 각 용어에서 최대 편집 거리만큼 글자를 지운 변형을 미리 사전에 넣어 두면,
+쿼리 용어도 같은 방식으로 지운 변형만 조회해 후보를 찾을 수 있습니다.
+후보는 실제 편집 거리(인접 전치 포함)로 다시 확인하므로 조회는 어휘 크기와 무관하게 짧습니다.
+"""
+from collections import defaultdict
+from typing import Dict, Iterable, List, Set, Tuple
+
+
+def edit_distance(a: str, b: str, max_distance: int) -> int:
+    """인접 전치를 포함한 편집 거리 (max_distance 초과면 max_distance + 1)"""
+    if a == b:
+        return 0
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+
+    previous2 = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        row_min = current[0]
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if previous2 is not None and i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                value = min(value, previous2[j - 2] + 1)
+            current[j] = value
+            row_min = min(row_min, value)
+        if row_min > max_distance:
+            return max_distance + 1
+        previous2, previous = previous, current
+    return min(previous[-1], max_distance + 1)
+
+
+def _deletes(term: str, max_distance: int) -> Set[str]:
+    """term에서 글자를 1~max_distance개 지운 변형 집합"""
+    results: Set[str] = set()
+    frontier = {term}
+    for _ in range(max_distance):
+        next_frontier = set()
+        for word in frontier:
+            if len(word) <= 1:
+                continue
+            for i in range(len(word)):
+                variant = word[:i] + word[i + 1:]
+                if variant not in results:
+                    results.add(variant)
+                    next_frontier.add(variant)
+        frontier = next_frontier
+    return results
+
+
+class SymSpellIndex:
+    """
+    어휘 삭제 사전
+
+    Args:
+        max_distance: 허용 최대 편집 거리
+        prefix_length: 삭제 변형을 만들 접두 길이 (긴 용어의 사전 크기 제한)
+        min_length: 이보다 짧은 쿼리 용어는 확장하지 않음 (2글자 한국어 용어는 오타 후보가 너무 많음)
+    """
+
+    def __init__(self, max_distance: int = 1, prefix_length: int = 7, min_length: int = 3):
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+        self.min_length = min_length
+        self.vocabulary: Set[str] = set()
+        self._deletes: Dict[str, List[str]] = defaultdict(list)
+
+    def __len__(self) -> int:
+        return len(self.vocabulary)
+
+    def __contains__(self, term: str) -> bool:
+        return term in self.vocabulary
+
+    def add(self, term: str):
+        if not term or term in self.vocabulary:
+            return
+        self.vocabulary.add(term)
+        prefix = term[:self.prefix_length]
+        if prefix != term:
+            self._deletes[prefix].append(term)
+        for variant in _deletes(prefix, self.max_distance):
+            self._deletes[variant].append(term)
+
+    def update(self, terms: Iterable[str]):
+        for term in terms:
+            self.add(term)
+
+    def _allowed_distance(self, term: str) -> int:
+        if len(term) < self.min_length:
+            return 0
+        return min(self.max_distance, 1 if len(term) < 6 else 2)
+
+    def lookup(self, term: str) -> List[Tuple[str, int]]:
+        """term과 편집 거리 이내인 어휘 용어 [(용어, 거리)] (거리, 용어 순, term 자신 제외)"""
+        max_distance = self._allowed_distance(term)
+        if max_distance == 0:
+            return []
+
+        prefix = term[:self.prefix_length]
+        candidates: Set[str] = set()
+        for key in {prefix} | _deletes(prefix, max_distance):
+            if key in self.vocabulary:
+                candidates.add(key)
+            candidates.update(self._deletes.get(key, ()))
+        candidates.discard(term)
+
+        matches = []
+        for candidate in candidates:
+            distance = edit_distance(term, candidate, max_distance)
+            if distance <= max_distance:
+                matches.append((candidate, distance))
+        matches.sort(key=lambda x: (x[1], x[0]))
+        return matches
+
+    def expand_word(self, word: str, previous: str = None, max_per_term: int = 3) -> List[Tuple[str, int]]:
+        """
+        쿼리 용어 하나와 그 변형 [(용어, 거리)] (원래 용어가 거리 0으로 맨 앞)
+
+        - 대소문자만 다른 용어: 소문자 어휘 용어 (거리 0)
+        - 어휘에 없는 용어: 편집 거리 이내 용어 (가까운 순 max_per_term개)
+        - 어휘에 없는 용어: 둘로 나눠 양쪽이 모두 어휘에 있으면 두 용어 (띄어쓰기 누락, 거리 1)
+        - 바로 앞 용어(previous)와 붙인 용어가 어휘에 있으면 그 용어 (띄어쓰기 추가, 거리 1)
+        """
+        terms = [(word, 0)]
+        lower = word.lower()
+        if lower in self.vocabulary:
+            if lower != word:
+                terms.append((lower, 0))
+        else:
+            terms.extend(self.lookup(lower)[:max_per_term])
+            for i in range(1, len(lower)):
+                left, right = lower[:i], lower[i:]
+                if left in self.vocabulary and right in self.vocabulary:
+                    terms.append((left, 1))
+                    terms.append((right, 1))
+        if previous is not None and previous.lower() + lower in self.vocabulary:
+            terms.append((previous.lower() + lower, 1))
+        return terms
+
+    def expand(self, words: List[str], max_per_term: int = 3) -> List[Tuple[str, int]]:
+        """
+        쿼리 용어 목록을 확장 용어를 포함한 목록 [(용어, 거리)]으로 변환 (중복 제거)
+
+        확장 용어는 원래 용어 바로 뒤에 놓여, 조기 종료가 있는 검색에서도 원래 위치에서 반영됩니다.
+        """
+        terms: List[Tuple[str, int]] = []
+        seen: Set[str] = set()
+        previous = None
+        for word in words:
+            for term, distance in self.expand_word(word, previous, max_per_term):
+                if term not in seen:
+                    seen.add(term)
+                    terms.append((term, distance))
+            previous = word
+        return terms
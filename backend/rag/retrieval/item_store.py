@@ -0,0 +1,105 @@
+"""
+JSON 항목 압축 저장소
+
+항목마다 dict를 유지하지 않고, 출력에 필요한 필드만 하나의 UTF-8 blob에 이어 붙인 뒤
+(항목, 필드)별 시작 오프셋/길이 배열로 접근합니다. 검색 결과 본문(content)은 색인 시점에
+한 번 포맷팅해 인코딩해 두므로, 최종 top-k 항목은 blob 조각 디코딩만으로 복원됩니다.
+"""
+from array import array
+from typing import Any, Dict, Iterable, List
+
+# 저장 필드 (고정 스키마, 순서가 오프셋 배열의 열 순서)
+FIELDS = ("id", "category", "content")
+_FIELD_INDEX = {name: i for i, name in enumerate(FIELDS)}
+
+# 항목 플래그 (원본 dict의 키 존재 여부 등 텍스트로 표현되지 않는 정보)
+HAS_QUESTION = 1
+HAS_TITLE = 2
+INT_ID = 4
+REMOVED = 128
+
+
+def _text(value: Any) -> str:
+    return "" if value is None else str(value)
+
+
+class ItemStore:
+    """열 지향 항목 저장소 (추가/조회/삭제 표시만 지원, 삭제된 공간은 인덱스 재생성 시 회수)"""
+
+    def __init__(self):
+        self._blob = bytearray()
+        self._starts = array('Q')   # item_id * len(FIELDS) + field -> blob 시작 위치
+        self._lengths = array('I')  # 같은 위치의 바이트 길이
+        self._flags = bytearray()
+        self._live = 0
+
+    def __len__(self) -> int:
+        return self._live
+
+    def add(self, item: Dict[str, Any], content: str) -> int:
+        """항목과 미리 포맷팅한 본문을 저장하고 item_id 반환"""
+        flags = 0
+        if "question" in item:
+            flags |= HAS_QUESTION
+        if "title" in item:
+            flags |= HAS_TITLE
+
+        item_id_value = item.get("id", "")
+        if isinstance(item_id_value, int) and not isinstance(item_id_value, bool):
+            flags |= INT_ID
+
+        values = (
+            _text(item_id_value),
+            _text(item.get("category", "")),
+            content,
+        )
+        for value in values:
+            encoded = value.encode('utf-8')
+            self._starts.append(len(self._blob))
+            self._lengths.append(len(encoded))
+            self._blob += encoded
+
+        self._flags.append(flags)
+        self._live += 1
+        return len(self._flags) - 1
+
+    def get(self, item_id: int, field: str) -> str:
+        """항목의 필드 텍스트 (없는 필드는 빈 문자열)"""
+        pos = item_id * len(FIELDS) + _FIELD_INDEX[field]
+        start = self._starts[pos]
+        return self._blob[start:start + self._lengths[pos]].decode('utf-8')
+
+    def get_id(self, item_id: int) -> Any:
+        """원본 JSON의 id 값 (정수 id는 정수로 복원)"""
+        value = self.get(item_id, "id")
+        return int(value) if self._flags[item_id] & INT_ID else value
+
+    def has(self, item_id: int, flag: int) -> bool:
+        return bool(self._flags[item_id] & flag)
+
+    def is_live(self, item_id: int) -> bool:
+        return not self._flags[item_id] & REMOVED
+
+    def remove(self, item_ids: Iterable[int]):
+        """항목을 삭제 표시 (blob 공간은 재사용하지 않음)"""
+        for item_id in item_ids:
+            if not self._flags[item_id] & REMOVED:
+                self._flags[item_id] |= REMOVED
+                self._live -= 1
+
+    def materialize(self, item_id: int) -> Dict[str, Any]:
+        """저장된 필드를 dict로 복원 (디버깅/평가용)"""
+        return {field: self.get(item_id, field) for field in FIELDS}
+
+    def nbytes(self) -> int:
+        """blob과 오프셋 배열이 차지하는 바이트 수"""
+        return (
+            len(self._blob)
+            + self._starts.itemsize * len(self._starts)
+            + self._lengths.itemsize * len(self._lengths)
+            + len(self._flags)
+        )
+
+    def ids(self) -> List[int]:
+        """삭제되지 않은 item_id 목록"""
+        return [i for i, flags in enumerate(self._flags) if not flags & REMOVED]
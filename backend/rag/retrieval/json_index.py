@@ -1,36 +1,246 @@
 """
 JSON 파일을 위한 빠른 키워드 검색 인덱스
+
+항목 본문은 색인 시점에 결과 형식으로 포맷팅해 ItemStore(하나의 UTF-8 blob + 오프셋 배열)에
+보관하고, 색인과 검색은 정수 item_id와 점수만 다룹니다. 결과 텍스트는 최종 top-k만 복원합니다.
+색인은 폴더(건물 유형/지역)별 샤드로 나뉘어, 필터 검색은 해당 샤드의 postings만 읽습니다.
 """
+import functools
+import heapq
 import json
+import re
+from array import array
+from bisect import bisect_left, bisect_right
 from typing import List, Dict, Any, Optional
 from pathlib import Path
 from collections import defaultdict
+from operator import itemgetter
 import logging
 
+from rag.retrieval.item_store import ItemStore, HAS_QUESTION, HAS_TITLE
+from rag.utils.rwlock import ReadWriteLock
+
 logger = logging.getLogger(__name__)
 
+_SEPARATOR = "\x00"
+
+# 패싯 필터/집계 대상 필드
+FACET_FIELDS = ("category", "regulation_type", "jurisdiction")
+
+# 근사 중복 판정에서 같아야 하는 값: 숫자(조문 번호, 종별, 비율, 면적 등)와 용도지역
+_NUMBER = re.compile(r'\d+(?:\.\d+)?')
+ZONING_TERMS = (
+    "전용주거지역", "일반주거지역", "준주거지역", "중심상업지역", "일반상업지역", "근린상업지역",
+    "유통상업지역", "전용공업지역", "일반공업지역", "준공업지역", "보전녹지지역", "생산녹지지역",
+    "자연녹지지역", "보전관리지역", "생산관리지역", "계획관리지역", "농림지역", "자연환경보전지역",
+)
+
+
+def _facet_values(value: Any) -> List[str]:
+    """패싯 값 정규화 (목록이면 각 원소, 공백 제거 + 소문자)"""
+    values = value if isinstance(value, (list, tuple, set)) else [value]
+    normalized = []
+    for v in values:
+        if v is None:
+            continue
+        text = str(v).strip().lower()
+        if text:
+            normalized.append(text)
+    return normalized
+
+
+class _FileQuestions:
+    """
+    파일 하나의 소문자 질문을 구분자로 이어 붙인 문자열 (정확한 질문 매칭용)
+
+    항목마다 질문 문자열을 두지 않고, str.find로 쿼리를 포함하는 질문을 찾고
+    길이 정렬 목록으로 쿼리에 포함될 수 있는 짧은 질문만 확인합니다.
+    """
+
+    def __init__(self, questions: List[str]):
+        self.text = _SEPARATOR.join(questions)
+        self.starts = array('I')
+        self.lengths = array('I')
+        pos = 0
+        for question in questions:
+            self.starts.append(pos)
+            self.lengths.append(len(question))
+            pos += len(question) + 1
+        self.by_length = sorted(range(len(questions)), key=self.lengths.__getitem__)
+        self.sorted_lengths = [self.lengths[i] for i in self.by_length]
+
+    def matches(self, query_lower: str) -> List[int]:
+        """query in question 또는 question in query인 항목의 파일 내 위치 (오름차순)"""
+        if not query_lower:
+            return list(range(len(self.starts)))
+        found = set()
+        
+        # 쿼리를 포함하는 질문
+        text = self.text
+        pos = text.find(query_lower)
+        while pos != -1:
+            local = bisect_right(self.starts, pos) - 1
+            found.add(local)
+            if local + 1 >= len(self.starts):
+                break
+            pos = text.find(query_lower, self.starts[local + 1])
+        
+        # 쿼리에 포함되는 (쿼리보다 짧거나 같은) 질문
+        for local in self.by_length[:bisect_right(self.sorted_lengths, len(query_lower))]:
+            start = self.starts[local]
+            if text[start:start + self.lengths[local]] in query_lower:
+                found.add(local)
+        return sorted(found)
+
+
+class _Shard:
+    """
+    폴더 하나의 색인
+
+    postings는 item_id 오름차순(적재 순서)으로 쌓이므로, 여러 샤드를 item_id 기준으로
+    병합하면 전역 postings를 순서대로 읽은 것과 같습니다.
+    """
+
+    def __init__(self):
+        # 파일별 항목 목록: {filename: array(item_id)}
+        self.files: Dict[str, array] = {}
+        
+        # 파일별 정확한 질문 매칭용 질문 문자열: {filename: _FileQuestions}
+        self.questions: Dict[str, _FileQuestions] = {}
+        
+        # 키워드 인덱스: {keyword: [(item_id, score)]}
+        self.keyword_index: Dict[str, List[tuple]] = defaultdict(list)
+        
+        # 패싯 인덱스: {field: {value: [item_id]}} (category / regulation_type / jurisdiction)
+        self.facet_index: Dict[str, Dict[str, List[int]]] = {field: defaultdict(list) for field in FACET_FIELDS}
+        
+        # 질문 인덱스: {question_keyword: [item_id]}
+        self.question_index: Dict[str, List[int]] = defaultdict(list)
+        
+        # 패싯 비트셋/집계 캐시 (샤드 내용이 바뀌면 초기화)
+        self._facet_bits: Dict[tuple, int] = {}
+        self._facet_counts: Optional[Dict[str, Dict[str, int]]] = None
+    
+    @property
+    def category_index(self) -> Dict[str, List[int]]:
+        return self.facet_index["category"]
+    
+    def invalidate(self):
+        self._facet_bits.clear()
+        self._facet_counts = None
+    
+    def facet_bits(self, field: str, value: str) -> int:
+        """패싯 값에 속한 item_id 비트셋 (bit i = item_id i)"""
+        key = (field, value)
+        bits = self._facet_bits.get(key)
+        if bits is None:
+            item_ids = self.facet_index[field].get(value, ())
+            bitmap = bytearray((max(item_ids) >> 3) + 1 if item_ids else 0)
+            for item_id in item_ids:
+                bitmap[item_id >> 3] |= 1 << (item_id & 7)
+            bits = self._facet_bits[key] = int.from_bytes(bitmap, 'little')
+        return bits
+    
+    def facet_counts(self) -> Dict[str, Dict[str, int]]:
+        """필드별 값 -> 항목 수 (색인 변경 전까지 캐시)"""
+        if self._facet_counts is None:
+            self._facet_counts = {
+                field: {value: len(item_ids) for value, item_ids in self.facet_index[field].items()}
+                for field in FACET_FIELDS
+            }
+        return self._facet_counts
+
+
+def _reading(method):
+    """색인을 읽는 메서드 (재인덱싱과 동시에 실행되지 않도록 읽기 잠금)"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock.read():
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+def _writing(method):
+    """색인을 바꾸는 메서드 (검색이 끝날 때까지 기다린 뒤 단독 실행)"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock.write():
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+def _merge_postings(lists: List[list], key=None):
+    """샤드별 postings를 item_id 순서로 병합 (샤드가 하나면 그대로 반환)"""
+    if not lists:
+        return ()
+    if len(lists) == 1:
+        return lists[0]
+    return heapq.merge(*lists, key=key)
+
 
 class JSONIndex:
     """JSON 파일을 키워드 기반으로 빠르게 검색하는 인덱스"""
     
-    def __init__(self):
-        # 폴더별 JSON 데이터 저장
-        # {folder_name: {filename: [items]}}
-        self.json_data: Dict[str, Dict[str, List[Dict[str, Any]]]] = defaultdict(dict)
+    # 기본 점수 가중치 (정확한 질문 매칭 > 질문 단어 > 키워드 > 답변 단어)
+    # fuzzy: 오타/띄어쓰기 확장 용어의 편집 거리 1당 점수 배율, synonym: 동의어 확장 용어의 점수 배율
+    DEFAULT_WEIGHTS = {
+        "exact": 5.0,
+        "question": 2.0,
+        "keyword": 1.0,
+        "answer": 0.5,
+        "fuzzy": 0.5,
+        "synonym": 0.7,
+    }
+    
+    def __init__(
+        self,
+        weights: Optional[Dict[str, float]] = None,
+        dedup_threshold: Optional[float] = None,
+        fuzzy_max_distance: int = 0
+    ):
+        # 검색(이벤트 루프/스레드 풀)과 재인덱싱(작업 스레드)의 동시 접근 조정
+        self._lock = ReadWriteLock()
         
-        # 키워드 인덱스: {keyword: [(folder, filename, item_index, score)]}
-        self.keyword_index: Dict[str, List[tuple]] = defaultdict(list)
+        # 점수 가중치 (평가 도구에서 조정 가능)
+        self.weights = {**self.DEFAULT_WEIGHTS, **(weights or {})}
+        
+        # 오타 허용 용어 확장 (0이면 기본적으로 사용 안 함, 삭제 사전은 첫 사용 시 생성)
+        self.fuzzy_max_distance = fuzzy_max_distance
+        self._fuzzy = None
+        
+        # 동의어/별칭 사전 (load_synonyms로 설정, 없으면 확장 안 함)
+        self.synonyms = None
+        
+        # 항목 근사 중복 제거 (같은 폴더 안에서 질문+답변 MinHash 유사도가 임계값 이상이면 한 번만 색인)
+        self.dedup = None
+        self.skipped_duplicates = 0
+        self.kept_variants = 0  # 근사 중복이지만 숫자/용도지역이 달라 유지한 항목 수
+        if dedup_threshold:
+            from rag.utils.minhash import MinHashLSH
+            self.dedup = MinHashLSH(threshold=dedup_threshold)
         
-        # 카테고리 인덱스: {category: [(folder, filename, item_index)]}
-        self.category_index: Dict[str, List[tuple]] = defaultdict(list)
+        # 항목 본문 저장소 (item_id -> 필드 텍스트)
+        self.items = ItemStore()
         
-        # 질문 인덱스: {question_keyword: [(folder, filename, item_index)]}
-        self.question_index: Dict[str, List[tuple]] = defaultdict(list)
+        # 폴더별 색인 샤드 (적재 순서 유지): {folder_name: _Shard}
+        self.shards: Dict[str, _Shard] = {}
+        
+        # item_id -> 파일 번호 -> (폴더, 파일명)
+        self._file_keys: List[tuple] = []
+        self._file_sources: List[str] = []  # 파일 번호 -> 결과 metadata의 source
+        self.item_file = array('I')
+    
+    def _shards_for(self, folders: List[str]) -> List[_Shard]:
+        """검색 대상 샤드 (적재 순서, 없는 폴더는 제외, 빈 목록이면 전체)"""
+        if not folders:
+            return list(self.shards.values())
+        return [shard for folder, shard in self.shards.items() if folder in folders]
     
+    @_writing
     def load_json_file(self, file_path: Path, folder: str = ""):
         """JSON 파일을 로드하고 인덱싱"""
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
+            with open(file_path, "r", encoding="utf-8-sig") as f:
                 data = json.load(f)
             
             if not isinstance(data, list):
@@ -38,27 +248,40 @@ class JSONIndex:
             
             filename = file_path.name
             
-            # JSON 데이터 저장
-            if folder not in self.json_data:
-                self.json_data[folder] = {}
-            self.json_data[folder][filename] = data
+            # 근사 중복 항목 제외
+            if self.dedup is not None:
+                data = self._drop_near_duplicates(data, folder, filename)
+            
+            shard = self.shards.get(folder)
+            if shard is None:
+                shard = self.shards[folder] = _Shard()
+            file_id = len(self._file_keys)
+            self._file_keys.append((folder, filename))
+            self._file_sources.append(f"{folder}/{filename}" if folder else filename)
+            item_ids = array('I')
+            questions = []
             
-            # 인덱싱
-            for idx, item in enumerate(data):
+            # 인덱싱 (본문은 저장소에 넣고 색인에는 item_id만 기록)
+            for item in data:
                 if not isinstance(item, dict):
                     continue
                 
+                item_id = self.items.add(item, self.format_item(item))
+                item_ids.append(item_id)
+                self.item_file.append(file_id)
+                questions.append(str(item.get("question", "")).lower())
+                
                 # 키워드 인덱싱
                 keywords = item.get("keywords", [])
                 if isinstance(keywords, list):
                     for keyword in keywords:
                         if keyword:
-                            self.keyword_index[keyword.lower()].append((folder, filename, idx, 1.0))
+                            shard.keyword_index[keyword.lower()].append((item_id, self.weights["keyword"]))
                 
-                # 카테고리 인덱싱
-                category = item.get("category", "")
-                if category:
-                    self.category_index[category.lower()].append((folder, filename, idx))
+                # 패싯 인덱싱 (카테고리 / 규정 유형 / 관할)
+                for field in FACET_FIELDS:
+                    for value in _facet_values(item.get(field)):
+                        shard.facet_index[field][value].append(item_id)
                 
                 # 질문 인덱싱 (질문의 주요 단어 추출)
                 question = item.get("question", "")
@@ -67,7 +290,7 @@ class JSONIndex:
                     question_words = self._extract_keywords(question)
                     for word in question_words:
                         if len(word) > 1:  # 1글자 단어 제외
-                            self.question_index[word.lower()].append((folder, filename, idx))
+                            shard.question_index[word.lower()].append(item_id)
                 
                 # 답변 내용도 인덱싱
                 answer = item.get("answer", "")
@@ -75,14 +298,110 @@ class JSONIndex:
                     answer_words = self._extract_keywords(answer)
                     for word in answer_words:
                         if len(word) > 1:
-                            self.keyword_index[word.lower()].append((folder, filename, idx, 0.5))  # 낮은 점수
+                            shard.keyword_index[word.lower()].append((item_id, self.weights["answer"]))  # 낮은 점수
+            
+            shard.files[filename] = item_ids
+            shard.questions[filename] = _FileQuestions(questions)
+            shard.invalidate()
+            if self._fuzzy is not None:
+                self._fuzzy.update(shard.keyword_index.keys())
+                self._fuzzy.update(shard.question_index.keys())
             
-            logger.info(f"JSON 파일 인덱싱 완료: {folder}/{filename} ({len(data)}개 항목)")
+            logger.info(f"JSON 파일 인덱싱 완료: {folder}/{filename} ({len(item_ids)}개 항목)")
             return True
         except Exception as e:
             logger.error(f"JSON 파일 로드 실패: {file_path}, {str(e)}")
             return False
     
+    @staticmethod
+    def _dedup_text(item: Dict[str, Any]) -> str:
+        """근사 중복 판정용 텍스트 (질문/제목 + 답변)"""
+        return f"{item.get('question') or item.get('title') or ''}\n{item.get('answer', '')}"
+    
+    @staticmethod
+    def _dedup_fingerprint(text: str) -> tuple:
+        """법적 의미를 가르는 값 (숫자 - 조문/층수/비율 포함, 용도지역) - 다르면 중복으로 보지 않음"""
+        numbers = tuple(sorted(set(_NUMBER.findall(text))))
+        compact = text.replace(" ", "")
+        zones = tuple(zone for zone in ZONING_TERMS if zone in compact)
+        return numbers, zones
+    
+    def _drop_near_duplicates(self, data: List[Any], folder: str, filename: str) -> List[Any]:
+        """
+        같은 폴더에 이미 색인된 항목과 근사 중복인 항목 제거
+        
+        본문이 거의 같아도 숫자/용도지역이 다른 항목(예: 제1종/제2종 일반주거지역 건폐율)은
+        서로 다른 규정이므로 제거하지 않고 로그로만 알립니다.
+        """
+        kept = []
+        for item in data:
+            if isinstance(item, dict):
+                text = self._dedup_text(item)
+                signature = self.dedup.hasher.signature(text)
+                if signature is not None:
+                    fingerprint = self._dedup_fingerprint(text)
+                    similar = self.dedup.find_similar(folder, signature)
+                    duplicate_of = next((key for key in similar if self.dedup.fingerprint(key) == fingerprint), None)
+                    if duplicate_of is not None:
+                        self.skipped_duplicates += 1
+                        logger.debug(f"근사 중복 항목 제외: {folder}/{filename} {item.get('id', '')} ≈ {duplicate_of}")
+                        continue
+                    if similar:
+                        self.kept_variants += 1
+                        logger.info(
+                            f"근사 중복이지만 수치/용도지역이 달라 유지: {folder}/{filename} {item.get('id', '')} ≈ {similar[0]}"
+                        )
+                    self.dedup.insert(folder, (folder, filename, len(kept)), signature, fingerprint)
+            kept.append(item)
+        if len(kept) < len(data):
+            logger.info(f"근사 중복 항목 {len(data) - len(kept)}개 제외: {folder}/{filename}")
+        return kept
+    
+    @_writing
+    def remove_file(self, folder: str, filename: str) -> bool:
+        """
+        파일 하나의 항목과 색인 제거 (변경된 파일 재색인 전 호출)
+        
+        이 파일과 중복이라 제외되었던 다른 파일의 항목은 복원되지 않으므로,
+        전체 정합성이 필요하면 인덱스를 다시 만듭니다.
+        """
+        shard = self.shards.get(folder)
+        if shard is None or filename not in shard.files:
+            return False
+        removed = set(shard.files.pop(filename))
+        del shard.questions[filename]
+        
+        # 같은 폴더 샤드의 postings만 정리
+        for word in list(shard.keyword_index.keys()):
+            postings = [entry for entry in shard.keyword_index[word] if entry[0] not in removed]
+            if postings:
+                shard.keyword_index[word] = postings
+            else:
+                del shard.keyword_index[word]
+        for index in (shard.question_index, *shard.facet_index.values()):
+            for word in list(index.keys()):
+                postings = [item_id for item_id in index[word] if item_id not in removed]
+                if postings:
+                    index[word] = postings
+                else:
+                    del index[word]
+        self.items.remove(removed)
+        shard.invalidate()
+        
+        if self.dedup is not None:
+            self.dedup.remove({key for key in self.dedup.keys() if key[0] == folder and key[1] == filename})
+        return True
+    
+    def writing(self):
+        """여러 변경을 묶어 단독 실행하는 쓰기 잠금 (with 문)"""
+        return self._lock.write()
+    
+    @_writing
+    def replace_file(self, file_path: Path, folder: str = "") -> bool:
+        """파일 하나를 제거 후 다시 적재 (검색에는 이전 내용이나 새 내용만 보임)"""
+        self.remove_file(folder, Path(file_path).name)
+        return self.load_json_file(Path(file_path), folder)
+    
     def _extract_keywords(self, text: str) -> List[str]:
         """텍스트에서 키워드 추출 (간단한 버전)"""
         # 한글, 영문, 숫자만 추출
@@ -91,20 +410,168 @@ class JSONIndex:
         words = re.findall(r'[가-힣a-zA-Z0-9]+', text)
         return words
     
+    def build_fuzzy(self):
+        """전체 어휘로 오타 허용 삭제 사전 생성 (이후 적재되는 파일의 어휘는 자동 추가)"""
+        from rag.retrieval.fuzzy import SymSpellIndex
+        
+        fuzzy = SymSpellIndex(max_distance=max(self.fuzzy_max_distance, 1))
+        for shard in self.shards.values():
+            fuzzy.update(shard.keyword_index.keys())
+            fuzzy.update(shard.question_index.keys())
+        self._fuzzy = fuzzy
+        logger.info(f"오타 허용 사전 생성 완료: 어휘 {len(fuzzy)}개")
+        return fuzzy
+    
+    @_writing
+    def load_synonyms(self, path: Path) -> bool:
+        """동의어 사전 파일 로드 (파일이 없거나 잘못되면 동의어 확장을 끔)"""
+        from rag.retrieval.synonyms import load_synonyms
+        
+        self.synonyms = load_synonyms(path, self._extract_keywords)
+        return self.synonyms is not None
+    
+    def _expand_terms(self, query_words: List[str], use_fuzzy: bool) -> tuple:
+        """
+        오타/띄어쓰기/대소문자 변형과 동의어를 포함한 검색 용어
+        
+        Returns:
+            ([(용어, 점수 배율)], [(구문 토큰 튜플, 점수 배율)])
+            각 쿼리 용어 바로 뒤에 그 용어의 변형과, 그 용어에서 끝나는 사전 용어의 한 토큰 동의어가 놓입니다.
+            여러 토큰 동의어는 구문으로 따로 반환합니다.
+        """
+        fuzzy = (self._fuzzy or self.build_fuzzy()) if use_fuzzy else None
+        synonyms = self.synonyms.expansions(query_words) if self.synonyms is not None else {}
+        
+        terms = []
+        phrases = []
+        seen = set()
+        
+        def _add(term: str, factor: float):
+            if term not in seen:
+                seen.add(term)
+                terms.append((term, factor))
+        
+        previous = None
+        for i, word in enumerate(query_words):
+            if fuzzy is not None:
+                for term, distance in fuzzy.expand_word(word, previous):
+                    _add(term, self.weights["fuzzy"] ** distance)
+            else:
+                _add(word, 1.0)
+            for alias in synonyms.get(i, ()):
+                if len(alias) == 1:
+                    _add(alias[0], self.weights["synonym"])
+                else:
+                    phrases.append((alias, self.weights["synonym"]))
+            previous = word
+        return terms, phrases
+    
+    def _phrase_items(self, tokens: tuple, shards: List[_Shard], mask: Optional[bytes]) -> List[tuple]:
+        """
+        구문(연속 토큰)이 있는 항목 [(item_id, 질문/제목에 있는지)]
+        
+        모든 토큰의 postings가 겹치는 항목과 붙여 쓴 구문 토큰이 있는 항목만 본문에서 구문을 확인합니다.
+        """
+        def _ids(token: str) -> set:
+            ids = set()
+            for shard in shards:
+                ids.update(item_id for item_id, _ in shard.keyword_index.get(token, ()))
+                ids.update(shard.question_index.get(token, ()))
+            return ids
+        
+        candidates = None
+        for token in sorted(tokens, key=lambda t: sum(len(shard.keyword_index.get(t, ())) for shard in shards)):
+            candidates = _ids(token) if candidates is None else candidates & _ids(token)
+            if not candidates:
+                break
+        spaced, joined = " ".join(tokens), "".join(tokens)
+        candidates = (candidates or set()) | _ids(joined)
+        
+        found = []
+        for item_id in sorted(candidates):
+            if mask is not None and not mask[item_id >> 3] >> (item_id & 7) & 1:
+                continue
+            content = self.items.get(item_id, "content").lower()
+            if spaced in content or joined in content:
+                head = content.split("\n", 1)[0]
+                found.append((item_id, spaced in head or joined in head))
+        return found
+    
+    @_reading
     def search(
         self, 
         query: str, 
         folder_filter: Optional[str] = None,
         region_filter: Optional[str] = None,
-        top_k: int = 5
+        top_k: int = 5,
+        facets: Optional[Dict[str, List[str]]] = None,
+        fuzzy: Optional[bool] = None
     ) -> List[Dict[str, Any]]:
-        """키워드 기반 빠른 검색 (지역 + 건물 타입 조합 지원)"""
-        query_lower = query.lower()
-        query_words = self._extract_keywords(query)
+        """
+        키워드 기반 빠른 검색 (지역 + 건물 타입 조합 지원)
+        
+        facets: {"category" | "regulation_type" | "jurisdiction": [값, ...]} 패싯 필터
+                (같은 필드 안의 값은 OR, 필드끼리는 AND)
+        fuzzy: 오타/띄어쓰기 변형 확장 사용 여부 (None이면 fuzzy_max_distance > 0일 때 사용)
+        """
+        shards, mask = self._search_scope(folder_filter, region_filter, facets)
+        if mask is not None and not any(mask):
+            return []
+        return self._search_shards(query, shards, mask, top_k, fuzzy)
+    
+    @_reading
+    def search_batch(
+        self,
+        queries: List[str],
+        folder_filter: Optional[str] = None,
+        region_filter: Optional[str] = None,
+        top_k: int = 5,
+        facets: Optional[Dict[str, List[str]]] = None,
+        fuzzy: Optional[bool] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        같은 폴더/지역/패싯 조건의 여러 쿼리를 한 번에 검색 (쿼리별 결과는 search와 같음)
+        
+        샤드 선택과 패싯 비트맵(전체 item_id 크기)은 쿼리마다 만들지 않고 배치에서 한 번만 만듭니다.
+        점수 계산은 쿼리별로 search와 같은 루프를 돌며, 여러 쿼리를 한 번에 벡터화하지는 않습니다.
+        """
+        shards, mask = self._search_scope(folder_filter, region_filter, facets)
+        if mask is not None and not any(mask):
+            return [[] for _ in queries]
+        return [self._search_shards(query, shards, mask, top_k, fuzzy) for query in queries]
+    
+    def search_sources(
+        self,
+        query: str,
+        sources: List[str],
+        top_k: int = 5,
+        facets: Optional[Dict[str, List[str]]] = None,
+        fuzzy: Optional[bool] = None,
+        executor=None
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        여러 폴더(건물 유형/지역)를 폴더별로 따로 검색 (점수는 폴더 안에서 정규화, 출처별 할당량 병합용)
         
-        # 점수 계산: {item_key: score}
-        item_scores: Dict[tuple, float] = defaultdict(float)
+        executor(concurrent.futures.Executor)가 있으면 폴더별 검색을 나누어 실행합니다.
+        """
+        sources = [source for source in dict.fromkeys(sources) if source]
         
+        def _search_source(source: str) -> List[Dict[str, Any]]:
+            return self.search(query, folder_filter=source, top_k=top_k, facets=facets, fuzzy=fuzzy)
+        
+        if executor is None or len(sources) <= 1:
+            results = [_search_source(source) for source in sources]
+        else:
+            results = list(executor.map(_search_source, sources))
+        return dict(zip(sources, results))
+    
+    def _search_scope(
+        self,
+        folder_filter: Optional[str],
+        region_filter: Optional[str],
+        facets: Optional[Dict[str, List[str]]]
+    ) -> tuple:
+        """검색 대상 샤드와 패싯 필터 비트맵 (필터가 없으면 None)"""
         # 검색할 폴더 목록 결정
         # region이 있으면: region 폴더 + folder 폴더 모두 검색
         # region이 없으면: folder 폴더만 검색
@@ -113,46 +580,79 @@ class JSONIndex:
             search_folders.append(folder_filter)
         if region_filter:
             search_folders.append(region_filter)  # region 폴더도 검색 대상에 추가
+        shards = self._shards_for(search_folders)
+        return shards, self._facet_mask(shards, facets)
+    
+    def _search_shards(
+        self,
+        query: str,
+        shards: List[_Shard],
+        mask: Optional[bytes],
+        top_k: int,
+        fuzzy: Optional[bool]
+    ) -> List[Dict[str, Any]]:
+        """정해진 샤드/패싯 비트맵 안에서 쿼리 하나 검색"""
+        query_lower = query.lower()
+        query_words = self._extract_keywords(query)
+        
+        # 검색 용어 (원래 용어는 배율 1.0, 오타/동의어 확장 용어는 낮은 배율로 원래 용어 바로 뒤에 배치)
+        use_fuzzy = self.fuzzy_max_distance > 0 if fuzzy is None else fuzzy
+        phrases = []
+        if use_fuzzy or self.synonyms is not None:
+            terms, phrases = self._expand_terms(query_words, use_fuzzy)
+        else:
+            terms = [(word, 1.0) for word in query_words]
+        
+        # 점수 계산: {item_id: score}
+        item_scores: Dict[int, float] = defaultdict(float)
         
         # 키워드 매칭 (최적화: 상위 결과가 충분하면 조기 종료)
-        for word in query_words:
-            if word in self.keyword_index:
-                for folder, filename, idx, score in self.keyword_index[word]:
-                    if search_folders and folder not in search_folders:
-                        continue
-                    item_scores[(folder, filename, idx)] += score
-                    # 충분한 결과가 있으면 조기 종료
-                    if len(item_scores) >= top_k * 3:
-                        break
+        for word, factor in terms:
+            postings = _merge_postings([shard.keyword_index[word] for shard in shards if word in shard.keyword_index], key=itemgetter(0))
+            for item_id, score in postings:
+                if mask is not None and not mask[item_id >> 3] >> (item_id & 7) & 1:
+                    continue
+                item_scores[item_id] += score * factor
+                # 충분한 결과가 있으면 조기 종료
                 if len(item_scores) >= top_k * 3:
                     break
+            if len(item_scores) >= top_k * 3:
+                break
         
         # 질문 매칭 (더 높은 가중치, 최적화)
-        for word in query_words:
-            if word in self.question_index:
-                for folder, filename, idx in self.question_index[word]:
-                    if search_folders and folder not in search_folders:
-                        continue
-                    item_scores[(folder, filename, idx)] += 2.0
-                    if len(item_scores) >= top_k * 3:
-                        break
+        for word, factor in terms:
+            postings = _merge_postings([shard.question_index[word] for shard in shards if word in shard.question_index])
+            for item_id in postings:
+                if mask is not None and not mask[item_id >> 3] >> (item_id & 7) & 1:
+                    continue
+                item_scores[item_id] += self.weights["question"] * factor
                 if len(item_scores) >= top_k * 3:
                     break
+            if len(item_scores) >= top_k * 3:
+                break
+        
+        # 여러 토큰 동의어는 구문 단위로 한 번만 점수 반영 (질문/제목에 있으면 질문 가중치, 본문이면 답변 가중치)
+        for tokens, factor in phrases:
+            for item_id, in_question in self._phrase_items(tokens, shards, mask):
+                item_scores[item_id] += self.weights["question" if in_question else "answer"] * factor
+                if len(item_scores) >= top_k * 3:
+                    break
+            if len(item_scores) >= top_k * 3:
+                break
         
         # 정확한 질문 매칭 (최적화: 매칭되면 즉시 반환)
         exact_match_found = False
-        for folder, file_data in self.json_data.items():
-            if search_folders and folder not in search_folders:
-                continue
-            for filename, items in file_data.items():
-                for idx, item in enumerate(items):
-                    question = item.get("question", "").lower()
-                    if query_lower in question or question in query_lower:
-                        item_scores[(folder, filename, idx)] += 5.0  # 매우 높은 점수
-                        exact_match_found = True
-                        # 정확한 매칭이 있으면 즉시 상위 결과 반환 (성능 최적화)
-                        if len(item_scores) >= top_k:
-                            break
+        for shard in shards:
+            for filename, item_ids in shard.files.items():
+                for local in shard.questions[filename].matches(query_lower):
+                    item_id = item_ids[local]
+                    if mask is not None and not mask[item_id >> 3] >> (item_id & 7) & 1:
+                        continue
+                    item_scores[item_id] += self.weights["exact"]  # 매우 높은 점수
+                    exact_match_found = True
+                    # 정확한 매칭이 있으면 즉시 상위 결과 반환 (성능 최적화)
+                    if len(item_scores) >= top_k:
+                        break
                 if exact_match_found and len(item_scores) >= top_k:
                     break
             if exact_match_found and len(item_scores) >= top_k:
@@ -164,44 +664,70 @@ class JSONIndex:
         # 최고 점수 계산 (정규화용)
         max_score = sorted_items[0][1] if sorted_items else 1.0
         
-        # 상위 K개 반환
+        # 상위 K개만 저장소에서 복원
         results = []
-        seen = set()
-        for (folder, filename, idx), raw_score in sorted_items[:top_k * 2]:  # 중복 제거를 위해 더 많이 가져옴
-            item_key = (folder, filename, idx)
-            if item_key in seen:
-                continue
-            seen.add(item_key)
+        for item_id, raw_score in sorted_items[:top_k]:
+            # 점수 정규화 (0.0 ~ 1.0 범위로 변환)
+            # 최고 점수를 1.0으로 하고 나머지를 상대적으로 변환
+            normalized_score = min(1.0, raw_score / max_score) if max_score > 0 else 0.0
+            file_id = self.item_file[item_id]
+            folder, filename = self._file_keys[file_id]
             
-            if folder in self.json_data and filename in self.json_data[folder]:
-                item = self.json_data[folder][filename][idx]
-                
-                # 점수 정규화 (0.0 ~ 1.0 범위로 변환)
-                # 최고 점수를 1.0으로 하고 나머지를 상대적으로 변환
-                normalized_score = min(1.0, raw_score / max_score) if max_score > 0 else 0.0
-                
-                # 구조화된 형식으로 반환
-                result = {
-                    "content": self._format_item(item),
-                    "metadata": {
-                        "folder": folder,
-                        "filename": filename,
-                        "id": item.get("id", ""),
-                        "category": item.get("category", ""),
-                        "json_type": "qa" if "question" in item else "ordinance" if "title" in item else "general",
-                        "score": normalized_score,
-                        "source": f"{folder}/{filename}" if folder else filename
-                    },
-                    "score": normalized_score
-                }
-                results.append(result)
-                if len(results) >= top_k:
-                    break
+            # 구조화된 형식으로 반환 (본문은 색인 시 포맷팅된 텍스트 조회)
+            results.append({
+                "content": self.items.get(item_id, "content"),
+                "metadata": {
+                    "folder": folder,
+                    "filename": filename,
+                    "id": self.items.get_id(item_id),
+                    "category": self.items.get(item_id, "category"),
+                    "json_type": self._json_type(item_id),
+                    "score": normalized_score,
+                    "source": self._file_sources[file_id]
+                },
+                "score": normalized_score
+            })
         
         return results
     
-    def _format_item(self, item: Dict[str, Any]) -> str:
-        """JSON 항목을 텍스트로 포맷팅"""
+    def _facet_mask(self, shards: List[_Shard], facets: Optional[Dict[str, List[str]]]) -> Optional[bytes]:
+        """패싯 필터를 만족하는 item_id 비트맵 (필터가 없으면 None)"""
+        if not facets:
+            return None
+        mask = None
+        for field, values in facets.items():
+            if field not in FACET_FIELDS:
+                raise ValueError(f"지원하지 않는 패싯 필드입니다: {field} (가능: {', '.join(FACET_FIELDS)})")
+            wanted = _facet_values(values)
+            if not wanted:
+                continue
+            field_bits = 0
+            for shard in shards:
+                for value in wanted:
+                    field_bits |= shard.facet_bits(field, value)
+            mask = field_bits if mask is None else mask & field_bits
+        if mask is None:
+            return None
+        return mask.to_bytes((len(self.item_file) >> 3) + 1, 'little')
+    
+    @_reading
+    def facet_counts(self, folders: Optional[List[str]] = None) -> Dict[str, Dict[str, int]]:
+        """검색 대상 폴더들의 미리 집계된 패싯별 항목 수 (쿼리와 무관, 필터 좁히기용)"""
+        counts: Dict[str, Dict[str, int]] = {field: defaultdict(int) for field in FACET_FIELDS}
+        for shard in self._shards_for([f for f in (folders or []) if f]):
+            for field, values in shard.facet_counts().items():
+                for value, count in values.items():
+                    counts[field][value] += count
+        return {field: dict(values) for field, values in counts.items()}
+    
+    def _json_type(self, item_id: int) -> str:
+        if self.items.has(item_id, HAS_QUESTION):
+            return "qa"
+        return "ordinance" if self.items.has(item_id, HAS_TITLE) else "general"
+    
+    @staticmethod
+    def format_item(item: Dict[str, Any]) -> str:
+        """JSON 항목을 결과 텍스트로 포맷팅 (색인 시 한 번만 호출, 앞뒤 공백 없음)"""
         parts = []
         
         if "question" in item and "answer" in item:
@@ -221,28 +747,26 @@ class JSONIndex:
             if item.get('category'):
                 parts.append(f"카테고리: {item.get('category')}")
         
-        return "\n".join(parts)
+        return "\n".join(parts).strip()
     
+    @_reading
     def get_by_category(self, category: str, folder_filter: Optional[str] = None) -> List[Dict[str, Any]]:
         """카테고리로 검색"""
         results = []
-        category_lower = category.lower()
+        category_lower = category.strip().lower()
         
-        if category_lower in self.category_index:
-            for folder, filename, idx in self.category_index[category_lower]:
-                if folder_filter and folder != folder_filter:
-                    continue
-                if folder in self.json_data and filename in self.json_data[folder]:
-                    item = self.json_data[folder][filename][idx]
-                    results.append({
-                        "content": self._format_item(item),
-                        "metadata": {
-                            "folder": folder,
-                            "filename": filename,
-                            "id": item.get("id", ""),
-                            "category": item.get("category", "")
-                        }
-                    })
+        shards = self._shards_for([folder_filter] if folder_filter else [])
+        postings = _merge_postings([shard.category_index[category_lower] for shard in shards if category_lower in shard.category_index])
+        for item_id in postings:
+            folder, filename = self._file_keys[self.item_file[item_id]]
+            results.append({
+                "content": self.items.get(item_id, "content"),
+                "metadata": {
+                    "folder": folder,
+                    "filename": filename,
+                    "id": self.items.get_id(item_id),
+                    "category": self.items.get(item_id, "category")
+                }
+            })
         
         return results
-
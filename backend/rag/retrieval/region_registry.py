@@ -0,0 +1,119 @@
+"""
+지역 조례 파일 -> 지역명(색인 폴더) 레지스트리
+
+documents/region/regions.json에서 파일명 매핑과 지역명 별칭을 읽습니다 (없으면 기본값만 사용).
+매핑에 없는 파일은 항목의 jurisdiction 값, 파일명에 포함된 별칭 순으로 지역을 정하고,
+어느 것도 없으면 공통 "region" 폴더로 색인합니다.
+
+파일 형식:
+    {
+      "files": {"Jeonju_Construction_Ordinance.json": "전주시", "Seoul_Construction_Ordinance.json": "서울시"},
+      "aliases": {"전주": "전주시", "jeonju": "전주시", "seoul": "서울시"}
+    }
+    (파일명 매핑만 있는 평평한 객체 {"Jeonju_Construction_Ordinance.json": "전주시"}도 허용)
+"""
+import json
+import logging
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# region 폴더 안의 레지스트리 파일명 (검색 항목으로 인덱싱하지 않음)
+REGISTRY_FILENAME = "regions.json"
+
+# 지역을 정하지 못한 파일의 색인 폴더
+DEFAULT_REGION = "region"
+
+DEFAULT_FILES = {
+    "Jeonju_Construction_Ordinance.json": "전주시",
+}
+
+DEFAULT_ALIASES = {
+    "jeonju": "전주시",
+    "전주": "전주시",
+}
+
+
+class RegionRegistry:
+    """파일명/항목 메타데이터 -> 지역명 결정과 지역명 별칭 정규화"""
+
+    def __init__(self, files: Optional[Dict[str, str]] = None, aliases: Optional[Dict[str, str]] = None):
+        self.files = dict(DEFAULT_FILES)
+        self.files.update(files or {})
+        self.aliases = {alias.strip().lower(): region for alias, region in DEFAULT_ALIASES.items()}
+        self.aliases.update({str(alias).strip().lower(): region for alias, region in (aliases or {}).items()})
+
+    @classmethod
+    def from_file(cls, path: Path) -> "RegionRegistry":
+        """레지스트리 JSON 로드 (기본 매핑/별칭 위에 덮어씀)"""
+        with open(path, "r", encoding="utf-8-sig") as f:
+            data = json.load(f)
+        if not isinstance(data, dict):
+            raise ValueError("지역 레지스트리는 객체여야 합니다.")
+        if "files" in data or "aliases" in data:
+            registry = cls(files=data.get("files"), aliases=data.get("aliases"))
+        else:
+            registry = cls(files=data)
+        logger.info(f"지역 레지스트리 로드 완료: {path} (파일 {len(registry.files)}개, 별칭 {len(registry.aliases)}개)")
+        return registry
+
+    def canonical(self, name: str) -> str:
+        """지역명 별칭을 색인 폴더명으로 정규화 (예: 전주 -> 전주시)"""
+        name = name.strip()
+        return self.aliases.get(name.lower(), name)
+
+    def resolve(self, filename: str, path: Optional[Path] = None) -> str:
+        """region 폴더 파일의 지역명 (파일명 매핑 > 항목 jurisdiction > 파일명 별칭 > 기본값)"""
+        region = self.files.get(filename)
+        if region:
+            return region
+
+        if path is not None:
+            region = self._jurisdiction(Path(path))
+            if region:
+                return self.canonical(region)
+
+        lowered = filename.lower()
+        for alias, region in self.aliases.items():
+            if alias and alias in lowered:
+                return region
+        return DEFAULT_REGION
+
+    @staticmethod
+    def _jurisdiction(path: Path) -> Optional[str]:
+        """파일 항목들의 jurisdiction 값이 하나로 같으면 그 값"""
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except Exception:
+            return None
+        items = data if isinstance(data, list) else [data]
+        values = {str(item["jurisdiction"]).strip() for item in items if isinstance(item, dict) and item.get("jurisdiction")}
+        return values.pop() if len(values) == 1 else None
+
+
+# 레지스트리 파일 경로 -> (수정 시각, 레지스트리)
+_registry_cache: Dict[str, Tuple[Optional[int], RegionRegistry]] = {}
+
+
+def load_region_registry(documents_dir) -> RegionRegistry:
+    """documents 폴더의 지역 레지스트리 (파일이 바뀌었을 때만 다시 읽음)"""
+    path = Path(documents_dir) / DEFAULT_REGION / REGISTRY_FILENAME
+    try:
+        mtime = path.stat().st_mtime_ns
+    except OSError:
+        mtime = None
+
+    cached = _registry_cache.get(str(path))
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    registry = RegionRegistry()
+    if mtime is not None:
+        try:
+            registry = RegionRegistry.from_file(path)
+        except Exception as e:
+            logger.error(f"지역 레지스트리 로드 실패 (기본 매핑 사용): {path}, {str(e)}")
+    _registry_cache[str(path)] = (mtime, registry)
+    return registry
@@ -0,0 +1,198 @@
+"""
+검색 결과 재순위화 (검색과 LLM 사이의 경량 특징 기반 스코어러)
+
+JSONIndex.search가 넉넉히 가져온 후보(~50개)를 필드별 용어 일치, 조문 번호 일치,
+건축물 용도 적합도 같은 특징으로 다시 점수화하여, LLM에는 상위 몇 개만 보냅니다.
+특징은 (후보 x 쿼리 용어) 일치 행렬로 한 번에 계산하고 가중치 벡터와의 내적으로 점수를 냅니다.
+"""
+import logging
+import re
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_WORD = re.compile(r'[가-힣a-zA-Z0-9]+')
+_ARTICLE = re.compile(r'제\s*(\d+)\s*조(?:\s*의\s*(\d+))?')
+
+# 쿼리 용어 끝의 조사 (후보 본문과 부분 문자열로 비교하기 전에 제거)
+_JOSA = ("에서", "으로", "까지", "부터", "은", "는", "이", "가", "을", "를", "에", "의", "로", "와", "과", "도", "만")
+
+# 건축물 용도 (쿼리가 특정 용도를 말하면 같은 용도를 다루는 후보를 우대)
+USAGE_TERMS = (
+    "단독주택", "다중주택", "다가구주택", "공관", "공동주택", "아파트", "연립주택", "다세대주택", "기숙사",
+    "제1종근린생활시설", "제2종근린생활시설", "근린생활시설", "문화및집회시설", "종교시설", "판매시설",
+    "운수시설", "의료시설", "교육연구시설", "노유자시설", "수련시설", "운동시설", "업무시설", "숙박시설",
+    "위락시설", "공장", "창고시설", "위험물저장및처리시설", "자동차관련시설", "동물및식물관련시설",
+    "자원순환관련시설", "교정시설", "방송통신시설", "발전시설", "묘지관련시설", "관광휴게시설", "장례시설",
+)
+
+# 포맷팅된 본문(JSONIndex.format_item)의 줄 머리 -> 필드
+_FIELD_PREFIXES = {
+    "질문: ": "question",
+    "제목: ": "question",
+    "답변: ": "answer",
+    "카테고리: ": "meta",
+    "키워드: ": "meta",
+}
+
+FEATURES = ("retrieval", "question", "answer", "meta", "phrase", "article", "usage")
+
+DEFAULT_FEATURE_WEIGHTS = {
+    "retrieval": 1.0,   # 검색 점수 (0~1 정규화)
+    "question": 1.5,    # 질문/제목에 있는 쿼리 용어 비율 (후보 집합 내 희소 용어일수록 큰 비중)
+    "answer": 0.5,      # 답변에 있는 쿼리 용어 비율
+    "meta": 0.5,        # 카테고리/키워드에 있는 쿼리 용어 비율
+    "phrase": 0.75,     # 이웃한 쿼리 용어 쌍이 질문에 그대로(붙여 쓰거나 띄어 써서) 있는 비율
+    "article": 1.0,     # 쿼리가 가리킨 조문 번호(제N조)가 본문에 있는 비율
+    "usage": 0.75,      # 쿼리가 말한 건축물 용도가 본문에 있으면 1, 다른 용도만 있으면 -1
+}
+
+
+def _strip_josa(term: str) -> str:
+    for suffix in _JOSA:
+        if len(term) - len(suffix) >= 2 and term.endswith(suffix):
+            return term[:-len(suffix)]
+    return term
+
+
+def _split_fields(content: str) -> Dict[str, str]:
+    fields = {"question": [], "answer": [], "meta": []}
+    current = "answer"
+    for line in content.split("\n"):
+        for prefix, field in _FIELD_PREFIXES.items():
+            if line.startswith(prefix):
+                current = field
+                line = line[len(prefix):]
+                break
+        fields[current].append(line)
+    return {field: "\n".join(lines).lower() for field, lines in fields.items()}
+
+
+def _articles(text: str) -> set:
+    return {match.group(0).replace(" ", "") for match in _ARTICLE.finditer(text)}
+
+
+def _check_deadline(deadline: Optional[float]):
+    if deadline is not None and time.perf_counter() > deadline:
+        raise TimeoutError("재순위화 시간 예산 초과")
+
+
+class FeatureReranker:
+    """
+    특징 기반 재순위화기
+
+    Args:
+        weights: 특징별 가중치 (DEFAULT_FEATURE_WEIGHTS를 덮어씀)
+        tokenize: 쿼리를 용어로 나누는 함수 (기본: JSONIndex와 같은 한글/영문/숫자 단위)
+        budget_ms: 특징 계산 시간 예산 (특징 블록마다 확인하여 초과하면 중단하고 검색 순서를 그대로 사용)
+    """
+
+    def __init__(
+        self,
+        weights: Optional[Dict[str, float]] = None,
+        tokenize: Optional[Callable[[str], List[str]]] = None,
+        budget_ms: float = 20.0
+    ):
+        merged = dict(DEFAULT_FEATURE_WEIGHTS)
+        merged.update(weights or {})
+        self.weights = np.array([merged[name] for name in FEATURES], dtype=np.float64)
+        self.tokenize = tokenize or _WORD.findall
+        self.budget_ms = budget_ms
+
+    def _query_terms(self, query: str) -> List[str]:
+        terms = []
+        for token in self.tokenize(query):
+            term = _strip_josa(token.lower())
+            if term not in terms:
+                terms.append(term)
+        return terms
+
+    def features(self, query: str, candidates: List[Dict[str, Any]], deadline: Optional[float] = None) -> np.ndarray:
+        """후보별 특징 행렬 (후보 수 x len(FEATURES), deadline(perf_counter)을 넘기면 TimeoutError)"""
+        terms = self._query_terms(query)
+        fields = [_split_fields(c.get("content", "")) for c in candidates]
+        _check_deadline(deadline)
+        n = len(candidates)
+        matrix = np.zeros((n, len(FEATURES)), dtype=np.float64)
+        matrix[:, 0] = [float(c.get("score") or 0.0) for c in candidates]
+
+        if terms:
+            # (후보 x 용어) 일치 행렬과 후보 집합 안에서의 용어 희소도(IDF) 가중 비율
+            presence = {
+                field: np.array([[term in f[field] for term in terms] for f in fields], dtype=np.float64)
+                for field in ("question", "answer", "meta")
+            }
+            any_field = np.maximum.reduce(list(presence.values()))
+            idf = np.log((n + 1) / (any_field.sum(axis=0) + 1)) + 1.0
+            idf /= idf.sum()
+            matrix[:, 1] = presence["question"] @ idf
+            matrix[:, 2] = presence["answer"] @ idf
+            matrix[:, 3] = presence["meta"] @ idf
+            _check_deadline(deadline)
+
+        if len(terms) > 1:
+            pairs = list(zip(terms, terms[1:]))
+            matrix[:, 4] = [
+                sum(1 for a, b in pairs if f"{a} {b}" in f["question"] or f"{a}{b}" in f["question"]) / len(pairs)
+                for f in fields
+            ]
+            _check_deadline(deadline)
+
+        query_articles = _articles(query)
+        if query_articles:
+            matrix[:, 5] = [
+                len(query_articles & _articles(c.get("content", ""))) / len(query_articles)
+                for c in candidates
+            ]
+            _check_deadline(deadline)
+
+        compact_query = query.replace(" ", "")
+        query_usages = {usage for usage in USAGE_TERMS if usage in compact_query}
+        if query_usages:
+            for i, f in enumerate(fields):
+                text = (f["question"] + f["meta"]).replace(" ", "")
+                usages = {usage for usage in USAGE_TERMS if usage in text}
+                if usages & query_usages:
+                    matrix[i, 6] = 1.0
+                elif usages:
+                    matrix[i, 6] = -1.0
+        return matrix
+
+    def rerank(self, query: str, candidates: List[Dict[str, Any]], top_n: int) -> List[Dict[str, Any]]:
+        """
+        후보를 재점수화하여 상위 top_n개 반환
+
+        결과의 score는 재순위 점수(0~1 정규화)이고, 검색 점수는 metadata["score"]에 남습니다.
+        예산을 넘기거나 계산에 실패하면 검색 순서의 상위 top_n개를 그대로 반환합니다.
+        """
+        if len(candidates) <= 1:
+            return candidates[:top_n]
+
+        start = time.perf_counter()
+        try:
+            scores = self.features(query, candidates, deadline=start + self.budget_ms / 1000) @ self.weights
+        except TimeoutError:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            logger.warning(f"재순위화 시간 예산 초과 ({elapsed_ms:.1f}ms > {self.budget_ms}ms, 검색 순서 사용)")
+            return candidates[:top_n]
+        except Exception as e:
+            logger.warning(f"재순위화 실패 (검색 순서 사용): {str(e)}")
+            return candidates[:top_n]
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        if elapsed_ms > self.budget_ms:
+            logger.warning(f"재순위화 시간 예산 초과 ({elapsed_ms:.1f}ms > {self.budget_ms}ms, 검색 순서 사용)")
+            return candidates[:top_n]
+
+        # 같은 점수면 검색 순서 유지
+        order = np.argsort(-scores, kind="stable")[:top_n]
+        best = float(scores[order[0]])
+        results = []
+        for index in order:
+            candidate = candidates[index]
+            candidate["score"] = round(float(scores[index]) / best, 4) if best > 0 else 0.0
+            results.append(candidate)
+        logger.debug(f"재순위화 완료: 후보 {len(candidates)}개 -> {len(results)}개, {elapsed_ms:.2f}ms")
+        return results
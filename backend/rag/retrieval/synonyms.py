@@ -0,0 +1,129 @@
+"""
+건축 법령 용어 동의어/별칭 사전
+
+documents/synonyms.json의 동의어 묶음을 토큰 단위 트라이로 컴파일해 두고,
+쿼리 토큰 열에서 여러 토큰으로 된 용어("바닥면적 합계")까지 한 번의 순회로 찾아
+같은 묶음의 다른 용어를 확장 검색어로 돌려줍니다 (여러 토큰 용어는 구문 단위).
+
+파일 형식 (둘 중 하나):
+    [["연면적", "바닥면적 합계"], ["스프링클러", "자동소화설비"]]
+    {"건폐율": ["건축면적 비율"], "스프링클러": ["자동소화설비"]}
+"""
+import json
+import logging
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_TERMINAL = None  # 트라이 노드에서 용어 끝을 표시하는 키 (값: 묶음 번호 목록)
+
+
+class SynonymTrie:
+    """
+    토큰 트라이 기반 동의어 사전
+
+    Args:
+        tokenize: 용어/쿼리를 토큰 목록으로 나누는 함수 (JSONIndex와 같은 토크나이저 사용)
+    """
+
+    def __init__(self, tokenize: Callable[[str], List[str]]):
+        self.tokenize = tokenize
+        self.groups: List[List[Tuple[str, ...]]] = []
+        self._root: Dict = {}
+
+    def __len__(self) -> int:
+        return len(self.groups)
+
+    def _tokens(self, phrase: str) -> Tuple[str, ...]:
+        return tuple(token.lower() for token in self.tokenize(phrase))
+
+    def add_group(self, phrases: List[str]):
+        """서로 동의어인 용어 묶음 추가"""
+        tokenized = []
+        for phrase in phrases:
+            tokens = self._tokens(str(phrase))
+            if tokens and tokens not in tokenized:
+                tokenized.append(tokens)
+        if len(tokenized) < 2:
+            return
+
+        group_id = len(self.groups)
+        self.groups.append(tokenized)
+        for tokens in tokenized:
+            node = self._root
+            for token in tokens:
+                node = node.setdefault(token, {})
+            node.setdefault(_TERMINAL, []).append(group_id)
+
+    @classmethod
+    def from_file(cls, path: Path, tokenize: Callable[[str], List[str]]) -> "SynonymTrie":
+        """JSON 동의어 파일 로드 (묶음 배열 또는 {대표어: [별칭]} 객체)"""
+        with open(path, "r", encoding="utf-8-sig") as f:
+            data = json.load(f)
+
+        trie = cls(tokenize)
+        if isinstance(data, dict):
+            for term, aliases in data.items():
+                aliases = aliases if isinstance(aliases, list) else [aliases]
+                trie.add_group([term, *aliases])
+        elif isinstance(data, list):
+            for group in data:
+                if isinstance(group, list):
+                    trie.add_group(group)
+        else:
+            raise ValueError("동의어 파일은 묶음 배열 또는 객체여야 합니다.")
+        logger.info(f"동의어 사전 로드 완료: {path} ({len(trie)}개 묶음)")
+        return trie
+
+    def matches(self, tokens: List[str]) -> List[Tuple[int, int, int]]:
+        """
+        토큰 열에서 사전 용어 위치 [(시작, 끝(포함), 묶음 번호)]
+
+        각 시작 위치에서 트라이를 따라가며 끝나는 모든 용어를 찾습니다 (긴 용어와 그 일부 용어 모두).
+        """
+        found = []
+        for start in range(len(tokens)):
+            node = self._root
+            for end in range(start, len(tokens)):
+                node = node.get(tokens[end])
+                if node is None:
+                    break
+                for group_id in node.get(_TERMINAL, ()):
+                    found.append((start, end, group_id))
+        return found
+
+    def expansions(self, tokens: List[str]) -> Dict[int, List[Tuple[str, ...]]]:
+        """
+        쿼리 토큰 위치 -> 그 위치에서 끝나는 용어의 동의어 목록 (각 동의어는 토큰 튜플)
+
+        여러 토큰으로 된 동의어("바닥면적 합계")는 한 단위로 돌려주어 호출 측이 구문으로 찾도록 합니다
+        (토큰을 따로 검색하면 "합계"만 있는 항목도 점수를 받음).
+        쿼리에 이미 있는 용어와 같은 용어 자신은 제외합니다.
+        """
+        lowered = [token.lower() for token in tokens]
+        present = set(lowered)
+        query_text = " ".join(lowered)
+        added = set()
+        result: Dict[int, List[Tuple[str, ...]]] = {}
+        for start, end, group_id in self.matches(lowered):
+            matched = tuple(lowered[start:end + 1])
+            for alias in self.groups[group_id]:
+                if alias == matched or alias in added:
+                    continue
+                if alias[0] in present if len(alias) == 1 else f" {' '.join(alias)} " in f" {query_text} ":
+                    continue
+                added.add(alias)
+                result.setdefault(end, []).append(alias)
+        return result
+
+
+def load_synonyms(path: Optional[Path], tokenize: Callable[[str], List[str]]) -> Optional[SynonymTrie]:
+    """동의어 파일이 있으면 로드 (없거나 형식이 잘못되면 None)"""
+    if path is None or not Path(path).exists():
+        return None
+    try:
+        return SynonymTrie.from_file(Path(path), tokenize)
+    except Exception as e:
+        logger.error(f"동의어 사전 로드 실패: {path}, {str(e)}")
+        return None
@@ -1,4 +1,4 @@
 from .retry import retry_with_backoff
+from .rate_limit import OpenAIRateLimiter, get_shared_rate_limiter
 
-__all__ = ["retry_with_backoff"]
-
+__all__ = ["retry_with_backoff", "OpenAIRateLimiter", "get_shared_rate_limiter"]
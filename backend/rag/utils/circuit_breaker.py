@@ -0,0 +1,134 @@
+"""
+LLM 호출용 회로 차단기 (Circuit Breaker)
+
+최근 호출의 오류율과 느린 호출 비율을 추적하여 임계값을 넘으면 회로를 열고(OPEN),
+일정 시간 동안 호출을 즉시 거부합니다. 이후 반열림(HALF_OPEN) 상태에서 시험 호출로 회복을 확인합니다.
+"""
+import time
+import logging
+from collections import deque
+from typing import Dict, Any
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitBreaker:
+    """
+    오류율 + 지연시간 기반 회로 차단기
+
+    Args:
+        name: 로그용 이름
+        window_size: 상태 판단에 사용할 최근 호출 수
+        min_calls: 판단에 필요한 최소 호출 수
+        failure_rate_threshold: 회로를 여는 실패 비율 (0~1)
+        slow_call_seconds: 느린 호출로 간주할 지연시간 (초)
+        slow_call_rate_threshold: 회로를 여는 느린 호출 비율 (0~1)
+        open_seconds: 회로가 열린 뒤 반열림으로 전환하기까지의 시간 (초)
+        half_open_max_calls: 반열림 상태에서 동시에 허용할 시험 호출 수
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        name: str = "llm",
+        window_size: int = 20,
+        min_calls: int = 5,
+        failure_rate_threshold: float = 0.5,
+        slow_call_seconds: float = 10.0,
+        slow_call_rate_threshold: float = 0.5,
+        open_seconds: float = 30.0,
+        half_open_max_calls: int = 1
+    ):
+        self.name = name
+        self.min_calls = min_calls
+        self.failure_rate_threshold = failure_rate_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate_threshold = slow_call_rate_threshold
+        self.open_seconds = open_seconds
+        self.half_open_max_calls = half_open_max_calls
+
+        # (실패 여부, 느린 호출 여부)
+        self._outcomes: deque = deque(maxlen=window_size)
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._probe_started: deque = deque()
+
+    @property
+    def state(self) -> str:
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.open_seconds:
+            self._transition(self.HALF_OPEN)
+        return self._state
+
+    def _transition(self, new_state: str):
+        if new_state == self._state:
+            return
+        logger.warning(f"회로 차단기 '{self.name}': {self._state} -> {new_state}")
+        self._state = new_state
+        if new_state == self.OPEN:
+            self._opened_at = time.monotonic()
+        if new_state in (self.OPEN, self.CLOSED):
+            self._probe_started.clear()
+        if new_state == self.CLOSED:
+            self._outcomes.clear()
+
+    def allow_request(self) -> bool:
+        """호출 허용 여부 (반열림 상태에서는 시험 호출 수만큼 허용)"""
+        state = self.state
+        if state == self.CLOSED:
+            return True
+        if state == self.OPEN:
+            return False
+
+        # 결과가 기록되지 않은(취소된) 시험 호출은 open_seconds 후 만료
+        now = time.monotonic()
+        while self._probe_started and now - self._probe_started[0] > self.open_seconds:
+            self._probe_started.popleft()
+        if len(self._probe_started) >= self.half_open_max_calls:
+            return False
+        self._probe_started.append(now)
+        return True
+
+    def record_success(self, latency: float):
+        """성공 호출 기록 (지연시간이 길면 느린 호출로 집계)"""
+        self._record(failed=False, slow=latency >= self.slow_call_seconds)
+
+    def record_failure(self, latency: float = 0.0):
+        """실패 호출 기록 (타임아웃 포함)"""
+        self._record(failed=True, slow=latency >= self.slow_call_seconds)
+
+    def _record(self, failed: bool, slow: bool):
+        state = self.state
+        if state == self.HALF_OPEN:
+            if self._probe_started:
+                self._probe_started.popleft()
+            self._transition(self.OPEN if failed or slow else self.CLOSED)
+            return
+        if state == self.OPEN:
+            return
+
+        self._outcomes.append((failed, slow))
+        if len(self._outcomes) < self.min_calls:
+            return
+        total = len(self._outcomes)
+        failure_rate = sum(1 for f, _ in self._outcomes if f) / total
+        slow_rate = sum(1 for _, s in self._outcomes if s) / total
+        if failure_rate >= self.failure_rate_threshold or slow_rate >= self.slow_call_rate_threshold:
+            logger.warning(
+                f"회로 차단기 '{self.name}' 열림: 실패율 {failure_rate:.0%}, 느린 호출 비율 {slow_rate:.0%} "
+                f"(최근 {total}회)"
+            )
+            self._transition(self.OPEN)
+
+    def stats(self) -> Dict[str, Any]:
+        """현재 상태 요약"""
+        total = len(self._outcomes)
+        return {
+            "name": self.name,
+            "state": self.state,
+            "calls": total,
+            "failure_rate": sum(1 for f, _ in self._outcomes if f) / total if total else 0.0,
+            "slow_call_rate": sum(1 for _, s in self._outcomes if s) / total if total else 0.0,
+        }
@@ -0,0 +1,46 @@
+"""정규화된 파일 내용의 SHA-256 (내용 주소 저장 / 변경 감지용)"""
+import codecs
+import hashlib
+from pathlib import Path
+from typing import Union, BinaryIO
+
+
+def normalized_sha256(source: Union[bytes, str, Path, BinaryIO], read_size: int = 1024 * 1024) -> str:
+    """
+    UTF-8 BOM 제거, 줄바꿈(CRLF/CR → LF) 통일 후의 SHA-256 16진수 문자열
+
+    같은 내용을 다른 편집기/OS에서 저장해 바이트만 달라진 파일을 같은 내용으로 취급합니다.
+    파일은 read_size씩 읽으므로 크기와 무관하게 메모리가 일정합니다.
+    """
+    from rag.parsers.file_parser import FileParser
+
+    digest = hashlib.sha256()
+    with FileParser._open_binary(source) as f:
+        first = True
+        pending_cr = False
+        while True:
+            chunk = f.read(read_size)
+            if first:
+                # 읽기 단위가 BOM보다 작아도 BOM 전체를 본 뒤 판별
+                while len(chunk) < len(codecs.BOM_UTF8) and codecs.BOM_UTF8.startswith(chunk):
+                    more = f.read(read_size)
+                    if not more:
+                        break
+                    chunk += more
+            if not chunk:
+                break
+            if first:
+                if chunk.startswith(codecs.BOM_UTF8):
+                    chunk = chunk[len(codecs.BOM_UTF8):]
+                first = False
+            if pending_cr:
+                # 이전 청크가 CR로 끝났으면 이번 청크의 선행 LF는 같은 줄바꿈
+                chunk = b"\r" + chunk
+                pending_cr = False
+            if chunk.endswith(b"\r"):
+                chunk = chunk[:-1]
+                pending_cr = True
+            digest.update(chunk.replace(b"\r\n", b"\n").replace(b"\r", b"\n"))
+        if pending_cr:
+            digest.update(b"\n")
+    return digest.hexdigest()
@@ -0,0 +1,153 @@
+"""
+MinHash + LSH 기반 근사 중복 탐지
+
+Q&A 항목처럼 짧은 텍스트의 문자 n-gram 집합에 대해 MinHash 서명을 만들고,
+밴딩(LSH)으로 후보만 비교하여 Jaccard 유사도가 임계값 이상인 항목을 찾습니다.
+"""
+import re
+import zlib
+from collections import defaultdict
+from typing import Dict, Hashable, List, Optional, Set
+
+import numpy as np
+
+_MERSENNE_PRIME = (1 << 31) - 1
+_WHITESPACE = re.compile(r'\s+')
+
+
+def shingles(text: str, n: int = 3) -> Set[str]:
+    """공백 정규화 + 소문자 변환 후 문자 n-gram 집합"""
+    normalized = _WHITESPACE.sub(' ', text).strip().lower()
+    if len(normalized) <= n:
+        return {normalized} if normalized else set()
+    return {normalized[i:i + n] for i in range(len(normalized) - n + 1)}
+
+
+class MinHasher:
+    """고정 시드의 해시 순열로 MinHash 서명 생성 (프로세스 간 결과 동일)"""
+
+    def __init__(self, num_perm: int = 64, shingle_size: int = 3, seed: int = 1):
+        rng = np.random.RandomState(seed)
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self._a = rng.randint(1, _MERSENNE_PRIME, size=num_perm, dtype=np.int64)
+        self._b = rng.randint(0, _MERSENNE_PRIME, size=num_perm, dtype=np.int64)
+
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        """텍스트의 MinHash 서명 (빈 텍스트면 None)"""
+        grams = shingles(text, self.shingle_size)
+        if not grams:
+            return None
+        hashes = np.fromiter(
+            (zlib.crc32(g.encode('utf-8')) for g in grams), dtype=np.int64, count=len(grams)
+        ) % _MERSENNE_PRIME
+        # (num_perm, n) 행렬에서 순열별 최솟값
+        permuted = (np.outer(self._a, hashes) + self._b[:, None]) % _MERSENNE_PRIME
+        return permuted.min(axis=1)
+
+
+def estimate_jaccard(sig1: np.ndarray, sig2: np.ndarray) -> float:
+    """두 서명의 일치 비율 = Jaccard 유사도 추정치"""
+    return float(np.count_nonzero(sig1 == sig2)) / len(sig1)
+
+
+class MinHashLSH:
+    """
+    밴딩 LSH 색인 (범위(scope)별로 분리하여 같은 범위 안에서만 중복 판정)
+
+    Args:
+        threshold: 중복으로 판정할 Jaccard 유사도 추정치 하한
+        num_perm: 서명 길이
+        bands: 밴드 수 (num_perm을 나누어떨어져야 함)
+    """
+
+    def __init__(self, threshold: float = 0.9, num_perm: int = 64, bands: int = 16, seed: int = 1):
+        if num_perm % bands != 0:
+            raise ValueError("num_perm은 bands로 나누어떨어져야 합니다.")
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.hasher = MinHasher(num_perm=num_perm, seed=seed)
+        self._signatures: Dict[Hashable, np.ndarray] = {}
+        self._key_scope: Dict[Hashable, Hashable] = {}
+        self._fingerprints: Dict[Hashable, Optional[Hashable]] = {}
+        self._buckets: Dict[tuple, List[Hashable]] = defaultdict(list)
+
+    def _band_keys(self, scope: Hashable, signature: np.ndarray):
+        for band in range(self.bands):
+            start = band * self.rows
+            yield (scope, band, signature[start:start + self.rows].tobytes())
+
+    def find_similar(self, scope: Hashable, signature: np.ndarray) -> List[Hashable]:
+        """같은 범위에서 임계값 이상으로 유사한 기존 키 목록"""
+        checked = set()
+        similar = []
+        for band_key in self._band_keys(scope, signature):
+            for key in self._buckets.get(band_key, ()):
+                if key in checked:
+                    continue
+                checked.add(key)
+                if estimate_jaccard(signature, self._signatures[key]) >= self.threshold:
+                    similar.append(key)
+        return similar
+
+    def find_duplicate(
+        self, scope: Hashable, signature: np.ndarray, fingerprint: Optional[Hashable] = None
+    ) -> Optional[Hashable]:
+        """같은 범위에서 임계값 이상으로 유사하고 지문(fingerprint)이 같은 기존 키 (없으면 None)"""
+        for key in self.find_similar(scope, signature):
+            if self._fingerprints.get(key) == fingerprint:
+                return key
+        return None
+
+    def fingerprint(self, key: Hashable) -> Optional[Hashable]:
+        return self._fingerprints.get(key)
+
+    def insert(self, scope: Hashable, key: Hashable, signature: np.ndarray, fingerprint: Optional[Hashable] = None):
+        self._signatures[key] = signature
+        self._key_scope[key] = scope
+        self._fingerprints[key] = fingerprint
+        for band_key in self._band_keys(scope, signature):
+            self._buckets[band_key].append(key)
+
+    def add_if_unique(
+        self, scope: Hashable, key: Hashable, text: str, fingerprint: Optional[Hashable] = None
+    ) -> Optional[Hashable]:
+        """
+        텍스트가 같은 범위의 기존 항목과 근사 중복이면 그 키를 반환하고,
+        아니면 색인에 추가한 뒤 None 반환 (빈 텍스트는 항상 고유로 취급)
+
+        fingerprint가 다르면 유사도와 관계없이 중복으로 보지 않습니다 (예: 수치만 다른 조항).
+        """
+        signature = self.hasher.signature(text)
+        if signature is None:
+            return None
+        duplicate = self.find_duplicate(scope, signature, fingerprint)
+        if duplicate is not None:
+            return duplicate
+        self.insert(scope, key, signature, fingerprint)
+        return None
+
+    def remove(self, keys: Set[Hashable]):
+        """키 집합을 색인에서 제거"""
+        if not keys:
+            return
+        for key in keys:
+            signature = self._signatures.pop(key, None)
+            scope = self._key_scope.pop(key, None)
+            self._fingerprints.pop(key, None)
+            if signature is None:
+                continue
+            for band_key in self._band_keys(scope, signature):
+                bucket = self._buckets.get(band_key)
+                if bucket is None:
+                    continue
+                bucket[:] = [k for k in bucket if k not in keys]
+                if not bucket:
+                    del self._buckets[band_key]
+
+    def keys(self) -> List[Hashable]:
+        return list(self._signatures)
+
+    def __len__(self) -> int:
+        return len(self._signatures)
@@ -0,0 +1,222 @@
+"""
+OpenAI 호출용 속도 제한 및 재시도 래퍼
+
+- 분당 요청 수(RPM) / 분당 토큰 수(TPM) 토큰 버킷
+- Retry-After 헤더 준수 (429 수신 시 모든 동시 요청을 함께 대기)
+- decorrelated jitter 백오프
+- 동시 요청이 공유하는 재시도 예산 (재시도 폭주 방지)
+"""
+import time
+import random
+import asyncio
+import logging
+from collections import deque
+from typing import Callable, Awaitable, TypeVar, Optional, Tuple, Type
+
+from rag.utils.retry import decorrelated_jitter, get_retry_after
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+
+class TokenBucket:
+    """비동기 토큰 버킷 (capacity만큼 버스트 허용, 초당 refill_rate 충전)"""
+
+    def __init__(self, capacity: float, refill_rate: float):
+        self.capacity = float(capacity)
+        self.refill_rate = float(refill_rate)
+        self.tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.refill_rate)
+        self._updated = now
+
+    async def acquire(self, amount: float = 1.0):
+        """토큰이 충분해질 때까지 대기 후 차감"""
+        # 용량보다 큰 요청은 용량만큼만 기다림 (영구 대기 방지)
+        amount = min(float(amount), self.capacity)
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                await asyncio.sleep((amount - self.tokens) / self.refill_rate)
+
+    def consume(self, amount: float):
+        """대기 없이 차감 (실제 사용량 보정용, 음수 잔량 허용)"""
+        self._refill()
+        self.tokens -= float(amount)
+
+
+class RetryBudget:
+    """
+    동시 요청이 공유하는 재시도 예산
+
+    최근 window 초 동안의 재시도 수를 (요청 수 × ratio + 최소 허용량) 이하로 제한합니다.
+    장애 시 모든 요청이 동시에 재시도하여 부하를 키우는 것을 막습니다.
+    """
+
+    def __init__(self, ratio: float = 0.2, min_retries_per_sec: float = 1.0, window: float = 10.0):
+        self.ratio = ratio
+        self.min_retries_per_sec = min_retries_per_sec
+        self.window = window
+        self._requests: deque = deque()
+        self._retries: deque = deque()
+
+    def _trim(self, now: float):
+        cutoff = now - self.window
+        while self._requests and self._requests[0] < cutoff:
+            self._requests.popleft()
+        while self._retries and self._retries[0] < cutoff:
+            self._retries.popleft()
+
+    def record_request(self):
+        now = time.monotonic()
+        self._trim(now)
+        self._requests.append(now)
+
+    def try_withdraw(self) -> bool:
+        """재시도 1회 허용 여부 (허용 시 예산 차감)"""
+        now = time.monotonic()
+        self._trim(now)
+        allowed = len(self._requests) * self.ratio + self.min_retries_per_sec * self.window
+        if len(self._retries) >= allowed:
+            return False
+        self._retries.append(now)
+        return True
+
+
+class OpenAIRateLimiter:
+    """
+    속도 제한을 인지하는 OpenAI 호출 래퍼
+
+    Args:
+        requests_per_minute: 분당 요청 수 제한 (0이면 제한 없음)
+        tokens_per_minute: 분당 토큰 수 제한 (0이면 제한 없음)
+        max_retries: 요청당 최대 재시도 횟수
+        base_delay: 백오프 최소 지연 (초)
+        max_delay: 백오프 최대 지연 (초)
+        retry_budget_ratio: 공유 재시도 예산 비율 (요청 대비 재시도 허용 비율)
+        max_total_time: 요청당 재시도 포함 최대 시간 (초)
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float = 0,
+        tokens_per_minute: float = 0,
+        max_retries: int = 3,
+        base_delay: float = 0.5,
+        max_delay: float = 8.0,
+        retry_budget_ratio: float = 0.2,
+        max_total_time: float = 20.0,
+        rng: Optional[random.Random] = None
+    ):
+        self.request_bucket = TokenBucket(requests_per_minute, requests_per_minute / 60.0) if requests_per_minute > 0 else None
+        self.token_bucket = TokenBucket(tokens_per_minute, tokens_per_minute / 60.0) if tokens_per_minute > 0 else None
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_total_time = max_total_time
+        self.retry_budget = RetryBudget(ratio=retry_budget_ratio)
+        self._rng = rng or random.Random()
+        # Retry-After 수신 시 모든 호출을 이 시각까지 멈춤
+        self._paused_until = 0.0
+
+    async def _wait_for_capacity(self, estimated_tokens: int):
+        pause = self._paused_until - time.monotonic()
+        if pause > 0:
+            await asyncio.sleep(pause)
+        if self.request_bucket:
+            await self.request_bucket.acquire(1)
+        if self.token_bucket and estimated_tokens > 0:
+            await self.token_bucket.acquire(estimated_tokens)
+
+    def record_usage(self, estimated_tokens: int, actual_tokens: Optional[int]):
+        """응답의 실제 토큰 사용량으로 버킷 보정"""
+        if self.token_bucket and actual_tokens is not None:
+            self.token_bucket.consume(actual_tokens - estimated_tokens)
+
+    async def call(
+        self,
+        func: Callable[[], Awaitable[T]],
+        estimated_tokens: int = 0,
+        retry_on: Tuple[Type[BaseException], ...] = (Exception,)
+    ) -> T:
+        """
+        속도 제한을 적용하여 func 호출, retry_on 예외 발생 시 재시도
+
+        Retry-After가 있으면 그 값을, 없으면 decorrelated jitter 지연을 사용합니다.
+        재시도 예산이 소진되었거나 남은 시간이 부족하면 마지막 예외를 그대로 발생시킵니다.
+        """
+        start = time.monotonic()
+        delay = self.base_delay
+        attempt = 0
+        self.retry_budget.record_request()
+
+        while True:
+            await self._wait_for_capacity(estimated_tokens)
+            try:
+                response = await func()
+                usage = getattr(response, "usage", None)
+                self.record_usage(estimated_tokens, getattr(usage, "total_tokens", None))
+                return response
+            except retry_on as e:
+                attempt += 1
+                if attempt > self.max_retries:
+                    logger.error(f"OpenAI 호출 최종 실패 (재시도 {self.max_retries}회): {str(e)}")
+                    raise
+
+                retry_after = get_retry_after(e)
+                delay = decorrelated_jitter(delay, self.base_delay, self.max_delay, self._rng)
+                wait = max(delay, retry_after) if retry_after is not None else delay
+                if retry_after is not None:
+                    self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+
+                remaining = self.max_total_time - (time.monotonic() - start)
+                if remaining < wait:
+                    logger.warning(f"OpenAI 재시도 시간 부족 (남은 시간 {remaining:.2f}초, 필요 {wait:.2f}초)")
+                    raise
+                if not self.retry_budget.try_withdraw():
+                    logger.warning("OpenAI 재시도 예산 소진 - 재시도하지 않음")
+                    raise
+
+                logger.warning(
+                    f"OpenAI 호출 실패 (시도 {attempt}/{self.max_retries}): {str(e)}. "
+                    f"{wait:.2f}초 후 재시도..."
+                )
+                await asyncio.sleep(wait)
+
+
+# 프로세스 전체가 공유하는 속도 제한기 (get_shared_rate_limiter)
+_shared_limiter: Optional[OpenAIRateLimiter] = None
+
+
+def get_shared_rate_limiter() -> OpenAIRateLimiter:
+    """
+    설정 기반 프로세스 공용 속도 제한기
+
+    OPENAI_RPM_LIMIT / OPENAI_TPM_LIMIT은 API 키 단위 한도이므로 LLM 답변, 의미 캐시 임베딩,
+    수집 작업 임베딩이 같은 버킷과 재시도 예산을 나눠 씁니다.
+    재시도 포함 총 시간은 query()의 LLM 타임아웃(20초) 안에 들어오도록 제한합니다.
+    """
+    global _shared_limiter
+    if _shared_limiter is None:
+        from app.core.config import settings
+        _shared_limiter = OpenAIRateLimiter(
+            requests_per_minute=settings.OPENAI_RPM_LIMIT,
+            tokens_per_minute=settings.OPENAI_TPM_LIMIT,
+            max_retries=settings.OPENAI_MAX_RETRIES,
+            retry_budget_ratio=settings.OPENAI_RETRY_BUDGET_RATIO,
+            max_total_time=19.0
+        )
+    return _shared_limiter
+
+
+def estimate_tokens(text: str) -> int:
+    """대략적인 토큰 수 추정 (한국어 기준 약 2자당 1토큰)"""
+    return max(1, len(text) // 2)
@@ -1,20 +1,83 @@
 import time
+import random
 import asyncio
 import logging
-from typing import Callable, TypeVar, Any
+from email.utils import parsedate_to_datetime
+from typing import Callable, TypeVar, Any, Optional
 from functools import wraps
 
 logger = logging.getLogger(__name__)
 
 T = TypeVar('T')
 
+def decorrelated_jitter(
+    previous_delay: float,
+    base_delay: float,
+    max_delay: float,
+    rng: Optional[random.Random] = None
+) -> float:
+    """
+    Decorrelated jitter 백오프 지연 계산
+    
+    sleep = min(max_delay, uniform(base_delay, previous_delay * 3))
+    동시에 실패한 요청들이 같은 시각에 재시도하지 않도록 지연을 분산합니다.
+    """
+    rng = rng or random
+    upper = max(base_delay, previous_delay * 3)
+    return min(max_delay, rng.uniform(base_delay, upper))
+
+def get_retry_after(exc: BaseException) -> Optional[float]:
+    """
+    예외에 포함된 HTTP 응답의 Retry-After 값(초) 추출
+    
+    retry-after-ms, retry-after(초 또는 HTTP 날짜) 헤더를 지원합니다.
+    """
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms:
+        try:
+            return max(0.0, float(retry_after_ms) / 1000.0)
+        except ValueError:
+            pass
+    
+    retry_after = headers.get("retry-after")
+    if not retry_after:
+        return None
+    try:
+        return max(0.0, float(retry_after))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(retry_after)
+        return max(0.0, retry_at.timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+def _next_delay(exc: BaseException, delay: float, initial_delay: float, max_delay: float, exponential_base: float, jitter: bool) -> tuple:
+    """(이번 대기 시간, 다음 기준 지연) 계산 - Retry-After 우선"""
+    if jitter:
+        wait = decorrelated_jitter(delay, initial_delay, max_delay)
+        next_delay = wait
+    else:
+        wait = delay
+        next_delay = min(delay * exponential_base, max_delay)
+    retry_after = get_retry_after(exc)
+    if retry_after is not None:
+        wait = max(wait, retry_after)
+    return wait, next_delay
+
 def retry_with_backoff(
     max_retries: int = 3,
     initial_delay: float = 1.0,
     max_delay: float = 10.0,
     exponential_base: float = 2.0,
     exceptions: tuple = (Exception,),
-    max_total_time: float = 60.0  # 최대 총 재시도 시간 (초)
+    max_total_time: float = 60.0,  # 최대 총 재시도 시간 (초)
+    jitter: bool = True
 ):
     """
     재시도 로직이 포함된 데코레이터
@@ -23,8 +86,11 @@ def retry_with_backoff(
         max_retries: 최대 재시도 횟수
         initial_delay: 초기 지연 시간 (초)
         max_delay: 최대 지연 시간 (초)
-        exponential_base: 지수 백오프 베이스
+        exponential_base: 지수 백오프 베이스 (jitter=False일 때 사용)
         exceptions: 재시도할 예외 타입들
+        jitter: decorrelated jitter 사용 여부
+    
+    응답에 Retry-After 헤더가 있으면 계산된 지연보다 길 경우 그 값을 따릅니다.
     """
     def decorator(func: Callable[..., T]) -> Callable[..., T]:
         @wraps(func)
@@ -54,9 +120,11 @@ def retry_with_backoff(
                 except exceptions as e:
                     last_exception = e
                     if attempt < max_retries - 1:
+                        wait, next_delay = _next_delay(e, delay, initial_delay, max_delay, exponential_base, jitter)
+                        
                         # 남은 시간 체크
                         remaining_time = max_total_time - (time.time() - start_time)
-                        if remaining_time < delay:
+                        if remaining_time < wait:
                             logger.warning(
                                 f"{func.__name__} 재시도 시간 부족. 남은 시간: {remaining_time:.2f}초"
                             )
@@ -64,10 +132,10 @@ def retry_with_backoff(
                         
                         logger.warning(
                             f"{func.__name__} 실패 (시도 {attempt + 1}/{max_retries}): {str(e)}. "
-                            f"{delay:.2f}초 후 재시도..."
+                            f"{wait:.2f}초 후 재시도..."
                         )
-                        await asyncio.sleep(delay)
-                        delay = min(delay * exponential_base, max_delay)
+                        await asyncio.sleep(wait)
+                        delay = next_delay
                     else:
                         logger.error(
                             f"{func.__name__} 최종 실패 (시도 {max_retries}회): {str(e)}"
@@ -88,12 +156,13 @@ def retry_with_backoff(
                 except exceptions as e:
                     last_exception = e
                     if attempt < max_retries - 1:
+                        wait, next_delay = _next_delay(e, delay, initial_delay, max_delay, exponential_base, jitter)
                         logger.warning(
                             f"{func.__name__} 실패 (시도 {attempt + 1}/{max_retries}): {str(e)}. "
-                            f"{delay:.2f}초 후 재시도..."
+                            f"{wait:.2f}초 후 재시도..."
                         )
-                        time.sleep(delay)
-                        delay = min(delay * exponential_base, max_delay)
+                        time.sleep(wait)
+                        delay = next_delay
                     else:
                         logger.error(
                             f"{func.__name__} 최종 실패 (시도 {max_retries}회): {str(e)}"
@@ -0,0 +1,51 @@
+"""
+내용 해시 테스트 스크립트: 줄바꿈/BOM만 다른 파일이 읽기 단위와 무관하게 같은 해시가 되는지 확인
+"""
+import sys
+import os
+import io
+import codecs
+import hashlib
+
+# 프로젝트 루트를 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from rag.utils.content_hash import normalized_sha256
+
+LF_TEXT = '[{"question": "건폐율은?",\n"answer": "60%"}]\n\n'.encode("utf-8")
+
+
+def test_cr_at_chunk_boundary():
+    """CRLF의 CR과 LF가 서로 다른 읽기 청크에 걸려도 LF 하나로 취급"""
+    expected = hashlib.sha256(LF_TEXT).hexdigest()
+    variants = {
+        "LF": LF_TEXT,
+        "CRLF": LF_TEXT.replace(b"\n", b"\r\n"),
+        "CR": LF_TEXT.replace(b"\n", b"\r"),
+        "BOM+CRLF": codecs.BOM_UTF8 + LF_TEXT.replace(b"\n", b"\r\n"),
+    }
+    ok = True
+    for name, data in variants.items():
+        # 읽기 단위를 1바이트부터 전체 길이까지 바꿔 모든 경계 위치를 확인
+        for read_size in range(1, len(data) + 1):
+            digest = normalized_sha256(io.BytesIO(data), read_size=read_size)
+            if digest != expected:
+                ok = False
+                print(f"❌ {name}: read_size={read_size}에서 해시 불일치")
+                break
+        else:
+            print(f"✅ {name}: 읽기 단위 1~{len(data)}바이트 모두 일치")
+    assert ok
+    # 끝이 CR인 파일과 연속한 CR(빈 줄)은 줄바꿈 수를 유지
+    assert normalized_sha256(b"a\r", read_size=1) == hashlib.sha256(b"a\n").hexdigest()
+    assert normalized_sha256(b"a\r\r\nb", read_size=2) == hashlib.sha256(b"a\n\nb").hexdigest()
+    return True
+
+
+if __name__ == "__main__":
+    try:
+        result = test_cr_at_chunk_boundary()
+    except AssertionError:
+        result = False
+    print("✅ 내용 해시 테스트 통과" if result else "❌ 내용 해시 테스트 실패")
+    sys.exit(0 if result else 1)
@@ -0,0 +1,61 @@
+"""
+출처별 할당 선택 테스트 스크립트: 여러 지역 비교 검색에서 quota_select가 top_n을 채우고 출처를 고르게 섞는지 확인
+"""
+import sys
+import os
+
+# 프로젝트 루트를 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from rag.retrieval.diversity import quota_select
+
+
+def _candidates(spec):
+    """[(지역, 점수)] -> 검색 결과 형식"""
+    return [
+        {"content": f"{region}-{i}", "score": score, "metadata": {"folder": region}}
+        for i, (region, score) in enumerate(spec)
+    ]
+
+
+def _source(candidate):
+    return candidate["metadata"]["folder"]
+
+
+def test_quota_select():
+    """출처 수가 top_n보다 적거나 한 출처 결과가 모자라도 top_n개를 점수 순으로 채움"""
+    # 출처 2개, top_n 5 -> 출처당 할당 3, 전주시가 점수는 높아도 3개까지만
+    spec = [("전주시", 0.9), ("전주시", 0.8), ("전주시", 0.7), ("전주시", 0.6), ("전주시", 0.5), ("서울시", 0.4), ("서울시", 0.3)]
+    selected = quota_select(_candidates(spec), 5, _source)
+    regions = [_source(c) for c in selected]
+    print(f"출처 2개, top_n 5: {regions}")
+    assert len(selected) == 5
+    assert regions.count("전주시") == 3 and regions.count("서울시") == 2
+    assert [c["score"] for c in selected] == sorted((c["score"] for c in selected), reverse=True)
+
+    # 출처 1개 -> 할당이 top_n 전체
+    selected = quota_select(_candidates(spec[:5]), 3, _source)
+    print(f"출처 1개, top_n 3: {[c['score'] for c in selected]}")
+    assert [c["score"] for c in selected] == [0.9, 0.8, 0.7]
+
+    # 한 출처 결과가 할당보다 적으면 남는 자리를 다른 출처가 점수 순으로 채움
+    spec = [("전주시", 0.9), ("전주시", 0.8), ("전주시", 0.7), ("전주시", 0.6), ("서울시", 0.2), ("부산시", 0.1)]
+    selected = quota_select(_candidates(spec), 5, _source)
+    regions = [_source(c) for c in selected]
+    print(f"출처 3개(두 곳은 1개씩), top_n 5: {regions}")
+    assert len(selected) == 5
+    assert "서울시" in regions and "부산시" in regions and regions.count("전주시") == 3
+
+    # 후보가 top_n보다 적으면 전부, 없으면 빈 목록
+    assert len(quota_select(_candidates(spec[:2]), 5, _source)) == 2
+    assert quota_select([], 5, _source) == []
+    return True
+
+
+if __name__ == "__main__":
+    try:
+        result = test_quota_select()
+    except AssertionError:
+        result = False
+    print("✅ 출처별 할당 선택 테스트 통과" if result else "❌ 출처별 할당 선택 테스트 실패")
+    sys.exit(0 if result else 1)
@@ -0,0 +1,74 @@
+"""
+문서 카탈로그 목록 조회 테스트 스크립트: 정렬 값이 같은 문서가 많아도 커서 페이지가 빠짐/중복 없이 이어지는지 확인
+"""
+import sys
+import os
+import tempfile
+from pathlib import Path
+
+# 프로젝트 루트를 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.services.document_catalog import DocumentCatalog
+
+
+def _build_catalog() -> DocumentCatalog:
+    """created_at/chunk_count가 여러 문서에서 겹치는 카탈로그"""
+    catalog = DocumentCatalog(str(Path(tempfile.mkdtemp()) / "catalog.db"))
+    for i in range(23):
+        catalog.add(
+            doc_id=f"doc-{i:02d}",
+            filename=f"file-{i % 5}-{i:02d}.json",
+            created_at=f"2026-01-0{1 + i % 3}T00:00:00",
+            metadata={"folder": "다중주택" if i % 2 else "단독주택", "region": "전주시" if i % 4 == 0 else None},
+            chunk_count=i % 2,
+        )
+    return catalog
+
+
+def _collect(catalog: DocumentCatalog, limit: int, **filters) -> list:
+    ids = []
+    cursor = None
+    while True:
+        page = catalog.page(limit=limit, cursor=cursor, **filters)
+        assert len(page["items"]) <= limit
+        ids.extend(doc["id"] for doc in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return ids
+
+
+def test_cursor_pagination_across_ties():
+    """모든 정렬 키/방향/페이지 크기에서 페이지를 이어 붙이면 한 번에 조회한 순서와 같아야 함"""
+    catalog = _build_catalog()
+    ok = True
+    for sort in ("created_at", "updated_at", "filename", "chunk_count"):
+        for descending in (True, False):
+            for filters in ({}, {"folder": "다중주택"}, {"region": "전주시"}):
+                docs = catalog.page(sort=sort, descending=descending, limit=100, **filters)["items"]
+                expected = [doc["id"] for doc in docs]
+                # 같은 정렬 값끼리는 id 순서
+                key = "created_at" if sort == "updated_at" else sort
+                ordered = sorted(docs, key=lambda doc: (doc[key], doc["id"]), reverse=descending)
+                if expected != [doc["id"] for doc in ordered]:
+                    ok = False
+                    print(f"❌ sort={sort} desc={descending} {filters}: (정렬 값, id) 순서가 아님")
+                for limit in (1, 2, 3, 7):
+                    ids = _collect(catalog, limit, sort=sort, descending=descending, **filters)
+                    if ids != expected or len(set(ids)) != len(ids):
+                        ok = False
+                        print(f"❌ sort={sort} desc={descending} {filters} limit={limit}: {ids} != {expected}")
+    total = catalog.page(limit=1)["total"]
+    print(f"문서 {total}개, 정렬 키 4개 x 방향 2개 x 필터 3개 x 페이지 크기 4개 확인")
+    assert ok
+    assert len(_collect(catalog, 4)) == total == 23
+    return True
+
+
+if __name__ == "__main__":
+    try:
+        result = test_cursor_pagination_across_ties()
+    except AssertionError:
+        result = False
+    print("✅ 커서 페이지네이션 테스트 통과" if result else "❌ 커서 페이지네이션 테스트 실패")
+    sys.exit(0 if result else 1)
@@ -0,0 +1,63 @@
+"""
+오타/띄어쓰기 확장 테스트 스크립트: fuzzy 검색이 편집 거리 1 오타와 띄어쓰기 변형을 찾는지 확인
+"""
+import sys
+import os
+import json
+import tempfile
+from pathlib import Path
+
+# 프로젝트 루트를 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from rag.retrieval.json_index import JSONIndex
+
+
+def _write(directory: Path, name: str, items) -> Path:
+    path = directory / name
+    path.write_text(json.dumps(items, ensure_ascii=False), encoding="utf-8")
+    return path
+
+
+def _ids(results):
+    return [r["metadata"]["id"] for r in results]
+
+
+def test_fuzzy_expansion():
+    """오타/띄어쓰기 쿼리는 fuzzy일 때만 일치하고(fuzzy_max_distance > 0이면 기본 사용), 정확한 일치가 확장 일치보다 높음"""
+    directory = Path(tempfile.mkdtemp())
+    index = JSONIndex(fuzzy_max_distance=1)
+    index.load_json_file(_write(directory, "a.json", [
+        {"id": "sprinkler", "question": "스프링클러 설치 기준", "answer": "소방 설비", "category": "소방"},
+        {"id": "coverage", "question": "건폐율 산정", "answer": "대지면적 비율", "category": "면적"},
+        {"id": "parking", "question": "주차장 설치", "answer": "주차 대수", "category": "주차"},
+    ]), "기준")
+
+    for query, expected in [("스프링쿨러", "sprinkler"), ("건페율", "coverage"), ("주 차장", "parking")]:
+        assert index.search(query, top_k=5, fuzzy=False) == []
+        found = _ids(index.search(query, top_k=5))
+        print(f"{query} -> {found}")
+        assert found[:1] == [expected]
+
+    # 정확한 용어는 그대로, 오타 용어는 확장 배율만큼 낮은 점수
+    exact = index.search("스프링클러", top_k=5, fuzzy=True)
+    assert _ids(exact) == ["sprinkler"]
+    mixed = {r["metadata"]["id"]: r["score"] for r in index.search("주차쟝 설치", top_k=5, fuzzy=True)}
+    print(f"주차쟝 설치 -> {mixed}")
+    assert mixed["parking"] > mixed["sprinkler"]
+
+    # 오타 사전을 만든 뒤 적재한 파일의 어휘도 확장 대상
+    index.load_json_file(_write(directory, "b.json", [
+        {"id": "elevator", "question": "승강기 설치 의무", "answer": "6층 이상", "category": "설비"},
+    ]), "기준")
+    assert _ids(index.search("승갈기", top_k=5, fuzzy=True))[:1] == ["elevator"]
+    return True
+
+
+if __name__ == "__main__":
+    try:
+        result = test_fuzzy_expansion()
+    except AssertionError:
+        result = False
+    print("✅ 오타/띄어쓰기 확장 테스트 통과" if result else "❌ 오타/띄어쓰기 확장 테스트 실패")
+    sys.exit(0 if result else 1)
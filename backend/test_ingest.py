@@ -0,0 +1,53 @@
+"""
+벌크 인덱싱 CLI 테스트 스크립트: region 파일이 "region"과 지역명 폴더로 각각 기록되는지 확인
+"""
+import sys
+import os
+import json
+import asyncio
+import tempfile
+from pathlib import Path
+
+# 프로젝트 루트를 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from rag.ingest import run_ingest, iter_segment_records
+
+
+def test_region_file_manifest():
+    """region 폴더 파일 하나가 매니페스트에 (region, 전주시) 두 항목으로 남는지 확인"""
+    root = Path(tempfile.mkdtemp())
+    documents_dir = root / "documents"
+    (documents_dir / "region").mkdir(parents=True)
+    (documents_dir / "다중주택").mkdir()
+    item = [{"id": 1, "title": "주차장 설치 기준", "answer": "세대당 1대 이상"}]
+    (documents_dir / "region" / "Jeonju_Construction_Ordinance.json").write_text(
+        json.dumps(item, ensure_ascii=False), encoding="utf-8")
+    (documents_dir / "다중주택" / "qa.json").write_text(
+        json.dumps([{"question": "건폐율은?", "answer": "60%"}], ensure_ascii=False), encoding="utf-8")
+    (documents_dir / "synonyms.json").write_text(json.dumps({"연면적": ["바닥면적 합계"]}, ensure_ascii=False), encoding="utf-8")
+
+    manifest = asyncio.run(run_ingest(documents_dir, root / "out", workers=1))
+    files = [(f["path"], f["folder"]) for f in manifest["files"]]
+    print(f"매니페스트 파일: {files}")
+
+    region_path = os.path.join("region", "Jeonju_Construction_Ordinance.json")
+    assert (region_path, "region") in files
+    assert (region_path, "전주시") in files
+    assert not any(path == "synonyms.json" for path, _ in files)
+    assert not any(f["error"] for f in manifest["files"])
+    assert manifest["stages"]["parse"]["bytes"] == manifest["stages"]["discover"]["bytes"]
+
+    folders = sorted(record["metadata"]["folder"] for record in iter_segment_records(root / "out"))
+    assert folders == ["region", "다중주택", "전주시"], folders
+    return True
+
+
+if __name__ == "__main__":
+    try:
+        result = test_region_file_manifest()
+    except AssertionError as e:
+        print(f"실패: {e}")
+        result = False
+    print("✅ 벌크 인덱싱 테스트 통과" if result else "❌ 벌크 인덱싱 테스트 실패")
+    sys.exit(0 if result else 1)
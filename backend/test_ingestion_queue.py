@@ -0,0 +1,130 @@
+"""
+수집 작업 큐 테스트 스크립트: 형식 거부, 재시도, 취소 후 재시도, 영구 실패 시 정리 확인
+"""
+import sys
+import os
+import json
+import asyncio
+import tempfile
+from pathlib import Path
+
+# 프로젝트 루트를 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.services.ingestion_queue import IngestionQueue, SUCCEEDED, FAILED, CANCELLED, QUEUED, RUNNING
+
+
+class FlakyEmbedder:
+    """처음 fail_times번은 실패하고, block이 설정되어 있으면 해제될 때까지 대기하는 테스트용 임베더"""
+
+    def __init__(self, fail_times: int = 0):
+        self.fail_times = fail_times
+        self.calls = 0
+        self.block = None
+
+    async def embed_batch(self, texts):
+        self.calls += 1
+        if self.block is not None:
+            await self.block.wait()
+        if self.calls <= self.fail_times:
+            raise ConnectionError("일시적 오류")
+        return [[float(len(text)), 1.0] for text in texts]
+
+
+def _upload(directory: Path, name: str, data) -> str:
+    path = directory / name
+    path.write_text(data if isinstance(data, str) else json.dumps(data, ensure_ascii=False), encoding="utf-8")
+    return str(path)
+
+
+async def _wait_for(queue: IngestionQueue, job_id: str, statuses, timeout: float = 10.0) -> dict:
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while loop.time() < deadline:
+        job = queue.get_job(job_id)
+        if job["status"] in statuses:
+            return job
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"작업 상태 대기 시간 초과: {queue.get_job(job_id)}")
+
+
+async def _run() -> bool:
+    root = Path(tempfile.mkdtemp())
+    uploads = root / "uploads"
+    uploads.mkdir()
+    embedder = FlakyEmbedder(fail_times=1)
+    queue = IngestionQueue(
+        db_path=str(root / "jobs.db"),
+        spool_dir=str(root / "spool"),
+        index_dir=str(root / "index"),
+        num_workers=1,
+        max_attempts=3,
+        retry_delay=0.01,
+        embedder=embedder,
+        embed_batch_wait_ms=1.0,
+    )
+    items = [{"id": "q1", "question": "건폐율 기준", "answer": "60% 이하"}]
+
+    # 1) 처리할 수 없는 형식은 등록 전에 거부
+    try:
+        queue.submit("report.exe", _upload(uploads, "report.exe", "binary"))
+        raise AssertionError("지원하지 않는 형식이 등록됨")
+    except ValueError:
+        pass
+    print("✅ 지원하지 않는 형식 거부")
+
+    await queue.start()
+    try:
+        # 2) 일시적 오류는 재시도 후 성공, 보관 파일 정리
+        job = queue.submit("a.json", _upload(uploads, "a.json", items), {"folder": "기준"})
+        job = await _wait_for(queue, job["id"], (SUCCEEDED, FAILED))
+        assert job["status"] == SUCCEEDED and job["attempts"] == 2, job
+        assert not list((root / "spool").iterdir())
+        assert (root / "index" / job["id"]).exists()
+        print(f"✅ 재시도 후 성공 (시도 {job['attempts']}회)")
+
+        # 3) 실행 중 취소 -> 출력 정리, 재시도하면 처음부터 다시 처리
+        embedder.block = asyncio.Event()
+        job = queue.submit("b.json", _upload(uploads, "b.json", items))
+        await _wait_for(queue, job["id"], (RUNNING,))
+        while embedder.calls < 3:
+            await asyncio.sleep(0.01)
+        assert queue.cancel(job["id"])["status"] == CANCELLED
+        await asyncio.sleep(0.05)
+        assert queue.get_job(job["id"])["status"] == CANCELLED
+        assert not (root / "index" / job["id"]).exists()
+        # 취소된 작업의 임베딩 요청도 끝나도록 해제
+        embedder.block.set()
+        assert queue.retry(job["id"])["status"] == QUEUED
+        job = await _wait_for(queue, job["id"], (SUCCEEDED, FAILED))
+        assert job["status"] == SUCCEEDED, job
+        print("✅ 취소 후 재시도 성공")
+
+        # 4) 파싱 실패는 재시도 없이 실패, 출력 정리
+        job = queue.submit("broken.json", _upload(uploads, "broken.json", "[{\"id\": "))
+        job = await _wait_for(queue, job["id"], (SUCCEEDED, FAILED))
+        assert job["status"] == FAILED and job["attempts"] == 1, job
+        assert not (root / "index" / job["id"]).exists()
+        try:
+            queue.retry(queue.list_jobs(status=SUCCEEDED)[0]["id"])
+            raise AssertionError("완료된 작업이 재시도됨")
+        except ValueError:
+            pass
+        print("✅ 영구 실패 처리")
+    finally:
+        await queue.stop()
+    return True
+
+
+def test_ingestion_queue():
+    return asyncio.run(_run())
+
+
+if __name__ == "__main__":
+    try:
+        result = test_ingestion_queue()
+    except AssertionError as e:
+        print(f"   {e}")
+        result = False
+    print("✅ 수집 작업 큐 테스트 통과" if result else "❌ 수집 작업 큐 테스트 실패")
+    sys.exit(0 if result else 1)
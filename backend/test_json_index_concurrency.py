@@ -0,0 +1,77 @@
+"""
+JSON 인덱스 동시성 테스트 스크립트: 재인덱싱(작업 스레드)과 검색(다른 스레드)이 겹쳐도 오류가 없는지 확인
+"""
+import sys
+import os
+import json
+import tempfile
+import threading
+from pathlib import Path
+
+# 프로젝트 루트를 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from rag.retrieval.json_index import JSONIndex
+
+
+def _write_files(directory: Path, count: int = 30, items: int = 40):
+    for n in range(count):
+        data = [
+            {"id": f"{n}-{i}", "question": f"건폐율 기준 질문 {n} {i}", "answer": f"답변 {i} 용적률 {n}", "category": "기준"}
+            for i in range(items)
+        ]
+        (directory / f"f{n}.json").write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+
+
+def test_reindex_while_searching():
+    """한 스레드는 파일 교체(제거 + 적재), 다른 스레드들은 검색을 반복"""
+    directory = Path(tempfile.mkdtemp())
+    _write_files(directory)
+    index = JSONIndex()
+    for path in sorted(directory.glob("*.json")):
+        index.load_json_file(path, "folder")
+
+    errors = []
+    searches = [0]
+    stop = threading.Event()
+
+    def _reindex():
+        try:
+            for _ in range(5):
+                for path in sorted(directory.glob("*.json")):
+                    index.replace_file(path, "folder")
+        except Exception as e:
+            errors.append(repr(e))
+        finally:
+            stop.set()
+
+    def _search():
+        while not stop.is_set():
+            try:
+                index.search("건폐율 기준 질문", folder_filter="folder", top_k=5)
+                index.search("용적률", top_k=5, facets={"category": ["기준"]})
+                searches[0] += 2
+            except Exception as e:
+                errors.append(repr(e))
+
+    threads = [threading.Thread(target=_reindex)] + [threading.Thread(target=_search) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    print(f"검색 {searches[0]}회, 오류 {len(errors)}개")
+    for error in errors[:5]:
+        print(f"   {error}")
+    assert not errors
+    assert len(index.search("건폐율 기준 질문 3 7", folder_filter="folder", top_k=1)) == 1
+    return True
+
+
+if __name__ == "__main__":
+    try:
+        result = test_reindex_while_searching()
+    except AssertionError:
+        result = False
+    print("✅ 동시성 테스트 통과" if result else "❌ 동시성 테스트 실패")
+    sys.exit(0 if result else 1)
@@ -0,0 +1,91 @@
+"""
+법령별 문서 파서 테스트 스크립트: lxml 경로와 BeautifulSoup 경로의 결과 일치 확인
+"""
+import sys
+import os
+
+# 프로젝트 루트를 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from rag.parsers.law_table_parser import LawTableParser, HAS_LXML
+
+HEADER_ROW = "<tr><td>No</td><td>항목</td><td>법령내용</td><td>검토내용</td></tr>"
+
+CASES = {
+    "기본": f"""
+<html><body>
+<table class="layout"><tr><td>머리말</td></tr></table>
+<table class="ruleCheckTable">
+  {HEADER_ROW}
+  <tr><td colspan="4">■ 1. 건축법</td></tr>
+  <tr>
+    <td>1</td><td>건폐율</td>
+    <td><span class="jonote">제55조(건축물의 건폐율)</span><div class="tag1">대지면적에 대한 비율</div></td>
+    <td><p class="note1">• 건축종류 : 신축</p><p class="note2">01.전용주거지역 검토</p></td>
+  </tr>
+</table>
+</body></html>
+""",
+    "중첩 테이블": f"""
+<html><body>
+<table class="ruleCheckTable">
+  {HEADER_ROW}
+  <tr>
+    <td>1</td><td>용적률</td>
+    <td><div class="tag1">별표 기준<table><tr><td>용적률</td><td>200%</td></tr></table></div></td>
+    <td><p class="note2">검토</p></td>
+  </tr>
+</table>
+</body></html>
+""",
+    "닫히지 않은 p": f"""
+<html><body>
+<table class="ruleCheckTable">
+  {HEADER_ROW}
+  <tr>
+    <td>2</td><td>높이</td>
+    <td><span class="jonote">제60조(건축물의 높이 제한)<div class="tag2">가로구역별 높이</div></td>
+    <td><p class="note1">• 건축물용도 : 단독주택<p class="note2">02.높이 검토<p class="note2">03.일조 검토</td>
+  </tr>
+</table>
+</body></html>
+""",
+    "p 안의 블록 요소": f"""
+<html><body>
+<table class="ruleCheckTable">
+  {HEADER_ROW}
+  <tr>
+    <td>3</td><td>대지</td>
+    <td><div class="tag1">대지의 조경</div></td>
+    <td><p class="note2">04.조경 검토<div>면적 200제곱미터 이상</div>해당</p></td>
+  </tr>
+</table>
+</body></html>
+""",
+}
+
+
+def test_lxml_matches_bs4():
+    """lxml 파서와 BeautifulSoup 파서가 같은 청크를 만드는지 확인"""
+    if not HAS_LXML:
+        print("⚠️ lxml 미설치 - 비교 생략")
+        return True
+
+    ok = True
+    for name, html in CASES.items():
+        lxml_chunks = LawTableParser._parse_with_lxml(html, "테스트", "sample.html")
+        bs4_chunks = LawTableParser._parse_with_bs4(html, "테스트", "sample.html")
+        if lxml_chunks == bs4_chunks and lxml_chunks:
+            print(f"✅ {name}: 청크 {len(lxml_chunks)}개 일치")
+        else:
+            ok = False
+            print(f"❌ {name}: 결과 불일치")
+            print(f"   lxml: {lxml_chunks}")
+            print(f"   bs4 : {bs4_chunks}")
+    assert ok
+    return ok
+
+
+if __name__ == "__main__":
+    result = test_lxml_matches_bs4()
+    sys.exit(0 if result else 1)
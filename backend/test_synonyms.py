@@ -0,0 +1,62 @@
+"""
+동의어 확장 테스트 스크립트: 여러 토큰 동의어("바닥면적 합계")가 구문으로만 일치하는지 확인
+"""
+import sys
+import os
+import json
+import tempfile
+from pathlib import Path
+
+# 프로젝트 루트를 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from rag.retrieval.json_index import JSONIndex
+
+ITEMS = [
+    {"id": "direct", "question": "연면적 기준", "answer": "기준", "category": "면적"},
+    {"id": "joined", "question": "바닥면적합계 산정 방법", "answer": "각 층 합산", "category": "면적"},
+    {"id": "spaced", "question": "건축물 바닥면적 합계 기준", "answer": "층별 합산", "category": "면적"},
+    {"id": "in_answer", "question": "면적 산정 질문", "answer": "바닥면적 합계 산정", "category": "면적"},
+    # 두 토큰이 모두 있지만 이어져 있지 않음 -> 구문 일치 아님
+    {"id": "scattered", "question": "바닥면적 산정", "answer": "대지 합계 기준", "category": "면적"},
+]
+
+
+def _ids(results):
+    return [r["metadata"]["id"] for r in results]
+
+
+def test_multi_token_synonym_phrase():
+    """쿼리 "연면적"이 붙여 쓰거나 띄어 쓴 "바닥면적 합계"를 찾고, 흩어진 토큰은 제외"""
+    directory = Path(tempfile.mkdtemp())
+    (directory / "items.json").write_text(json.dumps(ITEMS, ensure_ascii=False), encoding="utf-8")
+    (directory / "synonyms.json").write_text(json.dumps([["연면적", "바닥면적 합계"]], ensure_ascii=False), encoding="utf-8")
+
+    index = JSONIndex()
+    index.load_json_file(directory / "items.json", "면적")
+    assert _ids(index.search("연면적", top_k=10)) == ["direct"]
+
+    assert index.load_synonyms(directory / "synonyms.json")
+    results = index.search("연면적", top_k=10)
+    scores = {r["metadata"]["id"]: r["score"] for r in results}
+    print(f"연면적 -> {scores}")
+    assert _ids(results)[0] == "direct"
+    assert {"joined", "spaced", "in_answer"} <= set(scores)
+    assert "scattered" not in scores
+    # 질문(첫 줄)의 구문 일치가 답변의 구문 일치보다 높음
+    assert scores["spaced"] > scores["in_answer"] and scores["joined"] > scores["in_answer"]
+
+    # 반대 방향: 여러 토큰 용어로 물으면 한 토큰 동의어로 확장
+    reverse = _ids(index.search("바닥면적 합계", top_k=10))
+    print(f"바닥면적 합계 -> {reverse}")
+    assert reverse[0] == "spaced" and "direct" in reverse
+    return True
+
+
+if __name__ == "__main__":
+    try:
+        result = test_multi_token_synonym_phrase()
+    except AssertionError:
+        result = False
+    print("✅ 동의어 구문 확장 테스트 통과" if result else "❌ 동의어 구문 확장 테스트 실패")
+    sys.exit(0 if result else 1)